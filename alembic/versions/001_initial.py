@@ -6,6 +6,11 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
+revision = "001_initial"
+down_revision = None
+branch_labels = None
+depends_on = None
+
 
 def upgrade() -> None:
     # Users
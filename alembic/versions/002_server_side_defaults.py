@@ -0,0 +1,35 @@
+"""server-side primary key and JSONB defaults
+
+Revision ID: 002_server_side_defaults
+Revises: 001_initial
+
+The models no longer generate UUIDs client-side; ids come from
+gen_random_uuid() and are read back with RETURNING on flush.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "002_server_side_defaults"
+down_revision = "001_initial"
+branch_labels = None
+depends_on = None
+
+_UUID_TABLES = ("users", "surveys", "responses", "survey_insights")
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built in from Postgres 13; pgcrypto provides it
+    # on older servers.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+
+    for table in _UUID_TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+    op.alter_column("surveys", "questions", server_default=sa.text("'[]'::jsonb"))
+    op.alter_column("responses", "answers", server_default=sa.text("'{}'::jsonb"))
+
+
+def downgrade() -> None:
+    op.alter_column("responses", "answers", server_default=None)
+    op.alter_column("surveys", "questions", server_default=None)
+    for table in _UUID_TABLES:
+        op.alter_column(table, "id", server_default=None)
@@ -0,0 +1,28 @@
+"""survey_insights.batch_id for Message Batch analyses
+
+Revision ID: 003_insight_batch_id
+Revises: 002_server_side_defaults
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003_insight_batch_id"
+down_revision = "002_server_side_defaults"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("survey_insights", sa.Column("batch_id", sa.String(100)))
+    # Only insights still waiting on a Message Batch carry a batch_id
+    op.create_index(
+        "ix_survey_insights_batch_id",
+        "survey_insights",
+        ["batch_id"],
+        postgresql_where=sa.text("batch_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_survey_insights_batch_id", table_name="survey_insights")
+    op.drop_column("survey_insights", "batch_id")
@@ -0,0 +1,38 @@
+"""jsonb_path_ops GIN indexes for containment filters
+
+Revision ID: 004_jsonb_gin_indexes
+Revises: 003_insight_batch_id
+
+jsonb_path_ops only accelerates the @> operator, so filters on these
+columns must be written as containment checks, e.g.
+    Response.answers.contains({"q1": "A"})      -> answers @> '{"q1": "A"}'
+rather than extracting with ->> and comparing with =, which the index
+cannot serve and which falls back to a sequential scan.
+"""
+from alembic import op
+
+revision = "004_jsonb_gin_indexes"
+down_revision = "003_insight_batch_id"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_surveys_targeting_rules_gin "
+        "ON surveys USING gin (targeting_rules jsonb_path_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_responses_answers_gin "
+        "ON responses USING gin (answers jsonb_path_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_survey_events_metadata_gin "
+        "ON survey_events USING gin (metadata jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_survey_events_metadata_gin", table_name="survey_events")
+    op.drop_index("ix_responses_answers_gin", table_name="responses")
+    op.drop_index("ix_surveys_targeting_rules_gin", table_name="surveys")
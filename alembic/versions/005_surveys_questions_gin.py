@@ -0,0 +1,25 @@
+"""jsonb_path_ops GIN index on surveys.questions
+
+Revision ID: 005_surveys_questions_gin
+Revises: 004_jsonb_gin_indexes
+
+Serves containment lookups such as
+    Survey.questions.contains([{"id": "q3"}])   -> questions @> '[{"id": "q3"}]'
+"""
+from alembic import op
+
+revision = "005_surveys_questions_gin"
+down_revision = "004_jsonb_gin_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_surveys_questions_path_ops "
+        "ON surveys USING gin (questions jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_surveys_questions_path_ops", table_name="surveys")
@@ -0,0 +1,32 @@
+"""partial indexes for completed responses and active surveys
+
+Revision ID: 006_partial_indexes
+Revises: 005_surveys_questions_gin
+"""
+from alembic import op
+
+revision = "006_partial_indexes"
+down_revision = "005_surveys_questions_gin"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (survey_id, doctor_id) lookups and survey_id prefix scans are served by
+    # the unique index behind uq_response_per_doctor, so the plain survey_id
+    # btree is redundant.
+    op.drop_index("ix_responses_survey_id", table_name="responses")
+    op.execute(
+        "CREATE INDEX ix_responses_survey_complete "
+        "ON responses (survey_id) WHERE is_complete = true"
+    )
+    op.execute(
+        "CREATE INDEX ix_surveys_launched "
+        "ON surveys (launched_at) WHERE status = 'active'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_surveys_launched", table_name="surveys")
+    op.drop_index("ix_responses_survey_complete", table_name="responses")
+    op.create_index("ix_responses_survey_id", "responses", ["survey_id"])
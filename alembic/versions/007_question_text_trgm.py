@@ -0,0 +1,28 @@
+"""trigram index for question-text search
+
+Revision ID: 007_question_text_trgm
+Revises: 006_partial_indexes
+
+questions is an array, so questions ->> 'text' is always NULL; the texts
+are extracted with a jsonpath instead and trigram-indexed for
+ILIKE '%...%' search. Exact matches are already covered by
+ix_surveys_questions_path_ops via questions @> '[{"text": "..."}]'.
+"""
+from alembic import op
+
+revision = "007_question_text_trgm"
+down_revision = "006_partial_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX ix_surveys_question_text_trgm ON surveys USING gin "
+        "((jsonb_path_query_array(questions, '$[*].text')::text) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_surveys_question_text_trgm", table_name="surveys")
@@ -0,0 +1,34 @@
+"""BRIN and (survey_id, timestamp DESC) indexes on survey_events
+
+Revision ID: 008_survey_events_brin
+Revises: 007_question_text_trgm
+
+survey_events is append-only and inserted in timestamp order: BRIN serves
+time-range scans at a fraction of a btree's size, while the composite
+btree serves "latest N events for a survey" (and any survey_id-only filter
+via its leading column, which makes ix_survey_events_survey_id redundant).
+"""
+from alembic import op
+
+revision = "008_survey_events_brin"
+down_revision = "007_question_text_trgm"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_survey_events_survey_id", table_name="survey_events")
+    op.execute(
+        "CREATE INDEX ix_survey_events_ts_brin ON survey_events "
+        "USING brin (timestamp) WITH (pages_per_range = 32)"
+    )
+    op.execute(
+        "CREATE INDEX ix_survey_events_survey_ts "
+        "ON survey_events (survey_id, timestamp DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_survey_events_survey_ts", table_name="survey_events")
+    op.drop_index("ix_survey_events_ts_brin", table_name="survey_events")
+    op.create_index("ix_survey_events_survey_id", "survey_events", ["survey_id"])
@@ -0,0 +1,41 @@
+"""NOT NULL flag/status columns and check constraints
+
+Revision ID: 009_not_null_checks
+Revises: 008_survey_events_brin
+
+The previous defaults were client-side only, so rows written outside the
+ORM may hold NULLs; those are backfilled before the constraints go on.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "009_not_null_checks"
+down_revision = "008_survey_events_brin"
+branch_labels = None
+depends_on = None
+
+# (table, column, default as SQL)
+_COLUMNS = [
+    ("users", "is_active", "true"),
+    ("surveys", "version", "1"),
+    ("surveys", "status", "'draft'"),
+    ("responses", "is_complete", "false"),
+]
+
+
+def upgrade() -> None:
+    for table, column, default in _COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = {default} WHERE {column} IS NULL")
+        op.alter_column(table, column, nullable=False, server_default=sa.text(default))
+
+    op.create_check_constraint("ck_users_role", "users", "role IN ('admin', 'doctor')")
+    op.create_check_constraint(
+        "ck_surveys_status", "surveys", "status IN ('draft', 'active', 'closed')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_surveys_status", "surveys", type_="check")
+    op.drop_constraint("ck_users_role", "users", type_="check")
+    for table, column, _ in reversed(_COLUMNS):
+        op.alter_column(table, column, nullable=True, server_default=None)
@@ -0,0 +1,30 @@
+"""replace the event_type index with (survey_id, event_type, timestamp DESC)
+
+Revision ID: 010_survey_events_type_ts
+Revises: 009_not_null_checks
+
+The single-column event_type index could not serve the dominant "events of
+type X for survey Y, newest first" query; the composite covers both the
+predicate and the sort.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010_survey_events_type_ts"
+down_revision = "009_not_null_checks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_survey_events_type", table_name="survey_events")
+    op.create_index(
+        "ix_survey_events_survey_type_ts",
+        "survey_events",
+        ["survey_id", "event_type", sa.text("timestamp DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_survey_events_survey_type_ts", table_name="survey_events")
+    op.create_index("ix_survey_events_type", "survey_events", ["event_type"])
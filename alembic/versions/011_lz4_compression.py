@@ -0,0 +1,33 @@
+"""lz4 TOAST compression for LLM payload columns
+
+Revision ID: 011_lz4_compression
+Revises: 010_survey_events_type_ts
+
+Large, rarely-read LLM payloads: lz4 (Postgres 14+) decompresses several
+times faster than the default pglz. surveys.questions keeps pglz for its
+better ratio on write-once, read-often data. Only newly written values are
+compressed with lz4; existing rows keep pglz until they are rewritten.
+"""
+from alembic import op
+
+revision = "011_lz4_compression"
+down_revision = "010_survey_events_type_ts"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = [
+    ("agent_interaction_logs", "input_context"),
+    ("agent_interaction_logs", "output_response"),
+    ("survey_insights", "themes"),
+    ("survey_insights", "action_items"),
+]
+
+
+def upgrade() -> None:
+    for table, column in _COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION lz4")
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION default")
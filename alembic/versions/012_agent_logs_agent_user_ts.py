@@ -0,0 +1,26 @@
+"""index agent interaction logs by agent, user and time
+
+Revision ID: 012_agent_logs_agent_user_ts
+Revises: 011_lz4_compression
+
+Audit queries: "recent calls of agent X by user Y".
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "012_agent_logs_agent_user_ts"
+down_revision = "011_lz4_compression"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_agent_interaction_logs_agent_user_ts",
+        "agent_interaction_logs",
+        ["agent_type", "user_id", sa.text("timestamp DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agent_interaction_logs_agent_user_ts", table_name="agent_interaction_logs")
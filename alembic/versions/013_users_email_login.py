@@ -0,0 +1,25 @@
+"""covering index for login
+
+Revision ID: 013_users_email_login
+Revises: 012_agent_logs_agent_user_ts
+
+Covers every column /auth/login reads, so it is an index-only scan (the
+unique constraint's index still enforces uniqueness).
+"""
+from alembic import op
+
+revision = "013_users_email_login"
+down_revision = "012_agent_logs_agent_user_ts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_users_email_login "
+        "ON users (email) INCLUDE (id, hashed_password, role, is_active)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_login", table_name="users")
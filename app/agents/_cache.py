@@ -0,0 +1,45 @@
+"""
+Agent Response Cache
+────────────────────
+Redis-backed cache for LLM results that are safe to replay when the inputs
+are unchanged (e.g. re-running a quality check on an unedited survey).
+
+Keys are a blake2b digest of everything that shapes the reply — inputs,
+model and a prompt version that is bumped whenever the system prompt
+changes. The cache is best-effort: if Redis is unavailable (e.g. the CLI
+demo) lookups miss and writes are skipped.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any
+
+import orjson
+from redis.exceptions import RedisError
+
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def response_cache_key(namespace: str, *parts: Any) -> str:
+    """Stable key for `parts` (anything orjson can serialize)."""
+    payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+    return f"agent_cache:{namespace}:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+
+async def get_cached_response(key: str) -> str | None:
+    """Return the cached JSON document for `key`, or None on miss/unavailable."""
+    try:
+        return await get_redis().get(key)
+    except RedisError as e:
+        logger.warning("agent_cache.get_failed key=%s error=%s", key, e)
+        return None
+
+
+async def set_cached_response(key: str, payload: str, ttl: int) -> None:
+    try:
+        await get_redis().setex(key, ttl, payload)
+    except RedisError as e:
+        logger.warning("agent_cache.set_failed key=%s error=%s", key, e)
@@ -0,0 +1,42 @@
+"""
+Shared LLM HTTP Client
+──────────────────────
+One tuned, pooled httpx client (HTTP/2, long keep-alive) behind a single
+AsyncAnthropic instance shared by every agent, so concurrent agent calls
+reuse warm TLS connections instead of each module keeping its own pool.
+"""
+from __future__ import annotations
+
+import httpx
+from anthropic import AsyncAnthropic
+
+from app.config import settings
+
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=200,
+        max_keepalive_connections=100,
+        keepalive_expiry=120,
+    ),
+    # Long tool-call generations (4k tokens) can take well over a minute
+    timeout=httpx.Timeout(120.0, connect=5.0),
+)
+
+anthropic_client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, http_client=http_client)
+
+
+async def warm_http_client() -> None:
+    """
+    Open a pooled connection to the API ahead of the first real call, so the
+    TCP + TLS handshake overlaps with other work instead of delaying it.
+    Best-effort: any response (even 404) leaves a warm connection behind.
+    """
+    try:
+        await http_client.head(str(anthropic_client.base_url))
+    except httpx.HTTPError:
+        pass
+
+
+async def close_http_client() -> None:
+    await http_client.aclose()
@@ -0,0 +1,41 @@
+"""
+Tool-Use Helpers
+────────────────
+Shared helpers for reading (and optionally re-validating) Anthropic
+tool-calling responses.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+import fastjsonschema
+
+
+def pick_tool_use(content: Sequence[Any]) -> Any:
+    """
+    Return the tool_use block from a message's content.
+
+    With a forced tool_choice the model emits exactly one tool_use block,
+    normally last (or first, when there is no leading text/thinking block),
+    so check both ends before scanning.
+    """
+    if content:
+        block = content[-1]
+        if block.type == "tool_use":
+            return block
+        block = content[0]
+        if block.type == "tool_use":
+            return block
+    for block in content:
+        if block.type == "tool_use":
+            return block
+    raise ValueError("Model response did not include a tool_use block")
+
+
+def compile_tool_validators(*tools: dict) -> dict[str, Callable[[dict], Any]]:
+    """
+    Compile each tool's input_schema once into a fastjsonschema validator,
+    keyed by tool name. Validators raise JsonSchemaValueException (a
+    ValueError) on mismatch.
+    """
+    return {tool["name"]: fastjsonschema.compile(tool["input_schema"]) for tool in tools}
@@ -7,19 +7,32 @@ Uses Anthropic tool calling for structured output.
 """
 from __future__ import annotations
 
+import asyncio
+import bisect
+import hashlib
 import json
 import logging
+import re
 import time
 
-from anthropic import AsyncAnthropic
+import orjson
 
-from app.config import settings
-from app.redis_client import cache_get, cache_set, get_session, set_session
+from app.agents._http import anthropic_client as client
+from app.agents._tools import pick_tool_use
+from app.config import ANTHROPIC_MODEL
+from app.redis_client import cache_get, cache_set, hgetall_session, hset_session_fields
 from app.schemas import ClarificationResult, CompletionSummary, ProgressMessage
 
 logger = logging.getLogger(__name__)
 
-client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+# How long a clarification cache lookup may run before the LLM call is
+# started speculatively alongside it (comfortably above p99 Redis GET).
+CACHE_HEAD_START_SECONDS = 0.015
+
+# Upper bound on free-text JSON replies; anything larger is a runaway output.
+MAX_JSON_REPLY_CHARS = 8192
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
 
 # ─── Tool schema (Anthropic format) ───────────────────────────────────────────
 
@@ -47,6 +60,23 @@ CLARIFICATION_TOOL = {
     },
 }
 
+# Request fragments built once at import and reused by every call
+_CLARIFICATION_TOOLS = (CLARIFICATION_TOOL,)
+_CLARIFICATION_CHOICE = {"type": "tool", "name": CLARIFICATION_TOOL["name"]}
+
+
+def _clarification_cache_key(text: str) -> str:
+    """
+    Stable cache key for a question's clarification.
+
+    Built-in hash() is salted per process, so it cannot be shared across
+    workers or restarts. Text is normalized so trivially different spellings
+    of the same question share one entry.
+    """
+    normalized = " ".join(text.split()).casefold()
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return f"clarification:{digest}"
+
 
 # ─── Attempt Agent ────────────────────────────────────────────────────────────
 
@@ -82,6 +112,17 @@ FORBIDDEN RESPONSES:
 - "This question is poorly worded..." (criticizing the survey)
 """
 
+    # Progress message tiers: 0%, (0, 33), [33, 66), [66, 90), [90, 100].
+    # Each entry takes (remaining, total, avg_seconds_per_question).
+    _PROGRESS_THRESHOLDS = (33, 66, 90)
+    _PROGRESS_MESSAGES = (
+        lambda remaining, total, avg: f"This survey takes about {int(total * avg / 60)} min. Let's go!",
+        lambda remaining, total, avg: "Great start! Keep going.",
+        lambda remaining, total, avg: f"Halfway there — only {remaining} questions left!",
+        lambda remaining, total, avg: "Almost done! Your input makes a difference.",
+        lambda remaining, total, avg: f"Just {remaining} more question{'s' if remaining > 1 else ''}!",
+    )
+
     async def clarify_question(
         self,
         session_id: str,
@@ -89,24 +130,68 @@ FORBIDDEN RESPONSES:
         doctor_context: dict | None = None,
     ) -> ClarificationResult:
         """Return a plain-English clarification for a survey question."""
-        t0 = time.monotonic()
+        t0 = time.perf_counter_ns()
+
+        # Check cache first — same question text often asked by many doctors.
+        # The lookup gets a short head start; if it hasn't answered by then the
+        # LLM call is started speculatively and raced against it, so a cache
+        # miss doesn't pay the Redis round trip before the (much longer) LLM call.
+        cache_key = _clarification_cache_key(question.get("text", ""))
+        cache_task = asyncio.create_task(cache_get(cache_key))
+        llm_task: asyncio.Task | None = None
+        try:
+            await asyncio.wait({cache_task}, timeout=CACHE_HEAD_START_SECONDS)
+            if not cache_task.done():
+                llm_task = asyncio.create_task(self._request_clarification(question, doctor_context))
+                await asyncio.wait({cache_task, llm_task}, return_when=asyncio.FIRST_COMPLETED)
+
+            cached = cache_task.result() if cache_task.done() else None
+            if cached:
+                if llm_task is not None:
+                    llm_task.cancel()
+                logger.info("attempt_agent.clarify_question.cache_hit question_id=%s", question.get("id"))
+                return ClarificationResult(**cached)
+
+            if llm_task is None:
+                llm_task = asyncio.create_task(self._request_clarification(question, doctor_context))
+            data = await llm_task
+        except BaseException:
+            for task in (cache_task, llm_task):
+                if task is not None:
+                    task.cancel()
+            raise
+        finally:
+            if not cache_task.done():
+                cache_task.cancel()
+
+        latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
 
-        # Check cache first — same question text often asked by many doctors
-        cache_key = f"clarification:{hash(question.get('text', ''))}"
-        cached = await cache_get(cache_key)
-        if cached:
-            logger.info(f"attempt_agent.clarify_question.cache_hit question_id={question.get('id')}")
-            return ClarificationResult(**cached)
+        # Safety assertion — clarification must never change meaning
+        if data.get("did_change_meaning"):
+            logger.warning("attempt_agent.clarify_question.meaning_changed question_id=%s", question.get("id"))
+            data["did_change_meaning"] = False
+
+        result = ClarificationResult(question_id=question.get("id", ""), **data)
 
+        # Cache for 24h
+        await cache_set(cache_key, result.model_dump(), ttl=86400)
+        logger.info(
+            "attempt_agent.clarify_question session_id=%s question_id=%s latency_ms=%d",
+            session_id, question.get("id"), latency_ms,
+        )
+        return result
+
+    async def _request_clarification(self, question: dict, doctor_context: dict | None) -> dict:
+        """Ask the model for a clarification; returns the tool input dict."""
         specialty = (doctor_context or {}).get("specialty", "General")
         experience = (doctor_context or {}).get("years_experience", "unknown")
 
         response = await client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
+            model=ANTHROPIC_MODEL,
             max_tokens=512,
             system=self.SYSTEM_PROMPT,
-            tools=[CLARIFICATION_TOOL],
-            tool_choice={"type": "tool", "name": "clarification_result"},
+            tools=_CLARIFICATION_TOOLS,
+            tool_choice=_CLARIFICATION_CHOICE,
             messages=[{
                 "role": "user",
                 "content": f"""A doctor needs help understanding this survey question.
@@ -114,33 +199,15 @@ FORBIDDEN RESPONSES:
 Doctor context: {specialty} specialty, {experience} years experience
 
 Question to clarify:
-{json.dumps(question, indent=2)}
+{json.dumps(question, separators=(",", ":"))}
 
 Provide a clarification using the clarification_result tool.
 Remember: explain the question, do NOT suggest an answer.""",
             }],
         )
 
-        latency_ms = int((time.monotonic() - t0) * 1000)
-
-        # Anthropic: find tool_use block, .input is already a dict
-        tool_use = next(b for b in response.content if b.type == "tool_use")
-        data = tool_use.input
-
-        # Safety assertion — clarification must never change meaning
-        if data.get("did_change_meaning"):
-            logger.warning(f"attempt_agent.clarify_question.meaning_changed question_id={question.get('id')}")
-            data["did_change_meaning"] = False
-
-        result = ClarificationResult(question_id=question.get("id", ""), **data)
-
-        # Cache for 24h
-        await cache_set(cache_key, result.model_dump(), ttl=86400)
-        logger.info(
-            f"attempt_agent.clarify_question session_id={session_id} "
-            f"question_id={question.get('id')} latency_ms={latency_ms}"
-        )
-        return result
+        # Anthropic: .input on the tool_use block is already a dict
+        return pick_tool_use(response.content).input
 
     async def get_progress(
         self,
@@ -154,18 +221,12 @@ Remember: explain the question, do NOT suggest an answer.""",
         estimated_seconds_remaining = int(remaining_questions * avg_seconds_per_question)
         percent_complete = round((questions_answered / questions_total) * 100, 1)
 
-        if percent_complete == 0:
-            message = f"This survey takes about {int(questions_total * avg_seconds_per_question / 60)} min. Let's go!"
-        elif percent_complete < 33:
-            message = "Great start! Keep going."
-        elif percent_complete < 66:
-            message = f"Halfway there — only {remaining_questions} questions left!"
-        elif percent_complete < 90:
-            message = "Almost done! Your input makes a difference."
-        else:
-            message = f"Just {remaining_questions} more question{'s' if remaining_questions > 1 else ''}!"
-
-        return ProgressMessage(
+        # Tier 0 is exactly 0%; tiers 1-4 split (0, 100] at the thresholds.
+        tier = bisect.bisect_right(self._PROGRESS_THRESHOLDS, percent_complete) + (percent_complete > 0)
+        message = self._PROGRESS_MESSAGES[tier](remaining_questions, questions_total, avg_seconds_per_question)
+
+        # Every field is computed right here, so skip the validator
+        return ProgressMessage.model_construct(
             questions_total=questions_total,
             questions_answered=questions_answered,
             estimated_seconds_remaining=estimated_seconds_remaining,
@@ -181,7 +242,7 @@ Remember: explain the question, do NOT suggest an answer.""",
     ) -> CompletionSummary:
         """Generate a personalized thank-you + aggregate insight after completion."""
         response = await client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
+            model=ANTHROPIC_MODEL,
             max_tokens=512,
             system=self.SYSTEM_PROMPT,
             messages=[{
@@ -207,10 +268,16 @@ Rules:
             }],
         )
 
-        text = response.content[0].text.strip()
-        if text.startswith("```"):
-            text = text.split("```")[1].lstrip("json").strip()
-        data = json.loads(text)
+        text = response.content[0].text
+        if len(text) > MAX_JSON_REPLY_CHARS:
+            raise ValueError(f"Completion summary reply too large ({len(text)} chars)")
+        # Usually bare JSON (orjson tolerates surrounding whitespace); only
+        # strip and regex-match when the model wrapped it in a fence anyway
+        if text.lstrip()[:3] == "```":
+            m = _FENCE_RE.match(text.strip())
+            if m:
+                text = m.group(1)
+        data = orjson.loads(text)
         return CompletionSummary(**data)
 
     # ─── Session management ───────────────────────────────────────────────────
@@ -218,23 +285,28 @@ Rules:
     async def save_partial_progress(
         self, session_id: str, survey_id: str, answers: dict
     ) -> None:
-        """Persist partial answers to Redis so doctor can resume later."""
-        session = await get_session(session_id) or {}
-        session.update({
-            "survey_id": survey_id,
-            "answers": answers,
-            "last_saved": time.time(),
-        })
-        await set_session(session_id, session, ttl=604800)  # 7 days
-        logger.info(f"attempt_agent.save_progress session_id={session_id} answers_count={len(answers)}")
+        """
+        Persist partial answers to Redis so doctor can resume later.
+
+        Answers are stored one hash field per question, so `answers` may be
+        either the full map or only the answers changed since the last save.
+        A cleared answer is sent as null and removed from the session.
+        """
+        await hset_session_fields(
+            session_id,
+            {"survey_id": survey_id, "last_saved": time.time()},
+            answers,
+            ttl=604800,  # 7 days
+        )
+        logger.info("attempt_agent.save_progress session_id=%s answers_count=%d", session_id, len(answers))
 
     async def restore_session(self, session_id: str) -> dict | None:
         """Restore doctor's in-progress answers from Redis."""
-        session = await get_session(session_id)
+        session = await hgetall_session(session_id)
         if session:
             logger.info(
-                f"attempt_agent.restore_session session_id={session_id} "
-                f"answers_count={len(session.get('answers', {}))}"
+                "attempt_agent.restore_session session_id=%s answers_count=%d",
+                session_id, len(session.get("answers", {})),
             )
         return session
 
@@ -7,23 +7,29 @@ Uses Anthropic tool calling for structured output.
 """
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
 
-from anthropic import AsyncAnthropic
+import orjson
+from pydantic import BaseModel, TypeAdapter
 
-from app.config import settings
+from app.agents._cache import get_cached_response, response_cache_key, set_cached_response
+from app.agents._http import anthropic_client as client
+from app.agents._tools import compile_tool_validators, pick_tool_use
+from app.config import ANTHROPIC_MODEL, settings
 from app.rag.knowledge_base import retrieve_guidelines
 from app.schemas import (
     GenerateVariantsResult,
+    QualityAndVariantsResult,
     QualityCheckResult,
+    Question,
 )
 
 logger = logging.getLogger(__name__)
 
-client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
-
 # ─── Tool schemas (Anthropic format) ──────────────────────────────────────────
 # Key differences from OpenAI:
 #   - No outer {"type": "function", "function": {...}} wrapper — tools are flat
@@ -144,22 +150,92 @@ GENERATE_VARIANTS_TOOL = {
 }
 
 
-# ─── Design Agent ─────────────────────────────────────────────────────────────
-
+IMPROVE_QUESTION_TOOL = {
+    "name": "improve_question_result",
+    "description": "Returns the improved version of a survey question",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string"},
+            "text": {"type": "string"},
+            "type": {
+                "type": "string",
+                "enum": ["mcq", "likert", "text", "boolean", "ranking"],
+            },
+            "options": {"type": "array", "items": {"type": "string"}},
+            "required": {"type": "boolean"},
+            "hint": {
+                "type": "string",
+                "description": "1-sentence hint the doctor can reveal if confused",
+            },
+        },
+        "required": ["id", "text", "type", "hint"],
+    },
+}
 
-class DesignAgent:
-    """
-    Admin-facing agent.
+SUGGEST_QUESTIONS_TOOL = {
+    "name": "suggest_questions_result",
+    "description": "Returns suggested survey questions for a survey goal",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "questions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "text": {"type": "string"},
+                        "type": {
+                            "type": "string",
+                            "enum": ["mcq", "likert", "text", "boolean", "ranking"],
+                        },
+                        "options": {"type": "array", "items": {"type": "string"}},
+                        "rationale": {"type": "string"},
+                    },
+                    "required": ["text", "type", "rationale"],
+                },
+            }
+        },
+        "required": ["questions"],
+    },
+}
 
-    Methods
-    -------
-    quality_check(survey_title, questions, specialty) → QualityCheckResult
-    improve_question(question) → dict
-    generate_variants(title, questions, num_variants) → GenerateVariantsResult
-    suggest_question_types(survey_goal) → list[dict]
-    """
+# Cached design results are replayed for a week; bump SYSTEM_PROMPT_VERSION
+# whenever SYSTEM_PROMPT or the tool schemas change to invalidate them.
+SYSTEM_PROMPT_VERSION = 1
+RESPONSE_CACHE_TTL = 604800
+SUGGEST_CACHE_TTL = 86400
+
+# improve_questions: max concurrent interactive requests, and how often to
+# poll a Message Batch for completion.
+IMPROVE_CONCURRENCY = 8
+BATCH_POLL_SECONDS = 30
+
+# Validators built once at import; the tool schemas already constrain the
+# model's output, so results are validated straight from the tool input dict.
+_QUALITY_CHECK_ADAPTER = TypeAdapter(QualityCheckResult)
+_GENERATE_VARIANTS_ADAPTER = TypeAdapter(GenerateVariantsResult)
+_QUESTION_LIST_ADAPTER = TypeAdapter(list[Question])
+# Precompiled schema checks, only run when settings.VALIDATE_TOOL_OUTPUT is set
+_TOOL_VALIDATORS = compile_tool_validators(
+    QUALITY_CHECK_TOOL, GENERATE_VARIANTS_TOOL, IMPROVE_QUESTION_TOOL, SUGGEST_QUESTIONS_TOOL,
+)
 
-    SYSTEM_PROMPT = """You are an expert survey methodologist helping healthcare platform
+# Request fragments built once at import and reused by every call
+_QUALITY_CHECK_TOOLS = (QUALITY_CHECK_TOOL,)
+_QUALITY_CHECK_CHOICE = {"type": "tool", "name": QUALITY_CHECK_TOOL["name"]}
+_GENERATE_VARIANTS_TOOLS = (GENERATE_VARIANTS_TOOL,)
+_GENERATE_VARIANTS_CHOICE = {"type": "tool", "name": GENERATE_VARIANTS_TOOL["name"]}
+_ANALYZE_AND_VARIANT_TOOLS = (QUALITY_CHECK_TOOL, GENERATE_VARIANTS_TOOL)
+_IMPROVE_QUESTION_TOOLS = (IMPROVE_QUESTION_TOOL,)
+_IMPROVE_QUESTION_CHOICE = {"type": "tool", "name": IMPROVE_QUESTION_TOOL["name"]}
+_SUGGEST_QUESTIONS_TOOLS = (SUGGEST_QUESTIONS_TOOL,)
+_SUGGEST_QUESTIONS_CHOICE = {"type": "tool", "name": SUGGEST_QUESTIONS_TOOL["name"]}
+_ANY_TOOL_CHOICE = {"type": "any"}
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+SYSTEM_PROMPT = """You are an expert survey methodologist helping healthcare platform
 admins create high-quality surveys for busy doctors.
 
 CORE RESPONSIBILITIES:
@@ -185,62 +261,192 @@ MANDATORY RULES:
 - Suggested completion time MUST be ≤ 3 minutes (180 seconds)
 """
 
+
+def _questions_json(questions: Sequence[Question] | list[dict]) -> str:
+    """Compact JSON for prompts; Question models are serialized in one pass."""
+    if questions and isinstance(questions[0], BaseModel):
+        return _QUESTION_LIST_ADAPTER.dump_json(list(questions)).decode()
+    return orjson.dumps(questions).decode()
+
+
+# ─── Design Agent ─────────────────────────────────────────────────────────────
+
+
+@dataclass(slots=True, frozen=True)
+class DesignAgent:
+    """
+    Admin-facing agent.
+
+    Methods
+    -------
+    quality_check(survey_title, questions, specialty) → QualityCheckResult
+    improve_question(question) → dict
+    improve_questions(questions, use_batch_api) → list[dict | None]
+    generate_variants(title, questions, num_variants) → GenerateVariantsResult
+    analyze_and_variant(title, questions, specialty, num_variants) → QualityAndVariantsResult
+    suggest_question_types(survey_goal) → list[dict]
+    """
+
+    system_prompt: str = SYSTEM_PROMPT
+
     async def quality_check(
         self,
         survey_title: str,
-        questions: list[dict],
+        questions: Sequence[Question] | list[dict],
         specialty: str | None = None,
         admin_id: str | None = None,
     ) -> QualityCheckResult:
         """Run full quality check on a survey."""
-        t0 = time.monotonic()
-        guidelines = await retrieve_guidelines(survey_title)
-
-        response = await client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
-            max_tokens=4096,
-            system=self.SYSTEM_PROMPT,
-            tools=[QUALITY_CHECK_TOOL],
-            tool_choice={"type": "tool", "name": "quality_check_result"},
-            messages=[{
-                "role": "user",
-                "content": f"""Analyze this survey for quality, bias, and clarity.
-
-Survey Title: {survey_title}
-Target Specialty: {specialty or "All specialties"}
-Questions:
-{json.dumps(questions, indent=2)}
-
-Relevant Platform Guidelines:
-{guidelines}
-
-Run a comprehensive quality check using the quality_check_result tool.""",
-            }],
+        t0 = time.perf_counter_ns()
+        # Fetch guidelines concurrently with the result-cache lookup
+        guidelines_task = asyncio.create_task(retrieve_guidelines(survey_title))
+
+        questions_json = _questions_json(questions)
+        cache_key = self._quality_check_cache_key(survey_title, questions_json, specialty)
+        cached = await get_cached_response(cache_key)
+        if cached:
+            guidelines_task.cancel()
+            logger.info("design_agent.quality_check.cache_hit survey=%s", survey_title)
+            return _QUALITY_CHECK_ADAPTER.validate_json(cached)
+
+        guidelines = await guidelines_task
+
+        data = await self._call_tool(
+            self._quality_check_request(survey_title, questions_json, specialty, guidelines)
         )
 
-        latency_ms = int((time.monotonic() - t0) * 1000)
-        # Anthropic: find the tool_use block and read .input (already a dict)
-        tool_use = next(b for b in response.content if b.type == "tool_use")
-        data = tool_use.input
-
-        logger.info(
-            f"design_agent.quality_check survey={survey_title} latency_ms={latency_ms} "
-            f"score={data.get('overall_quality_score')} bias_count={len(data.get('bias_flags', []))}"
-        )
-        return QualityCheckResult(**data)
+        if logger.isEnabledFor(logging.INFO):
+            latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
+            logger.info(
+                "design_agent.quality_check survey=%s latency_ms=%d score=%s bias_count=%d",
+                survey_title, latency_ms, data.get("overall_quality_score"), len(data.get("bias_flags", [])),
+            )
+        result = _QUALITY_CHECK_ADAPTER.validate_python(data)
+        await set_cached_response(cache_key, result.model_dump_json(), ttl=RESPONSE_CACHE_TTL)
+        return result
+
+    async def quality_check_stream(
+        self,
+        survey_title: str,
+        questions: Sequence[Question] | list[dict],
+        specialty: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming variant of quality_check.
+
+        Yields {"type": "bias_flag", "flag": {...}} as soon as each bias flag
+        has been fully generated, then a final {"type": "result", "result": {...}}
+        with the validated QualityCheckResult. Cache hits yield only the result.
+        """
+        t0 = time.perf_counter_ns()
+        guidelines_task = asyncio.create_task(retrieve_guidelines(survey_title))
+
+        questions_json = _questions_json(questions)
+        cache_key = self._quality_check_cache_key(survey_title, questions_json, specialty)
+        cached = await get_cached_response(cache_key)
+        if cached:
+            guidelines_task.cancel()
+            logger.info("design_agent.quality_check_stream.cache_hit survey=%s", survey_title)
+            result = _QUALITY_CHECK_ADAPTER.validate_json(cached)
+            yield {"type": "result", "result": result.model_dump(mode="json")}
+            return
+
+        guidelines = await guidelines_task
+        request = self._quality_check_request(survey_title, questions_json, specialty, guidelines)
+
+        emitted = 0
+        async with client.messages.stream(**request) as stream:
+            async for event in stream:
+                if event.type != "input_json":
+                    continue
+                # A flag is complete once the model has started the next one
+                flags = event.snapshot.get("bias_flags") or []
+                while emitted < len(flags) - 1:
+                    yield {"type": "bias_flag", "flag": flags[emitted]}
+                    emitted += 1
+            message = await stream.get_final_message()
+
+        data = self._tool_input(pick_tool_use(message.content))
+        for flag in data.get("bias_flags", [])[emitted:]:
+            yield {"type": "bias_flag", "flag": flag}
+
+        latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
+        logger.info("design_agent.quality_check_stream survey=%s latency_ms=%d", survey_title, latency_ms)
+        result = _QUALITY_CHECK_ADAPTER.validate_python(data)
+        await set_cached_response(cache_key, result.model_dump_json(), ttl=RESPONSE_CACHE_TTL)
+        yield {"type": "result", "result": result.model_dump(mode="json")}
 
     async def improve_question(self, question: dict) -> dict:
         """Return an improved version of a single question."""
-        response = await client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
+        improved = await self._call_tool(self._improve_question_params(question))
+        logger.info("design_agent.improve_question question_id=%s", question.get("id"))
+        return improved
+
+    async def improve_questions(
+        self,
+        questions: list[dict],
+        use_batch_api: bool = False,
+    ) -> list[dict | None]:
+        """
+        Improve many questions at once; results keep the input order.
+
+        Interactive callers get concurrent requests (bounded by
+        IMPROVE_CONCURRENCY). With use_batch_api=True the questions are sent
+        as one Message Batch instead — half the cost, but results can take
+        a long time, so only use it off the request path. Questions that
+        fail to improve come back as None.
+        """
+        if use_batch_api:
+            return await self._improve_questions_batch(questions)
+
+        sem = asyncio.Semaphore(IMPROVE_CONCURRENCY)
+
+        async def _one(question: dict) -> dict:
+            async with sem:
+                return await self.improve_question(question)
+
+        results = await asyncio.gather(*(_one(q) for q in questions), return_exceptions=True)
+        improved: list[dict | None] = []
+        for question, result in zip(questions, results):
+            if isinstance(result, BaseException):
+                logger.warning("design_agent.improve_questions.failed question_id=%s error=%s", question.get("id"), result)
+                improved.append(None)
+            else:
+                improved.append(result)
+        return improved
+
+    async def _improve_questions_batch(self, questions: list[dict]) -> list[dict | None]:
+        batch = await client.messages.batches.create(requests=[
+            {"custom_id": f"q{i}", "params": self._improve_question_params(q)}
+            for i, q in enumerate(questions)
+        ])
+        logger.info("design_agent.improve_questions.batch_submitted batch_id=%s count=%d", batch.id, len(questions))
+
+        while batch.processing_status != "ended":
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        improved: list[dict | None] = [None] * len(questions)
+        async for entry in await client.messages.batches.results(batch.id):
+            index = int(entry.custom_id[1:])
+            if entry.result.type != "succeeded":
+                logger.warning("design_agent.improve_questions.failed custom_id=%s result=%s", entry.custom_id, entry.result.type)
+                continue
+            try:
+                improved[index] = pick_tool_use(entry.result.message.content).input
+            except ValueError:
+                logger.warning("design_agent.improve_questions.failed custom_id=%s result=no_tool_use", entry.custom_id)
+        return improved
+
+    def _improve_question_params(self, question: dict) -> dict:
+        return self._tool_request(
+            tools=_IMPROVE_QUESTION_TOOLS,
+            tool_choice=_IMPROVE_QUESTION_CHOICE,
             max_tokens=1024,
-            system=self.SYSTEM_PROMPT,
-            messages=[{
-                "role": "user",
-                "content": f"""Improve this survey question for clarity, neutrality, and mobile-friendliness.
+            content=f"""Improve this survey question for clarity, neutrality, and mobile-friendliness.
 
 Original question:
-{json.dumps(question, indent=2)}
+{orjson.dumps(question).decode()}
 
 Improvements to apply:
 - Remove bias or leading language
@@ -248,37 +454,35 @@ Improvements to apply:
 - If MCQ: ensure options are complete, mutually exclusive, balanced
 - Add a brief 'hint' field (1 sentence) the doctor can reveal if confused
 
-Respond with ONLY a JSON object (no markdown fences).""",
-            }],
+Return the improved question using the improve_question_result tool.""",
         )
 
-        text = response.content[0].text.strip()
-        if text.startswith("```"):
-            text = text.split("```")[1].lstrip("json").strip()
-        improved = json.loads(text)
-        logger.info(f"design_agent.improve_question question_id={question.get('id')}")
-        return improved
-
     async def generate_variants(
         self,
         title: str,
-        questions: list[dict],
+        questions: Sequence[Question] | list[dict],
         num_variants: int = 2,
     ) -> GenerateVariantsResult:
         """Generate A/B test variants with predicted completion rates."""
-        response = await client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
+        questions_json = _questions_json(questions)
+        cache_key = response_cache_key(
+            "generate_variants",
+            title, questions_json, num_variants, ANTHROPIC_MODEL, SYSTEM_PROMPT_VERSION,
+        )
+        cached = await get_cached_response(cache_key)
+        if cached:
+            logger.info("design_agent.generate_variants.cache_hit title=%s", title)
+            return _GENERATE_VARIANTS_ADAPTER.validate_json(cached)
+
+        data = await self._call_tool(self._tool_request(
+            tools=_GENERATE_VARIANTS_TOOLS,
+            tool_choice=_GENERATE_VARIANTS_CHOICE,
             max_tokens=4096,
-            system=self.SYSTEM_PROMPT,
-            tools=[GENERATE_VARIANTS_TOOL],
-            tool_choice={"type": "tool", "name": "generate_variants_result"},
-            messages=[{
-                "role": "user",
-                "content": f"""Create {num_variants} A/B test variants of this survey.
+            content=f"""Create {num_variants} A/B test variants of this survey.
 
 Survey: {title}
 Original Questions:
-{json.dumps(questions, indent=2)}
+{questions_json}
 
 Variant strategy:
 - Variant A: Keep original order, polish wording
@@ -286,36 +490,172 @@ Variant strategy:
 - Each variant must have its own hypothesis and predicted completion rate
 
 Use the generate_variants_result tool.""",
-            }],
+        ))
+
+        logger.info("design_agent.generate_variants title=%s num_variants=%d", title, num_variants)
+        result = _GENERATE_VARIANTS_ADAPTER.validate_python(data)
+        await set_cached_response(cache_key, result.model_dump_json(), ttl=RESPONSE_CACHE_TTL)
+        return result
+
+    async def analyze_and_variant(
+        self,
+        title: str,
+        questions: Sequence[Question] | list[dict],
+        specialty: str | None = None,
+        num_variants: int = 2,
+    ) -> QualityAndVariantsResult:
+        """
+        Quality check + A/B variants in a single request.
+
+        Both tools are offered together so the shared context (system prompt,
+        guidelines, questions) is sent and prefilled once. If the model skips
+        one of the tools, that half falls back to its standalone call.
+        """
+        t0 = time.perf_counter_ns()
+        guidelines = await retrieve_guidelines(title)
+
+        response = await client.messages.create(**self._tool_request(
+            tools=_ANALYZE_AND_VARIANT_TOOLS,
+            tool_choice=_ANY_TOOL_CHOICE,
+            max_tokens=8192,
+            system=self._system_with_guidelines(guidelines),
+            content=f"""Analyze the survey below for quality, bias, and clarity, then create {num_variants} A/B test variants of it.
+
+Variant strategy:
+- Variant A: Keep original order, polish wording
+- Variant B: Reorder to most engaging questions first, trim to shortest viable set
+- Each variant must have its own hypothesis and predicted completion rate
+
+Call BOTH tools: quality_check_result with the comprehensive quality check,
+and generate_variants_result with the variants.
+
+Survey Title: {title}
+Target Specialty: {specialty or "All specialties"}
+Questions:
+{_questions_json(questions)}""",
+        ))
+
+        outputs = {b.name: self._tool_input(b) for b in response.content if b.type == "tool_use"}
+        latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
+        logger.info(
+            "design_agent.analyze_and_variant survey=%s latency_ms=%d tools=%s",
+            title, latency_ms, sorted(outputs),
         )
 
-        tool_use = next(b for b in response.content if b.type == "tool_use")
-        data = tool_use.input
-        logger.info(f"design_agent.generate_variants title={title} num_variants={num_variants}")
-        return GenerateVariantsResult(**data)
+        if QUALITY_CHECK_TOOL["name"] in outputs:
+            quality = _QUALITY_CHECK_ADAPTER.validate_python(outputs[QUALITY_CHECK_TOOL["name"]])
+        else:
+            quality = await self.quality_check(title, questions, specialty)
+
+        if GENERATE_VARIANTS_TOOL["name"] in outputs:
+            variants = _GENERATE_VARIANTS_ADAPTER.validate_python(outputs[GENERATE_VARIANTS_TOOL["name"]])
+        else:
+            variants = await self.generate_variants(title, questions, num_variants)
+
+        return QualityAndVariantsResult(quality=quality, variants=variants)
 
     async def suggest_question_types(self, survey_goal: str) -> list[dict]:
         """Given a survey goal, suggest the best question structure."""
-        response = await client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
+        # Goals differing only in case/whitespace share one cached suggestion set
+        normalized_goal = " ".join(survey_goal.split()).casefold()
+        cache_key = response_cache_key(
+            "suggest_questions", normalized_goal, ANTHROPIC_MODEL, SYSTEM_PROMPT_VERSION,
+        )
+        cached = await get_cached_response(cache_key)
+        if cached:
+            logger.info("design_agent.suggest_question_types.cache_hit")
+            return orjson.loads(cached)
+
+        data = await self._call_tool(self._tool_request(
+            tools=_SUGGEST_QUESTIONS_TOOLS,
+            tool_choice=_SUGGEST_QUESTIONS_CHOICE,
             max_tokens=2048,
-            system=self.SYSTEM_PROMPT,
-            messages=[{
-                "role": "user",
-                "content": f"""A healthcare admin wants to run a survey with this goal:
+            content=f"""A healthcare admin wants to run a survey with this goal:
 "{survey_goal}"
 
 Suggest 5-8 questions with ideal question types, options (if MCQ/Likert), and a brief rationale.
-Return ONLY a JSON object in this exact format (no markdown fences):
-{{"questions": [{{"text": "...", "type": "...", "options": [...], "rationale": "..."}}]}}""",
-            }],
+Return them using the suggest_questions_result tool.""",
+        ))
+        suggestions = data.get("questions", [])
+        await set_cached_response(
+            cache_key, orjson.dumps(suggestions).decode(), ttl=SUGGEST_CACHE_TTL
         )
+        return suggestions
 
-        text = response.content[0].text.strip()
-        if text.startswith("```"):
-            text = text.split("```")[1].lstrip("json").strip()
-        data = json.loads(text)
-        return data.get("questions", [])
+    # ─── Request helpers ──────────────────────────────────────────────────────
+
+    def _tool_request(
+        self,
+        *,
+        tools: tuple[dict, ...],
+        tool_choice: dict,
+        content: str,
+        max_tokens: int,
+        system: str | list[dict] | None = None,
+    ) -> dict:
+        """Build messages.create() params for a single-turn tool call."""
+        return {
+            "model": ANTHROPIC_MODEL,
+            "max_tokens": max_tokens,
+            "system": self.system_prompt if system is None else system,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "messages": [{"role": "user", "content": content}],
+        }
+
+    async def _call_tool(self, request: dict) -> dict:
+        """Send a tool-call request and return the tool_use input (already a dict)."""
+        response = await client.messages.create(**request)
+        return self._tool_input(pick_tool_use(response.content))
+
+    def _tool_input(self, block) -> dict:
+        if settings.VALIDATE_TOOL_OUTPUT:
+            _TOOL_VALIDATORS[block.name](block.input)
+        return block.input
+
+    def _quality_check_cache_key(
+        self, survey_title: str, questions_json: str, specialty: str | None
+    ) -> str:
+        return response_cache_key(
+            "quality_check",
+            survey_title, questions_json, specialty, ANTHROPIC_MODEL, SYSTEM_PROMPT_VERSION,
+        )
+
+    def _quality_check_request(
+        self,
+        survey_title: str,
+        questions_json: str,
+        specialty: str | None,
+        guidelines: str,
+    ) -> dict:
+        return self._tool_request(
+            tools=_QUALITY_CHECK_TOOLS,
+            tool_choice=_QUALITY_CHECK_CHOICE,
+            max_tokens=4096,
+            system=self._system_with_guidelines(guidelines),
+            content=f"""Run a comprehensive quality check (quality, bias, clarity) on the survey below using the quality_check_result tool.
+
+Survey Title: {survey_title}
+Target Specialty: {specialty or "All specialties"}
+Questions:
+{questions_json}""",
+        )
+
+    def _system_with_guidelines(self, guidelines: str) -> list[dict]:
+        """
+        System blocks for prompt caching: the static system prompt, then the
+        retrieved guidelines, each marked as a cache breakpoint. Together with
+        the (static) tools they form a byte-identical prefix across calls;
+        survey-specific content goes last, in the user message.
+        """
+        return [
+            {"type": "text", "text": self.system_prompt, "cache_control": _EPHEMERAL},
+            {
+                "type": "text",
+                "text": f"Relevant Platform Guidelines:\n{guidelines}",
+                "cache_control": _EPHEMERAL,
+            },
+        ]
 
 
 # Module-level singleton
@@ -8,18 +8,28 @@ Uses Anthropic tool calling for structured output.
 """
 from __future__ import annotations
 
-import json
 import logging
 import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from itertools import islice
 
-from anthropic import AsyncAnthropic
+import orjson
 
-from app.config import settings
-from app.schemas import ActionItem, InsightResult
+from app.agents._http import anthropic_client as client
+from app.agents._tools import pick_tool_use
+from app.agents.insight_cache import insight_semantic_cache
+from app.config import ANTHROPIC_MODEL, settings
+from app.rag.clustering import cluster_texts
+from app.schemas import ActionItem, InsightResult, Theme
 
 logger = logging.getLogger(__name__)
 
-client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+# Open-ended answers included verbatim in the prompt; above this, answers are
+# clustered and only cluster sizes + representative quotes are sent.
+MAX_OPEN_RESPONSES = 200
+# Upper bound on answers embedded for clustering
+MAX_CLUSTERED_RESPONSES = 5000
 
 # ─── Tool schema (Anthropic format) ───────────────────────────────────────────
 
@@ -97,6 +107,51 @@ INSIGHT_TOOL = {
     },
 }
 
+# Request fragments built once at import. The cache breakpoint on the system
+# block covers the (static) tool schema before it, so only the survey data in
+# the user message is reprocessed on every call.
+_INSIGHT_TOOLS = (INSIGHT_TOOL,)
+_INSIGHT_CHOICE = {"type": "tool", "name": INSIGHT_TOOL["name"]}
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _theme(data: dict) -> Theme:
+    # representative_quotes is optional in the tool schema
+    return Theme.model_construct(**{"representative_quotes": [], **data})
+
+
+def _action_item(data: dict) -> ActionItem:
+    return ActionItem.model_construct(**data)
+
+
+# List fields analyze_stream() emits item by item: (tool input field, chunk type)
+_STREAMED_LISTS = (("themes", "theme"), ("action_items", "action_item"))
+
+
+def _insight_from_tool_input(data: dict) -> InsightResult:
+    """
+    Build an InsightResult from insight_result tool input without running
+    Pydantic validation. The shape is guaranteed by the tool schema (forced
+    via tool_choice), not by runtime validation, so only the list fields are
+    sanity-checked before the models are assembled with model_construct.
+    """
+    if not isinstance(data.get("themes"), list) or not isinstance(data.get("action_items"), list):
+        raise ValueError("insight_result tool input is missing themes or action_items")
+    return InsightResult.model_construct(
+        executive_summary=data.get("executive_summary", ""),
+        completion_rate=data["completion_rate"],
+        themes=[_theme(t) for t in data["themes"]],
+        action_items=[_action_item(a) for a in data["action_items"]],
+        sentiment_breakdown=data.get("sentiment_breakdown", {}),
+        segment_insights=data.get("segment_insights", []),
+    )
+
+
+def _open_response_texts(open_responses: list[str] | list[dict]) -> list[str]:
+    if open_responses and isinstance(open_responses[0], dict):
+        return [q for c in open_responses for q in c["representative_quotes"]]
+    return open_responses
+
 
 # ─── Insight Agent ────────────────────────────────────────────────────────────
 
@@ -108,6 +163,9 @@ class InsightAgent:
     Methods
     -------
     analyze(survey_metadata, responses, completion_rate) → InsightResult
+    analyze_stream(survey_metadata, responses, completion_rate) → AsyncIterator[dict]
+    submit_batch(surveys) → batch_id
+    fetch_batch_results(batch_id, completion_rates) → dict[survey_id, InsightResult] | None
     """
 
     SYSTEM_PROMPT = """You are a healthcare survey analyst helping organizations
@@ -142,23 +200,205 @@ SAFETY RULES:
     ) -> InsightResult:
         """
         Full post-survey analysis. Called after survey closes.
-        Handles large response sets by chunking open-ended answers.
+        Handles large response sets by clustering open-ended answers.
         """
-        t0 = time.monotonic()
+        t0 = time.perf_counter_ns()
 
         if not responses:
             return self._empty_result(completion_rate)
 
-        open_responses = self._extract_open_responses(responses)
+        open_responses = await self._open_response_input(responses)
         quant_summary = self._summarize_quantitative(responses, survey_metadata)
 
-        response = await client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
-            max_tokens=4096,
-            system=self.SYSTEM_PROMPT,
-            tools=[INSIGHT_TOOL],
-            tool_choice={"type": "tool", "name": "insight_result"},
-            messages=[{
+        embeddings, cached = await self._semantic_cache_lookup(survey_metadata, open_responses, quant_summary)
+        if cached is not None:
+            return _insight_from_tool_input({**cached, "completion_rate": completion_rate})
+
+        response = await client.messages.create(**self._request_params(
+            survey_metadata, responses, completion_rate, open_responses, quant_summary
+        ))
+
+        # Anthropic: .input on the tool_use block is already a dict
+        data = pick_tool_use(response.content).input
+
+        # Always override with actual completion rate — don't trust LLM math
+        data["completion_rate"] = completion_rate
+
+        if embeddings is not None:
+            await insight_semantic_cache.store(*embeddings, data)
+
+        if logger.isEnabledFor(logging.INFO):
+            latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
+            logger.info(
+                "insight_agent.analyze survey_id=%s responses_count=%d themes_found=%d latency_ms=%d",
+                survey_metadata.get("id"), len(responses), len(data.get("themes", [])), latency_ms,
+            )
+        return _insight_from_tool_input(data)
+
+    async def analyze_stream(
+        self,
+        survey_metadata: dict,
+        responses: list[dict],
+        completion_rate: float,
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming variant of analyze.
+
+        Yields {"type": "executive_summary", "text": str} once the summary is
+        complete, {"type": "theme", "theme": Theme} and
+        {"type": "action_item", "action_item": ActionItem} as each is fully
+        generated, then a final {"type": "result", "result": InsightResult}.
+        Every chunk is emitted exactly once, so cache hits and empty surveys
+        produce the same sequence (all at once).
+        """
+        t0 = time.perf_counter_ns()
+        summary_sent = False
+        emitted = {field: 0 for field, _ in _STREAMED_LISTS}
+
+        if not responses:
+            result = self._empty_result(completion_rate)
+        else:
+            open_responses = await self._open_response_input(responses)
+            quant_summary = self._summarize_quantitative(responses, survey_metadata)
+
+            embeddings, cached = await self._semantic_cache_lookup(survey_metadata, open_responses, quant_summary)
+            if cached is not None:
+                data = {**cached, "completion_rate": completion_rate}
+            else:
+                params = self._request_params(
+                    survey_metadata, responses, completion_rate, open_responses, quant_summary
+                )
+                async with client.messages.stream(**params) as stream:
+                    async for event in stream:
+                        if event.type != "input_json":
+                            continue
+                        # Only the field currently being generated (the last
+                        # key in the snapshot) can still be incomplete
+                        snapshot = event.snapshot
+                        current = next(reversed(snapshot), None)
+                        if not summary_sent and "executive_summary" in snapshot and current != "executive_summary":
+                            yield {"type": "executive_summary", "text": snapshot["executive_summary"]}
+                            summary_sent = True
+                        for field, kind in _STREAMED_LISTS:
+                            items = snapshot.get(field) or []
+                            done = len(items) - 1 if current == field else len(items)
+                            while emitted[field] < done:
+                                item = items[emitted[field]]
+                                yield {"type": kind, kind: _theme(item) if field == "themes" else _action_item(item)}
+                                emitted[field] += 1
+                    message = await stream.get_final_message()
+
+                data = pick_tool_use(message.content).input
+                # Always override with actual completion rate — don't trust LLM math
+                data["completion_rate"] = completion_rate
+                if embeddings is not None:
+                    await insight_semantic_cache.store(*embeddings, data)
+            result = _insight_from_tool_input(data)
+
+        if not summary_sent:
+            yield {"type": "executive_summary", "text": result.executive_summary}
+        for field, kind in _STREAMED_LISTS:
+            for item in getattr(result, field)[emitted[field]:]:
+                yield {"type": kind, kind: item}
+
+        if logger.isEnabledFor(logging.INFO):
+            latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
+            logger.info(
+                "insight_agent.analyze_stream survey_id=%s responses_count=%d latency_ms=%d",
+                survey_metadata.get("id"), len(responses), latency_ms,
+            )
+        yield {"type": "result", "result": result}
+
+    async def _semantic_cache_lookup(
+        self, survey_metadata: dict, open_responses: list[str] | list[dict], quant_summary: dict
+    ) -> tuple[tuple | None, dict | None]:
+        """
+        ((scope, e_p, e_r), cached tool input) from the semantic cache, scoped
+        to the survey's admin_id; (None, None) when disabled or unscoped.
+        """
+        scope = survey_metadata.get("admin_id")
+        if not settings.INSIGHT_SEMANTIC_CACHE or not scope:
+            return None, None
+        embeddings = (str(scope), *await insight_semantic_cache.embed(
+            f"{survey_metadata.get('title')}\n{orjson.dumps(quant_summary).decode()}",
+            _open_response_texts(open_responses),
+        ))
+        return embeddings, await insight_semantic_cache.lookup(*embeddings)
+
+    async def submit_batch(
+        self, surveys: list[tuple[dict, list[dict], float]]
+    ) -> str:
+        """
+        Submit offline analyses through the Message Batches API (half the
+        token cost, outside the real-time rate limits). `surveys` holds
+        (survey_metadata, responses, completion_rate) tuples for surveys with
+        at least one response; each request's custom_id is the survey id.
+        Returns the batch id.
+        """
+        requests = []
+        for survey_metadata, responses, completion_rate in surveys:
+            requests.append({
+                "custom_id": str(survey_metadata["id"]),
+                "params": self._request_params(
+                    survey_metadata,
+                    responses,
+                    completion_rate,
+                    await self._open_response_input(responses),
+                    self._summarize_quantitative(responses, survey_metadata),
+                ),
+            })
+        batch = await client.messages.batches.create(requests=requests)
+        logger.info("insight_agent.submit_batch batch_id=%s count=%d", batch.id, len(surveys))
+        return batch.id
+
+    async def fetch_batch_results(
+        self, batch_id: str, completion_rates: dict[str, float]
+    ) -> dict[str, InsightResult] | None:
+        """
+        Collect results of a batch from submit_batch, keyed by survey id.
+        Returns None while the batch is still processing; surveys whose
+        request failed are missing from the result.
+        """
+        batch = await client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+
+        results: dict[str, InsightResult] = {}
+        async for entry in await client.messages.batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                logger.warning("insight_agent.batch_failed survey_id=%s result=%s", entry.custom_id, entry.result.type)
+                continue
+            data = pick_tool_use(entry.result.message.content).input
+            data["completion_rate"] = completion_rates.get(entry.custom_id, data.get("completion_rate", 0.0))
+            results[entry.custom_id] = _insight_from_tool_input(data)
+        return results
+
+    # ─── Private helpers ──────────────────────────────────────────────────────
+
+    def _request_params(
+        self,
+        survey_metadata: dict,
+        responses: list[dict],
+        completion_rate: float,
+        open_responses: list[str] | list[dict],
+        quant_summary: dict,
+    ) -> dict:
+        """messages.create() params shared by the real-time and batch paths."""
+        if open_responses and isinstance(open_responses[0], dict):
+            total = sum(c["size"] for c in open_responses)
+            open_label = (
+                f"Open-Ended Responses ({total} answers grouped by similarity — "
+                "cluster size + representative quotes; use sizes for prevalence)"
+            )
+        else:
+            open_label = "Open-Ended Responses"
+        return {
+            "model": ANTHROPIC_MODEL,
+            "max_tokens": 4096,
+            "system": [{"type": "text", "text": self.SYSTEM_PROMPT, "cache_control": _EPHEMERAL}],
+            "tools": _INSIGHT_TOOLS,
+            "tool_choice": _INSIGHT_CHOICE,
+            "messages": [{
                 "role": "user",
                 "content": f"""Analyze these survey results and generate comprehensive insights.
 
@@ -168,75 +408,71 @@ Total Respondents: {len(responses)}
 Completion Rate: {completion_rate:.1f}%
 
 Quantitative Summary:
-{json.dumps(quant_summary, indent=2)}
+{orjson.dumps(quant_summary).decode()}
 
-Open-Ended Responses (sample of up to 200):
-{json.dumps(open_responses[:200], indent=2)}
+{open_label}:
+{orjson.dumps(open_responses).decode()}
 
 Segment Distribution:
-{json.dumps(self._get_segments(responses), indent=2)}
+{orjson.dumps(self._get_segments(responses), option=orjson.OPT_NON_STR_KEYS).decode()}
 
 Generate full insights using the insight_result tool.
 Focus on actionable findings. Paraphrase quotes — never include identifiable info.""",
             }],
-        )
-
-        latency_ms = int((time.monotonic() - t0) * 1000)
-
-        # Anthropic: find tool_use block, .input is already a dict
-        tool_use = next(b for b in response.content if b.type == "tool_use")
-        data = tool_use.input
-
-        # Always override with actual completion rate — don't trust LLM math
-        data["completion_rate"] = completion_rate
+        }
 
-        logger.info(
-            f"insight_agent.analyze survey_id={survey_metadata.get('id')} "
-            f"responses_count={len(responses)} themes_found={len(data.get('themes', []))} "
-            f"latency_ms={latency_ms}"
-        )
-        return InsightResult(**data)
-
-    # ─── Private helpers ──────────────────────────────────────────────────────
-
-    def _extract_open_responses(self, responses: list[dict]) -> list[str]:
-        """Pull all text-type answers into a flat list.
+    def _iter_open_responses(self, responses: list[dict]) -> Iterator[str]:
+        """Yield text-type answers lazily; callers islice() what they need.
 
         answers is a dict of {question_id: value}, not a list —
         iterate over .values() to get the actual answer values.
         """
-        texts = []
         for r in responses:
-            answers = r.get("answers", {})
+            answers = r.get("answers")
             if not isinstance(answers, dict):
                 continue
             for value in answers.values():
                 if isinstance(value, str) and len(value) > 10:
-                    texts.append(value)
-        return texts
+                    yield value
+
+    async def _open_response_input(self, responses: list[dict]) -> list[str] | list[dict]:
+        """
+        Open-ended answers for the prompt: verbatim when there are at most
+        MAX_OPEN_RESPONSES, otherwise clusters from app.rag.clustering so the
+        prompt stays bounded without discarding everything past the sample.
+        """
+        texts = list(islice(self._iter_open_responses(responses), MAX_CLUSTERED_RESPONSES))
+        if len(texts) <= MAX_OPEN_RESPONSES:
+            return texts
+        return await cluster_texts(texts)
 
     def _summarize_quantitative(
         self, responses: list[dict], survey_metadata: dict
     ) -> dict:
         """Compute mean/distribution for Likert/MCQ questions."""
-        questions = survey_metadata.get("questions", [])
-        summary: dict[str, dict] = {}
-
-        for q in questions:
-            qid = q.get("id")
-            qtype = q.get("type")
-
-            if qtype not in ("likert", "mcq", "boolean"):
+        tracked = {
+            q.get("id"): q
+            for q in survey_metadata.get("questions", [])
+            if q.get("type") in ("likert", "mcq", "boolean")
+        }
+
+        # One pass over the responses, bucketing answers by question id
+        columns: dict[str, list] = {qid: [] for qid in tracked}
+        for r in responses:
+            answers = r.get("answers")
+            if not isinstance(answers, dict):
                 continue
+            for qid, column in columns.items():
+                value = answers.get(qid)
+                if value is not None:
+                    column.append(value)
 
-            values = [
-                r["answers"].get(qid)
-                for r in responses
-                if isinstance(r.get("answers"), dict) and r["answers"].get(qid) is not None
-            ]
-
+        summary: dict[str, dict] = {}
+        for qid, values in columns.items():
             if not values:
                 continue
+            q = tracked[qid]
+            qtype = q.get("type")
 
             if qtype == "likert":
                 numeric = [v for v in values if isinstance(v, (int, float))]
@@ -247,14 +483,11 @@ Focus on actionable findings. Paraphrase quotes — never include identifiable i
                         "mean": round(sum(numeric) / len(numeric), 2),
                         "n": len(numeric),
                     }
-            elif qtype in ("mcq", "boolean"):
-                counts: dict = {}
-                for v in values:
-                    counts[str(v)] = counts.get(str(v), 0) + 1
+            else:
                 summary[qid] = {
                     "type": qtype,
                     "question": q.get("text"),
-                    "distribution": counts,
+                    "distribution": dict(Counter(map(str, values))),
                     "n": len(values),
                 }
 
@@ -262,11 +495,7 @@ Focus on actionable findings. Paraphrase quotes — never include identifiable i
 
     def _get_segments(self, responses: list[dict]) -> dict:
         """Summarize response counts by doctor segment."""
-        segments: dict[str, int] = {}
-        for r in responses:
-            specialty = r.get("doctor_specialty", "Unknown")
-            segments[specialty] = segments.get(specialty, 0) + 1
-        return segments
+        return dict(Counter(r.get("doctor_specialty", "Unknown") for r in responses))
 
     def _empty_result(self, completion_rate: float) -> InsightResult:
         return InsightResult(
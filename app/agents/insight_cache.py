@@ -0,0 +1,143 @@
+"""
+Insight Semantic Cache
+──────────────────────
+Re-analyses of a survey with only a few new responses (or of near-identical
+surveys built from the same template) produce practically the same insight
+report. This cache stores reports in Redis next to two embeddings:
+
+  e_p  the survey prompt (title + quantitative summary)
+  e_r  the centroid of the open-ended responses
+
+A lookup is a hit when both cosine similarities to a stored cluster reach
+SIMILARITY_THRESHOLD. Clusters are evicted least-recently-hit first once
+there are more than MAX_CLUSTERS. Enabled by settings.INSIGHT_SEMANTIC_CACHE.
+
+Reports contain respondents' quotes, so clusters are partitioned by a scope
+(the survey's admin id): a lookup only ever sees reports stored under the
+same scope.
+
+Per scope, the vectors of all clusters live in one hash of packed float32
+rows, apart from the reports: a lookup reads the vectors, scores them with
+two matrix-vector products and then fetches only the winning report.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+
+import numpy as np
+import orjson
+from redis.exceptions import RedisError
+
+from app.rag.embeddings import embed_batch
+from app.redis_client import get_redis_bytes
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_THRESHOLD = 0.87
+MAX_CLUSTERS = 1000
+CLUSTER_TTL = 60 * 60 * 24 * 30
+
+_INDEX_KEY = "insight:clusters:{}"         # per scope, sorted set: cluster id → last hit time
+_VECTORS_KEY = "insight:vectors:{}"        # per scope, hash: cluster id → float32 e_p ‖ e_r
+_CLUSTER_KEY = "insight:cluster:{}:{}"     # scope, cluster id → result JSON
+
+# Add a cluster and evict the least recently hit ones beyond the cap in one
+# atomic round trip, deleting the evicted reports and vectors along with
+# their index entries.
+#   KEYS: index, vectors    ARGV: id, now, vector, result, ttl, max, report key prefix
+_STORE_LUA = """
+local index, vectors, id, prefix = KEYS[1], KEYS[2], ARGV[1], ARGV[7]
+redis.call('SET', prefix .. id, ARGV[4], 'EX', ARGV[5])
+redis.call('HSET', vectors, id, ARGV[3])
+redis.call('ZADD', index, ARGV[2], id)
+local evicted = redis.call('ZRANGE', index, 0, -tonumber(ARGV[6]) - 1)
+for _, old in ipairs(evicted) do
+    redis.call('DEL', prefix .. old)
+    redis.call('HDEL', vectors, old)
+end
+if #evicted > 0 then redis.call('ZREMRANGEBYRANK', index, 0, #evicted - 1) end
+redis.call('EXPIRE', index, ARGV[5])
+redis.call('EXPIRE', vectors, ARGV[5])
+return #evicted
+"""
+
+_store_script = None
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, max_clusters: int = MAX_CLUSTERS):
+        self.threshold = threshold
+        self.max_clusters = max_clusters
+
+    async def embed(self, prompt_text: str, open_responses: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return (e_p, e_r), both unit-normalized, from a single encoding call."""
+        vectors = np.asarray(await embed_batch([prompt_text, *(open_responses or [""])]), dtype=np.float32)
+        e_r = vectors[1:].mean(axis=0)
+        e_r /= np.linalg.norm(e_r) or 1.0
+        return vectors[0], e_r
+
+    async def lookup(self, scope: str, e_p: np.ndarray, e_r: np.ndarray) -> dict | None:
+        """Return the cached result payload of the closest matching cluster in `scope`, if any."""
+        redis = get_redis_bytes()
+        try:
+            raw = await redis.hgetall(_VECTORS_KEY.format(scope))
+        except RedisError as e:
+            logger.warning("insight_cache.lookup_failed error=%s", e)
+            return None
+
+        # Rows written by a backend with another dimension can't match
+        row_bytes = 2 * e_p.size * 4
+        rows = [(cid, v) for cid, v in raw.items() if len(v) == row_bytes]
+        if not rows:
+            return None
+
+        # (clusters, 2, dim); vectors are normalized, so dot products are
+        # cosine similarities
+        matrix = np.frombuffer(b"".join(v for _, v in rows), dtype=np.float32).reshape(len(rows), 2, -1)
+        scores = np.minimum(matrix[:, 0] @ e_p, matrix[:, 1] @ e_r)
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+
+        cluster_id = rows[best][0].decode()
+        try:
+            payload = await redis.get(_CLUSTER_KEY.format(scope, cluster_id))
+            if payload is None:
+                # Report expired on its own; forget the cluster
+                await redis.hdel(_VECTORS_KEY.format(scope), cluster_id)
+                await redis.zrem(_INDEX_KEY.format(scope), cluster_id)
+                return None
+            await redis.zadd(_INDEX_KEY.format(scope), {cluster_id: time.time()})
+        except RedisError as e:
+            logger.warning("insight_cache.lookup_failed error=%s", e)
+            return None
+        logger.info("insight_cache.hit cluster_id=%s score=%.3f", cluster_id, scores[best])
+        return orjson.loads(payload)
+
+    async def store(self, scope: str, e_p: np.ndarray, e_r: np.ndarray, result: dict) -> None:
+        """Start a new cluster in `scope` for a freshly generated result."""
+        global _store_script
+        vector = np.concatenate([e_p, e_r]).astype(np.float32, copy=False).tobytes()
+        try:
+            if _store_script is None:
+                _store_script = get_redis_bytes().register_script(_STORE_LUA)
+            await _store_script(
+                keys=[_INDEX_KEY.format(scope), _VECTORS_KEY.format(scope)],
+                args=[
+                    uuid.uuid4().hex,
+                    time.time(),
+                    vector,
+                    orjson.dumps(result),
+                    CLUSTER_TTL,
+                    self.max_clusters,
+                    _CLUSTER_KEY.format(scope, ""),
+                ],
+            )
+        except RedisError as e:
+            logger.warning("insight_cache.store_failed error=%s", e)
+
+
+# Module-level singleton
+insight_semantic_cache = SemanticCache()
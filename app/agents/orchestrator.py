@@ -2,13 +2,16 @@
 Agent Orchestrator
 ──────────────────
 Central router: validates context, applies rate limits, dispatches to the
-correct specialized agent, logs all interactions for auditing.
+correct specialized agent, logs all interactions for auditing (buffered and
+written in batches, see app/telemetry/log_buffer.py).
 """
 from __future__ import annotations
 
 import logging
 import time
 import uuid
+from functools import lru_cache
+from collections.abc import AsyncIterator
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,15 +19,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.agents.attempt_agent import attempt_agent
 from app.agents.design_agent import design_agent
 from app.agents.insight_agent import insight_agent
-from app.models import AgentInteractionLog
 from app.redis_client import check_rate_limit
 from app.safety.moderator import safety_moderator
+from app.telemetry.log_buffer import interaction_log_buffer
 from app.schemas import (
     ClarificationResult,
     CompletionSummary,
     GenerateVariantsResult,
     InsightResult,
     ProgressMessage,
+    QualityAndVariantsResult,
     QualityCheckResult,
 )
 from app.utils.logger import get_logger
@@ -32,6 +36,12 @@ from app.utils.logger import get_logger
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> uuid.UUID:
+    # The same admins/doctors log many interactions; parse each id once
+    return uuid.UUID(value)
+
+
 class AgentOrchestrator:
     """
     Routes agent tasks, enforces rate limits, runs safety checks,
@@ -53,20 +63,81 @@ class AgentOrchestrator:
         if not allowed:
             raise ValueError("Rate limit exceeded: try again in an hour")
 
-        t0 = time.monotonic()
+        t0 = time.perf_counter_ns()
         result = await design_agent.quality_check(
             survey_title, questions, specialty, admin_id
         )
-        await self._log(
-            db=db,
+        self._log(
             agent_type="design",
             user_id=admin_id,
             input_ctx={"action": "quality_check", "title": survey_title},
-            output=result.model_dump(),
-            latency_ms=int((time.monotonic() - t0) * 1000),
+            output=result.model_dump(mode="json", exclude_none=True),
+            latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
         )
         return result
 
+    async def run_quality_check_stream(
+        self,
+        survey_title: str,
+        questions: list[dict],
+        admin_id: str,
+        specialty: str | None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming quality check; shares the quality-check rate limit. The
+        limit is checked when this is awaited, before any event is produced,
+        so callers can reject the request before starting a response.
+        """
+        allowed = await check_rate_limit(
+            f"design:{admin_id}", limit=100, window_seconds=3600
+        )
+        if not allowed:
+            raise ValueError("Rate limit exceeded: try again in an hour")
+        return self._quality_check_events(survey_title, questions, admin_id, specialty)
+
+    async def _quality_check_events(
+        self,
+        survey_title: str,
+        questions: list[dict],
+        admin_id: str,
+        specialty: str | None,
+    ) -> AsyncIterator[dict]:
+        t0 = time.perf_counter_ns()
+        async for event in design_agent.quality_check_stream(survey_title, questions, specialty):
+            if event["type"] == "result":
+                self._log(
+                    agent_type="design",
+                    user_id=admin_id,
+                    input_ctx={"action": "quality_check_stream", "title": survey_title},
+                    output=event["result"],
+                    latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
+                )
+            yield event
+
+    async def run_improve_questions(
+        self,
+        questions: list[dict],
+        admin_id: str,
+    ) -> list[dict | None]:
+        # Each question is its own LLM call: charge them all against the
+        # shared design budget
+        allowed = await check_rate_limit(
+            f"design:{admin_id}", limit=100, window_seconds=3600, cost=len(questions)
+        )
+        if not allowed:
+            raise ValueError("Rate limit exceeded: try again in an hour")
+
+        t0 = time.perf_counter_ns()
+        improved = await design_agent.improve_questions(questions)
+        self._log(
+            agent_type="design",
+            user_id=admin_id,
+            input_ctx={"action": "improve_questions", "questions_count": len(questions)},
+            output={"improved_count": sum(q is not None for q in improved)},
+            latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
+        )
+        return improved
+
     async def run_generate_variants(
         self,
         title: str,
@@ -75,15 +146,44 @@ class AgentOrchestrator:
         num_variants: int,
         db: AsyncSession,
     ) -> GenerateVariantsResult:
-        t0 = time.monotonic()
+        t0 = time.perf_counter_ns()
         result = await design_agent.generate_variants(title, questions, num_variants)
-        await self._log(
-            db=db,
+        self._log(
             agent_type="design",
             user_id=admin_id,
             input_ctx={"action": "generate_variants", "title": title},
             output={"variants_count": len(result.variants)},
-            latency_ms=int((time.monotonic() - t0) * 1000),
+            latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
+        )
+        return result
+
+    async def run_analyze_and_variant(
+        self,
+        title: str,
+        questions: list[dict],
+        admin_id: str,
+        specialty: str | None,
+        num_variants: int,
+        db: AsyncSession,
+    ) -> QualityAndVariantsResult:
+        # Counts against the same budget as a standalone quality check
+        allowed = await check_rate_limit(
+            f"design:{admin_id}", limit=100, window_seconds=3600
+        )
+        if not allowed:
+            raise ValueError("Rate limit exceeded: try again in an hour")
+
+        t0 = time.perf_counter_ns()
+        result = await design_agent.analyze_and_variant(title, questions, specialty, num_variants)
+        self._log(
+            agent_type="design",
+            user_id=admin_id,
+            input_ctx={"action": "analyze_and_variant", "title": title},
+            output={
+                "overall_quality_score": result.quality.overall_quality_score,
+                "variants_count": len(result.variants.variants),
+            },
+            latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
         )
         return result
 
@@ -96,14 +196,16 @@ class AgentOrchestrator:
         doctor_context: dict | None,
         db: AsyncSession,
     ) -> ClarificationResult:
-        # Rate limit: 10 clarifications per survey per doctor
+        # Rate limit: 10 clarifications per survey per doctor. Checked before
+        # the agent runs: on a cache miss it starts the LLM call within
+        # milliseconds, so overlapping the two would still bill rejected calls.
         allowed = await check_rate_limit(
             f"clarify:{doctor_id}:{survey_id}", limit=10, window_seconds=86400
         )
         if not allowed:
             raise ValueError("Clarification limit reached for this survey")
 
-        t0 = time.monotonic()
+        t0 = time.perf_counter_ns()
         result = await attempt_agent.clarify_question(session_id, question, doctor_context)
 
         # Safety check on output
@@ -111,8 +213,7 @@ class AgentOrchestrator:
         if not safe:
             result.clarification = filtered_text
 
-        await self._log(
-            db=db,
+        self._log(
             agent_type="attempt",
             user_id=doctor_id,
             input_ctx={
@@ -121,7 +222,7 @@ class AgentOrchestrator:
                 "survey_id": survey_id,
             },
             output={"clarification_length": len(result.clarification)},
-            latency_ms=int((time.monotonic() - t0) * 1000),
+            latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
         )
         return result
 
@@ -141,17 +242,16 @@ class AgentOrchestrator:
         doctor_id: str,
         db: AsyncSession,
     ) -> CompletionSummary:
-        t0 = time.monotonic()
+        t0 = time.perf_counter_ns()
         result = await attempt_agent.generate_completion_summary(
             responses, survey_title, total_responses
         )
-        await self._log(
-            db=db,
+        self._log(
             agent_type="attempt",
             user_id=doctor_id,
             input_ctx={"action": "completion_summary", "responses_count": len(responses)},
-            output=result.model_dump(),
-            latency_ms=int((time.monotonic() - t0) * 1000),
+            output=result.model_dump(mode="json", exclude_none=True),
+            latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
         )
         return result
 
@@ -163,10 +263,11 @@ class AgentOrchestrator:
         admin_id: str,
         db: AsyncSession,
     ) -> InsightResult:
-        t0 = time.monotonic()
-        result = await insight_agent.analyze(survey_metadata, responses, completion_rate)
-        await self._log(
-            db=db,
+        t0 = time.perf_counter_ns()
+        result = await insight_agent.analyze(
+            {**survey_metadata, "admin_id": admin_id}, responses, completion_rate
+        )
+        self._log(
             agent_type="insight",
             user_id=admin_id,
             input_ctx={
@@ -178,34 +279,32 @@ class AgentOrchestrator:
                 "themes": len(result.themes),
                 "action_items": len(result.action_items),
             },
-            latency_ms=int((time.monotonic() - t0) * 1000),
+            latency_ms=(time.perf_counter_ns() - t0) // 1_000_000,
         )
         return result
 
     # ─── Private ──────────────────────────────────────────────────────────────
 
-    async def _log(
+    def _log(
         self,
-        db: AsyncSession,
         agent_type: str,
         user_id: str,
         input_ctx: dict,
         output: dict,
         latency_ms: int,
     ) -> None:
+        """Queue an audit row; written in batches by the interaction log buffer."""
         try:
-            log = AgentInteractionLog(
+            interaction_log_buffer.enqueue(
                 agent_type=agent_type,
-                user_id=uuid.UUID(user_id) if user_id else None,
+                user_id=_parse_uuid(user_id) if user_id else None,
                 input_context=input_ctx,
                 output_response=output,
                 latency_ms=latency_ms,
             )
-            db.add(log)
-            await db.flush()
         except Exception as e:
             # Non-critical — don't fail the request over logging
-            logger.error("orchestrator.log_failed", error=str(e))
+            logger.error("orchestrator.log_failed error=%s", e)
 
 
 orchestrator = AgentOrchestrator()
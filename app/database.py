@@ -1,3 +1,4 @@
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -9,6 +10,10 @@ engine = create_async_engine(
     pool_size=10,
     max_overflow=20,
     pool_pre_ping=True,
+    # Short OLTP statements never benefit from JIT but can pay its compile cost
+    connect_args={"server_settings": {"jit": "off"}},
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
 )
 
 AsyncSessionLocal = async_sessionmaker(
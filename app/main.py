@@ -6,11 +6,12 @@ FastAPI application that wires together:
   - Database + Pinecone initialization at startup
   - CORS, error handling, health check
 """
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.database import Base, engine
@@ -19,10 +20,9 @@ from app.routers.auth import router as auth_router
 from app.routers.insights import router as insights_router
 from app.routers.responses import responses_admin_router, router as responses_router
 from app.routers.surveys import router as surveys_router
-# from app.utils.logger import get_logger
-import logging
+from app.utils.logger import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @asynccontextmanager
@@ -30,15 +30,32 @@ async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
     logger.info("startup.begin", env=settings.APP_ENV)
 
-    # Create DB tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("startup.database_ready")
+    # Local convenience only: elsewhere the schema comes from `alembic upgrade head`,
+    # so startup doesn't hold a connection introspecting every table
+    if settings.APP_ENV == "development":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        logger.info("startup.database_ready")
+
+    from app.telemetry.log_buffer import interaction_log_buffer
+    await interaction_log_buffer.start()
+
+    # Load the embedding model (per worker; the gunicorn master only prepares it)
+    # and the static guideline corpus before the first design-agent request
+    try:
+        from app.rag.embeddings import load_model
+        from app.rag.knowledge_base import load_guideline_matrix
+        await asyncio.to_thread(load_model)
+        await load_guideline_matrix()
+        logger.info("startup.guidelines_ready")
+    except Exception as e:
+        logger.warning("startup.guidelines_skip", reason=str(e))
 
     # Initialize Pinecone indexes
     try:
         from app.rag.pinecone_client import ensure_indexes
-        ensure_indexes()  # ✅ no arguments needed
+        # Blocking control-plane calls (list/create/poll) — keep them off the loop
+        await asyncio.to_thread(ensure_indexes)
         logger.info("startup.pinecone_ready")
 
         from app.rag.knowledge_base import seed_knowledge_base
@@ -51,6 +68,14 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    await interaction_log_buffer.stop()
+
+    from app.agents._http import close_http_client
+    await close_http_client()
+
+    from app.rag.embeddings import embedding_batcher
+    await embedding_batcher.stop()
+
     await engine.dispose()
     logger.info("shutdown.complete")
 
@@ -60,6 +85,8 @@ app = FastAPI(
     description="AI-powered survey engagement platform for healthcare",
     version="1.0.0",
     lifespan=lifespan,
+    # orjson natively handles UUID/datetime and is much faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # ─── CORS ──────────────────────────────────────────────────────────────────────
@@ -83,12 +110,12 @@ app.include_router(insights_router)
 
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
-    return JSONResponse(status_code=422, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=422, content={"detail": str(exc)})
 
 
 @app.exception_handler(PermissionError)
 async def permission_error_handler(request: Request, exc: PermissionError):
-    return JSONResponse(status_code=403, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=403, content={"detail": str(exc)})
 
 
 # ─── Health check ──────────────────────────────────────────────────────────────
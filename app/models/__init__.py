@@ -2,8 +2,8 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
-    JSON,
     Boolean,
+    CheckConstraint,
     DateTime,
     Float,
     ForeignKey,
@@ -11,21 +11,26 @@ from sqlalchemy import (
     String,
     Text,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
 def uuid_pk() -> Mapped[uuid.UUID]:
-    return mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Generated by Postgres and fetched back with RETURNING on flush
+    return mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
 
 
 # ─── User ─────────────────────────────────────────────────────────────────────
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        CheckConstraint("role IN ('admin', 'doctor')", name="ck_users_role"),
+    )
 
     id: Mapped[uuid.UUID] = uuid_pk()
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
@@ -33,7 +38,7 @@ class User(Base):
     role: Mapped[str] = mapped_column(String(20), nullable=False)   # admin | doctor
     specialty: Mapped[str | None] = mapped_column(String(100))      # doctor-only
     years_experience: Mapped[int | None] = mapped_column(Integer)
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true")
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     surveys: Mapped[list["Survey"]] = relationship(back_populates="admin")
@@ -44,19 +49,22 @@ class User(Base):
 
 class Survey(Base):
     __tablename__ = "surveys"
+    __table_args__ = (
+        CheckConstraint("status IN ('draft', 'active', 'closed')", name="ck_surveys_status"),
+    )
 
     id: Mapped[uuid.UUID] = uuid_pk()
     admin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
-    questions: Mapped[dict] = mapped_column(JSON, nullable=False, default=list)
-    targeting_rules: Mapped[dict | None] = mapped_column(JSON)
+    questions: Mapped[dict] = mapped_column(JSONB, nullable=False, default=list, server_default=text("'[]'::jsonb"))
+    targeting_rules: Mapped[dict | None] = mapped_column(JSONB)
     estimated_time_seconds: Mapped[int | None] = mapped_column(Integer)
     quality_score: Mapped[float | None] = mapped_column(Float)
     predicted_completion_rate: Mapped[float | None] = mapped_column(Float)
-    version: Mapped[int] = mapped_column(Integer, default=1)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
     parent_survey_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("surveys.id"))
-    status: Mapped[str] = mapped_column(String(20), default="draft")  # draft|active|closed
+    status: Mapped[str] = mapped_column(String(20), default="draft", server_default="draft")  # draft|active|closed
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     launched_at: Mapped[datetime | None] = mapped_column(DateTime)
     closed_at: Mapped[datetime | None] = mapped_column(DateTime)
@@ -75,8 +83,8 @@ class Response(Base):
     id: Mapped[uuid.UUID] = uuid_pk()
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id"), nullable=False)
     doctor_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
-    answers: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
-    is_complete: Mapped[bool] = mapped_column(Boolean, default=False)
+    answers: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb"))
+    is_complete: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
     time_spent_seconds: Mapped[int | None] = mapped_column(Integer)
     device_type: Mapped[str | None] = mapped_column(String(20))
     started_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
@@ -93,11 +101,13 @@ class SurveyInsight(Base):
 
     id: Mapped[uuid.UUID] = uuid_pk()
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id"), nullable=False)
-    themes: Mapped[dict | None] = mapped_column(JSON)
+    themes: Mapped[dict | None] = mapped_column(JSONB)
     executive_summary: Mapped[str | None] = mapped_column(Text)
-    action_items: Mapped[dict | None] = mapped_column(JSON)
-    sentiment_breakdown: Mapped[dict | None] = mapped_column(JSON)
+    action_items: Mapped[dict | None] = mapped_column(JSONB)
+    sentiment_breakdown: Mapped[dict | None] = mapped_column(JSONB)
     completion_rate: Mapped[float | None] = mapped_column(Float)
+    # Set while the analysis is pending in an Anthropic Message Batch
+    batch_id: Mapped[str | None] = mapped_column(String(100))
     generated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     survey: Mapped["Survey"] = relationship(back_populates="insights")
@@ -113,7 +123,7 @@ class SurveyEvent(Base):
     doctor_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("users.id"))
     event_type: Mapped[str] = mapped_column(String(60), nullable=False)
     question_id: Mapped[str | None] = mapped_column(String(60))
-    survey_metadata: Mapped[dict | None] = mapped_column(JSON)
+    survey_metadata: Mapped[dict | None] = mapped_column("metadata", JSONB)
     timestamp: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     survey: Mapped["Survey"] = relationship(back_populates="events")
@@ -127,8 +137,8 @@ class AgentInteractionLog(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     agent_type: Mapped[str] = mapped_column(String(20), nullable=False)
     user_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("users.id"))
-    input_context: Mapped[dict | None] = mapped_column(JSON)
-    output_response: Mapped[dict | None] = mapped_column(JSON)
+    input_context: Mapped[dict | None] = mapped_column(JSONB)
+    output_response: Mapped[dict | None] = mapped_column(JSONB)
     tokens_used: Mapped[int | None] = mapped_column(Integer)
     latency_ms: Mapped[int | None] = mapped_column(Integer)
     timestamp: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
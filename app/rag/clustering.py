@@ -0,0 +1,60 @@
+"""
+Response clustering helper.
+Groups free-text answers by meaning (local MiniLM embeddings + spherical
+k-means in NumPy) so large surveys can be summarized as a bounded number of
+clusters — size plus the answers closest to each centroid — instead of a
+truncated sample.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from app.rag.embeddings import embed_batch
+
+MAX_CLUSTERS = 20
+REPRESENTATIVES_PER_CLUSTER = 3
+KMEANS_ITERATIONS = 25
+
+
+def _spherical_kmeans(vectors: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """k-means on unit vectors using cosine similarity; returns (labels, centroids)."""
+    rng = np.random.default_rng(0)   # deterministic clusters for identical inputs
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)]
+    labels = np.zeros(len(vectors), dtype=np.intp)
+    for _ in range(KMEANS_ITERATIONS):
+        labels = (vectors @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        updated = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    return labels, centroids
+
+
+async def cluster_texts(texts: list[str], max_clusters: int = MAX_CLUSTERS) -> list[dict]:
+    """
+    Cluster `texts` into at most `max_clusters` groups (about one per ten
+    texts). Returns [{"size": int, "representative_quotes": [str, ...]}]
+    sorted by size, largest first.
+    """
+    if not texts:
+        return []
+    k = max(1, min(max_clusters, len(texts) // 10))
+    vectors = np.asarray(await embed_batch(texts), dtype=np.float32)
+    labels, centroids = _spherical_kmeans(vectors, k)
+
+    clusters = []
+    for j in range(k):
+        members = np.flatnonzero(labels == j)
+        if not len(members):
+            continue
+        closest = members[np.argsort(-(vectors[members] @ centroids[j]))[:REPRESENTATIVES_PER_CLUSTER]]
+        clusters.append({
+            "size": int(len(members)),
+            "representative_quotes": [texts[i] for i in closest],
+        })
+    clusters.sort(key=lambda c: c["size"], reverse=True)
+    return clusters
@@ -1,26 +1,86 @@
 """
 Local embeddings helper using sentence-transformers.
-Uses all-MiniLM-L6-v2 (384 dims, runs locally, no API key needed).
+Uses all-MiniLM-L6-v2 (384 dims, runs locally, no API key needed), served
+through ONNX Runtime with dynamic int8 quantization.
 
-Drop-in replacement for the previous OpenAI embeddings module —
-embed_text() and embed_batch() signatures are identical.
+Embeddings are returned as contiguous float16 numpy arrays; convert with
+to_values() only where a plain list is required (the Pinecone client).
 """
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import os
 from functools import lru_cache
+from pathlib import Path
 
+from app.config import settings
+
+# Size the BLAS/OpenMP pools before torch/numpy start them. Left at their
+# defaults every worker spawns one thread per core and they thrash each other.
+EMBED_THREADS = settings.EMBEDDING_THREADS or max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+os.environ.setdefault("OMP_NUM_THREADS", str(EMBED_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(EMBED_THREADS))
+
+import numpy as np
+import torch
+from async_lru import alru_cache
+from redis.exceptions import RedisError
 from sentence_transformers import SentenceTransformer
 
+from app.redis_client import get_redis_bytes
+
 # Use stdlib logging directly — sentence_transformers internally calls
 # logger.name which custom PrintLogger objects don't implement.
 logger = logging.getLogger(__name__)
 
-# Embedding dimension for all-MiniLM-L6-v2
-# Update your vector store index to match if you're migrating from OpenAI (1536 → 384)
-EMBEDDING_DIM = 384
+torch.set_num_threads(EMBED_THREADS)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Only settable before any inter-op work has run in this process
+    pass
+
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Static-embedding distillation used when EMBEDDING_BACKEND == "m2v"
+M2V_MODEL_NAME = "minishlab/potion-base-8M"
+USE_M2V = settings.EMBEDDING_BACKEND == "m2v"
+
+# Embedding dimension of the active backend (all-MiniLM-L6-v2: 384, potion-base-8M: 256)
+# Update your vector store index to match if you switch backends
+EMBEDDING_DIM = 256 if USE_M2V else 384
+
+# Query embeddings are cached in Redis as float16 bytes (2 B × EMBEDDING_DIM per vector)
+EMBEDDING_CACHE_TTL = 86400
+ACTIVE_MODEL_NAME = M2V_MODEL_NAME if USE_M2V else MODEL_NAME
+_CACHE_PREFIX = f"emb:{ACTIVE_MODEL_NAME}:"
+
+
+_ONNX_FILE_NAME = f"onnx/model_qint8_{settings.EMBEDDING_ONNX_QUANTIZATION}.onnx"
+
+
+@lru_cache(maxsize=1)
+def _ensure_onnx_export() -> bool:
+    """
+    Export the int8-quantized ONNX model into EMBEDDING_CACHE_DIR unless it
+    is already there. Returns False if the export is unavailable.
+    """
+    cache_dir = Path(settings.EMBEDDING_CACHE_DIR)
+    if (cache_dir / _ONNX_FILE_NAME).exists():
+        return True
+    try:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        model = SentenceTransformer(MODEL_NAME, backend="onnx")
+        model.save(str(cache_dir))
+        export_dynamic_quantized_onnx_model(
+            model, settings.EMBEDDING_ONNX_QUANTIZATION, str(cache_dir)
+        )
+    except Exception as e:
+        logger.warning(f"ONNX int8 export failed, using PyTorch model: {e}")
+        return False
+    return True
 
 
 @lru_cache(maxsize=1)
@@ -28,41 +88,223 @@ def _get_model() -> SentenceTransformer:
     """
     Load the model once and cache it for the lifetime of the process.
     Thread-safe due to lru_cache + GIL for model loading.
+
+    Served from the exported int8 ONNX model; falls back to the FP32
+    PyTorch model if the export is unavailable.
     """
+    cache_dir = Path(settings.EMBEDDING_CACHE_DIR)
+
     logger.info(f"Loading embedding model: {MODEL_NAME}")
-    model = SentenceTransformer(MODEL_NAME)
-    logger.info(f"Embedding model loaded (dim={EMBEDDING_DIM})")
+    if not _ensure_onnx_export():
+        return SentenceTransformer(MODEL_NAME)
+
+    import onnxruntime
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = EMBED_THREADS
+    session_options.inter_op_num_threads = 1
+    model = SentenceTransformer(
+        str(cache_dir),
+        backend="onnx",
+        model_kwargs={"file_name": _ONNX_FILE_NAME, "session_options": session_options},
+    )
+    logger.info(f"Embedding model loaded (dim={EMBEDDING_DIM}, onnx={_ONNX_FILE_NAME})")
     return model
 
 
-async def embed_text(text: str) -> list[float]:
+@lru_cache(maxsize=1)
+def _get_m2v_model():
+    from model2vec import StaticModel
+
+    logger.info(f"Loading static embedding model: {M2V_MODEL_NAME}")
+    return StaticModel.from_pretrained(M2V_MODEL_NAME)
+
+
+def to_values(embedding: np.ndarray) -> list[float]:
+    """Convert an embedding to the list[float] the Pinecone SDK expects."""
+    return embedding.astype(np.float32).tolist()
+
+
+def prepare_model() -> None:
+    """
+    The fork-safe part of load_model(), run in the gunicorn master (see
+    gunicorn.conf.py). The static m2v tables are plain arrays and are shared
+    copy-on-write; for the ONNX backend only the exported file is produced,
+    since an InferenceSession's thread pool does not survive fork().
+    """
+    if USE_M2V:
+        _get_m2v_model()
+    else:
+        _ensure_onnx_export()
+
+
+def load_model() -> None:
+    """
+    Load the active backend now instead of on the first request. Called from
+    the API lifespan, i.e. once per worker process.
+    """
+    if USE_M2V:
+        _get_m2v_model()
+    else:
+        _get_model()
+
+
+# ─── Micro-batching ───────────────────────────────────────────────────────────
+
+# How long the batcher waits for more concurrent callers before encoding
+BATCH_WINDOW_SECONDS = 0.005
+MAX_BATCH_SIZE = 64
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text encodes into one padded forward pass.
+
+    Callers arriving within BATCH_WINDOW_SECONDS of each other share a
+    model.encode() call. The worker task is started lazily on the running
+    event loop (and restarted if the loop changes, e.g. per Celery task).
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    async def encode(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            await asyncio.sleep(BATCH_WINDOW_SECONDS)
+            while not self._queue.empty() and len(items) < MAX_BATCH_SIZE:
+                items.append(self._queue.get_nowait())
+
+            # No need to sort by length here: encode() already length-sorts
+            # its inputs before padding and restores the original order
+            texts = [text for text, _ in items]
+            try:
+                vectors = await loop.run_in_executor(
+                    None,  # uses default ThreadPoolExecutor
+                    lambda: _get_model().encode(
+                        texts,
+                        normalize_embeddings=True,
+                        batch_size=MAX_BATCH_SIZE,
+                        show_progress_bar=False,
+                    ),
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(items, vectors):
+                if not future.done():   # caller may have been cancelled
+                    future.set_result(vector)
+
+
+embedding_batcher = EmbeddingBatcher()
+
+
+async def embed_text(text: str) -> np.ndarray:
     """
     Embed a single text string.
-    Runs the CPU-bound encoding in a thread pool to keep the event loop free.
+    Runs the CPU-bound encoding in a thread pool to keep the event loop free,
+    micro-batched with concurrent callers (the m2v backend is a table lookup
+    and runs inline).
+
+    Results are cached in-process (L1) and in Redis (L2), keyed by the
+    whitespace-collapsed text, so repeated queries skip the model forward
+    pass — hot ones without even a Redis GET. The Redis cache is
+    best-effort: without it every L1 miss encodes.
     """
-    cleaned = text.replace("\n", " ").strip()
-    loop = asyncio.get_event_loop()
-    embedding = await loop.run_in_executor(
-        None,  # uses default ThreadPoolExecutor
-        lambda: _get_model().encode(cleaned, normalize_embeddings=True).tolist()
-    )
+    return await _embed_cleaned(" ".join(text.split()))
+
+
+# Returned arrays are shared between callers and must not be mutated
+@alru_cache(maxsize=4096)
+async def _embed_cleaned(cleaned: str) -> np.ndarray:
+    key = _CACHE_PREFIX + hashlib.sha256(cleaned.encode()).hexdigest()
+    try:
+        raw = await get_redis_bytes().get(key)
+    except RedisError:
+        raw = None
+    if raw:
+        return np.frombuffer(raw, dtype=np.float16)
+
+    if USE_M2V:
+        embedding = _get_m2v_model().encode(cleaned)
+    else:
+        embedding = await embedding_batcher.encode(cleaned)
+    embedding = embedding.astype(np.float16)
+    embedding.flags.writeable = False
+
+    try:
+        await get_redis_bytes().setex(key, EMBEDDING_CACHE_TTL, embedding.tobytes())
+    except RedisError as e:
+        logger.debug(f"embedding cache write skipped: {e}")
     return embedding
 
 
-async def embed_batch(texts: list[str]) -> list[list[float]]:
+async def embed_batch(texts: list[str]) -> np.ndarray:
     """
     Embed multiple texts in a single encoding call.
-    Order of returned embeddings matches order of input texts.
+    Returns a (len(texts), EMBEDDING_DIM) float16 array in input order.
     """
     cleaned = [t.replace("\n", " ").strip() for t in texts]
+    if USE_M2V:
+        return _get_m2v_model().encode(cleaned).astype(np.float16)
     loop = asyncio.get_event_loop()
     embeddings = await loop.run_in_executor(
         None,
         lambda: _get_model().encode(
             cleaned,
+            convert_to_numpy=True,
             normalize_embeddings=True,
             batch_size=64,        # tune based on available RAM
             show_progress_bar=False,
-        ).tolist()
+        )
     )
-    return embeddings
\ No newline at end of file
+    return embeddings.astype(np.float16)
+
+
+async def embed_static(texts: list[str]) -> np.ndarray:
+    """
+    embed_batch() for fixed corpora (e.g. the seeded guidelines).
+
+    The result is saved as .npy under EMBEDDING_CACHE_DIR, keyed by the model
+    and a digest of the texts, so restarts skip tokenization and the forward
+    pass entirely. Any change to the texts or backend produces a new file.
+    """
+    digest = hashlib.blake2b("\x00".join([ACTIVE_MODEL_NAME, *texts]).encode(), digest_size=16).hexdigest()
+    path = Path(settings.EMBEDDING_CACHE_DIR) / f"static_{digest}.npy"
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+
+    embeddings = await embed_batch(texts)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, embeddings)
+    except OSError as e:
+        logger.warning(f"static embedding cache write failed: {e}")
+    return embeddings
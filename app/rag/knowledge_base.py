@@ -3,18 +3,24 @@ Knowledge Base
 ──────────────
 Manages the RAG pipeline:
   1. Seeds Pinecone indexes with best-practice guidelines
-  2. Provides retrieve_guidelines() used by Design Agent
+  2. Provides retrieve_guidelines() used by Design Agent (scored in-process
+     against a precomputed guideline matrix — no Pinecone round-trip)
   3. Provides retrieve_templates() for template inspiration
 
 Run seed_knowledge_base() once at startup / via CLI.
 """
 from __future__ import annotations
 
+import asyncio
 import uuid
+from collections import defaultdict
+
+import numpy as np
+from async_lru import alru_cache
 
 from app.config import settings
-from app.rag.embeddings import embed_batch, embed_text
-from app.rag.pinecone_client import query_index, upsert_vectors
+from app.rag.embeddings import embed_batch, embed_static, embed_text
+from app.rag.pinecone_client import query_index, upsert_vectors, upsert_vectors_batched
 import logging
 
 logger = logging.getLogger(__name__)
@@ -146,56 +152,143 @@ SURVEY_GUIDELINES: list[dict] = [
 ]
 
 
+SEED_CHUNK_SIZE = 64
+
+
 async def seed_knowledge_base() -> None:
     """
     Embed all guidelines and upsert to Pinecone.
     Safe to run multiple times (upsert is idempotent).
+
+    Embedding and upserting are pipelined: chunk i is upserted in the
+    background while chunk i+1 is being embedded.
     """
     logger.info(f"knowledge_base.seeding count={len(SURVEY_GUIDELINES)}")
 
-    texts = [f"{g['title']}. {g['content']}" for g in SURVEY_GUIDELINES]
-    embeddings = await embed_batch(texts)
+    upserts: list[asyncio.Task] = []
+    for start in range(0, len(SURVEY_GUIDELINES), SEED_CHUNK_SIZE):
+        chunk = SURVEY_GUIDELINES[start : start + SEED_CHUNK_SIZE]
+        embeddings = await embed_static([f"{g['title']}. {g['content']}" for g in chunk])
+
+        vectors = [
+            {
+                "id": g["id"],
+                "values": emb,
+                "metadata": {
+                    "title": g["title"],
+                    "content": g["content"],
+                    "category": g["category"],
+                },
+            }
+            for g, emb in zip(chunk, embeddings)
+        ]
+        upserts.append(asyncio.create_task(
+            upsert_vectors_batched(settings.PINECONE_INDEX_GUIDELINES, vectors)
+        ))
+
+    await asyncio.gather(*upserts)
+    logger.info(f"knowledge_base.seeded count={len(SURVEY_GUIDELINES)}")
+
+
+NO_GUIDELINES_FALLBACK = "No specific guidelines found — apply general best practices."
 
-    vectors = [
-        {
-            "id": g["id"],
-            "values": emb,
-            "metadata": {
-                "title": g["title"],
-                "content": g["content"],
-                "category": g["category"],
-            },
-        }
-        for g, emb in zip(SURVEY_GUIDELINES, embeddings)
-    ]
+# Exact category / title queries are answered by lookup, with no embedding.
+# Keys are casefolded with "_" read as a space ("question types" works too).
+CATEGORY_TO_INDEXES: dict[str, list[int]] = defaultdict(list)
+for _i, _g in enumerate(SURVEY_GUIDELINES):
+    CATEGORY_TO_INDEXES[_g["category"].replace("_", " ")].append(_i)
+TITLE_TO_INDEX: dict[str, int] = {g["title"].casefold(): i for i, g in enumerate(SURVEY_GUIDELINES)}
 
-    await upsert_vectors(settings.PINECONE_INDEX_GUIDELINES, vectors)
-    logger.info(f"knowledge_base.seeded count={len(vectors)}")
 
+def _keyword_match(query: str) -> list[int] | None:
+    key = " ".join(query.replace("_", " ").split()).casefold()
+    if key in TITLE_TO_INDEX:
+        return [TITLE_TO_INDEX[key]]
+    return CATEGORY_TO_INDEXES.get(key)
 
+# (len(SURVEY_GUIDELINES), EMBEDDING_DIM) float32, rows L2-normalized.
+# Kept C-contiguous float32 (as is the query) so scoring is a single BLAS sgemv
+# rather than a dtype-converting or strided fallback.
+_guideline_matrix: np.ndarray | None = None
+
+
+async def load_guideline_matrix() -> np.ndarray:
+    """Embed SURVEY_GUIDELINES once per process (called at startup, or lazily)."""
+    global _guideline_matrix
+    if _guideline_matrix is None:
+        embeddings = await embed_static([f"{g['title']}. {g['content']}" for g in SURVEY_GUIDELINES])
+        _guideline_matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+    return _guideline_matrix
+
+
+@alru_cache(maxsize=512, ttl=3600)
 async def retrieve_guidelines(query: str, top_k: int = 4) -> str:
     """
     Retrieve the most relevant guidelines for a survey topic.
     Returns formatted text for injection into agent prompts.
+
+    The corpus is a small static list, so it is scored with one matrix-vector
+    product instead of a Pinecone query. Results are cached in-process for an
+    hour since the same survey titles are checked repeatedly.
     """
-    query_vector = await embed_text(query)
-    matches = await query_index(
-        settings.PINECONE_INDEX_GUIDELINES,
-        vector=query_vector,
-        top_k=top_k,
-    )
+    if (matched := _keyword_match(query)) is not None:
+        return _format_guidelines(matched[:top_k])
+
+    matrix = await load_guideline_matrix()
+    top_k = min(top_k, len(matrix))
+    if top_k <= 0:
+        return NO_GUIDELINES_FALLBACK
+
+    scores = matrix.dot(np.ascontiguousarray(await embed_text(query), dtype=np.float32))
+    return _format_top_guidelines(scores, top_k)
 
-    if not matches:
-        return "No specific guidelines found — apply general best practices."
 
+def _format_top_guidelines(scores: np.ndarray, top_k: int) -> str:
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    return _format_guidelines(top[np.argsort(-scores[top])])
+
+
+def _format_guidelines(indexes) -> str:
     sections = []
-    for m in matches:
-        meta = m["metadata"]
-        sections.append(f"[{meta.get('category', 'general').upper()}] {meta.get('title')}\n{meta.get('content')}")
+    for i in indexes:
+        g = SURVEY_GUIDELINES[i]
+        sections.append(f"[{g['category'].upper()}] {g['title']}\n{g['content']}")
 
     return "\n\n".join(sections)
 
 
+# all-MiniLM-L6-v2 truncates at 256 word pieces; ~4 chars each, with headroom
+TEMPLATE_CHUNK_CHARS = 900
+
+
+async def _embed_survey_text(survey: dict) -> np.ndarray:
+    """
+    Embed title + description + question texts. Surveys too long for the
+    model's input window are split into question chunks (each prefixed with
+    the title/description), embedded in one batch and mean-pooled, instead of
+    silently losing everything past the truncation point.
+    """
+    header = f"{survey['title']}. {survey.get('description', '')}."
+    chunks: list[list[str]] = [[]]
+    size = len(header)
+    for q in survey.get("questions", []):
+        text = q.get("text", "")
+        if chunks[-1] and size + len(text) > TEMPLATE_CHUNK_CHARS:
+            chunks.append([])
+            size = len(header)
+        chunks[-1].append(text)
+        size += len(text) + 1
+
+    if len(chunks) == 1:
+        return await embed_text(" ".join([header, *chunks[0]]))
+
+    vectors = np.asarray(
+        await embed_batch([" ".join([header, *chunk]) for chunk in chunks]), dtype=np.float32
+    )
+    pooled = vectors.mean(axis=0)
+    return (pooled / np.linalg.norm(pooled)).astype(np.float16)
+
+
 async def index_survey_template(survey: dict, completion_rate: float) -> None:
     """
     Index a completed survey as a template for future inspiration.
@@ -204,10 +297,7 @@ async def index_survey_template(survey: dict, completion_rate: float) -> None:
     if completion_rate < 40:
         return
 
-    text = f"{survey['title']}. {survey.get('description', '')}. " + " ".join(
-        q.get("text", "") for q in survey.get("questions", [])
-    )
-    embedding = await embed_text(text)
+    embedding = await _embed_survey_text(survey)
 
     vector = {
         "id": str(survey.get("id", uuid.uuid4())),
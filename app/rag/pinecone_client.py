@@ -6,23 +6,37 @@ Manages two indexes:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 import time
 
-from pinecone import Pinecone, ServerlessSpec
+import numpy as np
+from pinecone import ServerlessSpec
+from pinecone.grpc import PineconeGRPC
 
 from app.config import settings
+from app.rag.embeddings import EMBEDDING_DIM, to_values
 
 # Use stdlib logging — custom PrintLogger breaks third-party libs
 logger = logging.getLogger(__name__)
 
-_pc: Pinecone | None = None
+# gRPC data plane: protobuf over one long-lived HTTP/2 channel per index,
+# instead of a JSON REST request per query/upsert
+_pc: PineconeGRPC | None = None
+_indexes: dict = {}
+# get_index() runs in to_thread workers, so first-use initialization is
+# serialized: concurrent callers must not each build a client / channel.
+# Reentrant because get_index() calls get_pinecone() while holding it.
+_init_lock = threading.RLock()
 
 
-def get_pinecone() -> Pinecone:
+def get_pinecone() -> PineconeGRPC:
     global _pc
     if _pc is None:
-        _pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+        with _init_lock:
+            if _pc is None:
+                _pc = PineconeGRPC(api_key=settings.PINECONE_API_KEY)
     return _pc
 
 
@@ -31,7 +45,18 @@ def get_index(index_name: str):
     Return a handle to a Pinecone index.
     Auto-creates the index if it doesn't exist yet, so callers
     never hit a 404 regardless of call order at startup.
+
+    Handles are cached so each index keeps a single gRPC channel.
     """
+    if index_name in _indexes:
+        return _indexes[index_name]
+    with _init_lock:
+        if index_name not in _indexes:
+            _indexes[index_name] = _open_index(index_name)
+    return _indexes[index_name]
+
+
+def _open_index(index_name: str):
     pc = get_pinecone()
     existing = set(pc.list_indexes().names())
     if index_name not in existing:
@@ -41,7 +66,7 @@ def get_index(index_name: str):
         )
         pc.create_index(
             name=index_name,
-            dimension=384,
+            dimension=EMBEDDING_DIM,
             metric="cosine",
             spec=ServerlessSpec(
                 cloud="aws",
@@ -52,6 +77,13 @@ def get_index(index_name: str):
     return pc.Index(index_name)
 
 
+async def _get_index_async(index_name: str):
+    """get_index() for coroutines: the first lookup (list/create/poll) runs in a thread."""
+    if index_name in _indexes:
+        return _indexes[index_name]
+    return await asyncio.to_thread(get_index, index_name)
+
+
 def ensure_indexes() -> None:
     """Create Pinecone indexes if they don't exist (run at startup)."""
     pc = get_pinecone()
@@ -68,9 +100,9 @@ def ensure_indexes() -> None:
             logger.info(f"Creating Pinecone index '{index_name}' ...")
             pc.create_index(
                 name=index_name,
-                # FIX 2: dimension must be 384 to match local all-MiniLM-L6-v2
-                # embeddings — the old value of 1536 was for OpenAI which is removed
-                dimension=384,
+                # FIX 2: dimension must match the local embedding backend
+                # (384 for all-MiniLM-L6-v2) — the old value of 1536 was for OpenAI
+                dimension=EMBEDDING_DIM,
                 metric="cosine",
                 spec=ServerlessSpec(
                     cloud="aws",
@@ -85,15 +117,21 @@ def ensure_indexes() -> None:
             logger.info(f"Pinecone index '{index_name}' already exists.")
 
 
-def _wait_until_ready(pc: Pinecone, index_name: str, timeout: int = 120) -> None:
-    """Poll until the index is ready or timeout is reached."""
+def _wait_until_ready(pc: PineconeGRPC, index_name: str, timeout: int = 120) -> None:
+    """
+    Poll until the index is ready or timeout is reached.
+    Polls quickly at first and backs off (0.25s x1.6, capped at 5s), so a
+    fast create returns promptly without hammering describe_index on a slow one.
+    """
     deadline = time.time() + timeout
+    delay = 0.25
     while time.time() < deadline:
         status = pc.describe_index(index_name).status
         if status.get("ready"):
             return
         logger.debug(f"Waiting for index '{index_name}' to become ready ...")
-        time.sleep(3)
+        time.sleep(min(delay, 5.0, max(0.0, deadline - time.time())))
+        delay *= 1.6
     raise TimeoutError(
         f"Pinecone index '{index_name}' was not ready within {timeout}s."
     )
@@ -101,25 +139,49 @@ def _wait_until_ready(pc: Pinecone, index_name: str, timeout: int = 120) -> None
 
 async def upsert_vectors(
     index_name: str,
-    vectors: list[dict],  # [{"id": str, "values": list[float], "metadata": dict}]
+    vectors: list[dict],  # [{"id": str, "values": np.ndarray, "metadata": dict}]
 ) -> None:
-    idx = get_index(index_name)
-    idx.upsert(vectors=vectors)
+    idx = await _get_index_async(index_name)
+    # The gRPC client is synchronous; keep it off the event loop
+    await asyncio.to_thread(
+        idx.upsert, vectors=[{**v, "values": to_values(v["values"])} for v in vectors]
+    )
     logger.info(f"Upserted {len(vectors)} vectors into '{index_name}'.")
 
 
+async def upsert_vectors_batched(
+    index_name: str,
+    vectors: list[dict],
+    batch_size: int = 100,
+) -> None:
+    """
+    Upsert in chunks of `batch_size` (Pinecone recommends ≤ 100) with all
+    chunks in flight at once (async_req returns gRPC futures).
+    """
+    idx = await _get_index_async(index_name)
+    pending = [
+        idx.upsert(
+            vectors=[{**v, "values": to_values(v["values"])} for v in vectors[i : i + batch_size]],
+            async_req=True,
+        )
+        for i in range(0, len(vectors), batch_size)
+    ]
+    await asyncio.gather(*(asyncio.to_thread(p.result) for p in pending))
+    logger.info(f"Upserted {len(vectors)} vectors into '{index_name}' in {len(pending)} batches.")
+
+
 async def query_index(
     index_name: str,
-    vector: list[float],
+    vector: np.ndarray,
     top_k: int = 5,
     filter_dict: dict | None = None,
 ) -> list[dict]:
-    idx = get_index(index_name)
-    kwargs: dict = {"vector": vector, "top_k": top_k, "include_metadata": True}
+    idx = await _get_index_async(index_name)
+    kwargs: dict = {"vector": to_values(vector), "top_k": top_k, "include_metadata": True}
     if filter_dict:
         kwargs["filter"] = filter_dict
 
-    response = idx.query(**kwargs)
+    response = await asyncio.to_thread(idx.query, **kwargs)
 
     # FIX 4: Pinecone SDK returns Match objects, not plain dicts —
     # access attributes directly instead of using dict subscript/get
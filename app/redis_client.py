@@ -1,11 +1,14 @@
-import json
 from typing import Any
 
+import msgpack
+import orjson
 import redis.asyncio as aioredis
+import zstandard
 
 from app.config import settings
 
 _pool: aioredis.Redis | None = None
+_bytes_pool: aioredis.Redis | None = None
 
 
 def get_redis() -> aioredis.Redis:
@@ -19,49 +22,154 @@ def get_redis() -> aioredis.Redis:
     return _pool
 
 
-# ─── Session helpers ──────────────────────────────────────────────────────────
+def get_redis_bytes() -> aioredis.Redis:
+    """Client without response decoding, for binary values (e.g. embeddings)."""
+    global _bytes_pool
+    if _bytes_pool is None:
+        _bytes_pool = aioredis.from_url(settings.REDIS_URL, decode_responses=False)
+    return _bytes_pool
+
+
+# ─── Serialization ────────────────────────────────────────────────────────────
+# Values are msgpack; cache payloads over 1 KB are additionally zstd-compressed.
+# A zstd frame always starts with its 4-byte magic number, which a single
+# msgpack object never does, so no extra marker byte is needed.
+
+_COMPRESS_THRESHOLD = 1024
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+_zstd_decompressor = zstandard.ZstdDecompressor()
 
-async def set_session(session_id: str, data: dict, ttl: int = 7200) -> None:
-    r = get_redis()
-    await r.setex(f"session:{session_id}", ttl, json.dumps(data))
 
+def _serialize(obj: Any) -> bytes:
+    packed = msgpack.packb(obj, use_bin_type=True)
+    if len(packed) > _COMPRESS_THRESHOLD:
+        return _zstd_compressor.compress(packed)
+    return packed
 
-async def get_session(session_id: str) -> dict | None:
-    r = get_redis()
-    raw = await r.get(f"session:{session_id}")
-    return json.loads(raw) if raw else None
+
+def _deserialize(raw: bytes) -> Any:
+    if raw[:4] == _ZSTD_MAGIC:
+        raw = _zstd_decompressor.decompress(raw)
+    return msgpack.unpackb(raw, raw=False)
+
+
+# ─── Session helpers ──────────────────────────────────────────────────────────
+
+# Hash-backed sessions: one field per answer ("answer:<question_id>") plus
+# meta fields, so a save only writes the fields it changes instead of
+# re-serializing the whole session.
+
+_ANSWER_PREFIX = "answer:"
+
+
+def _session_key(session_id: str) -> str:
+    return f"session_hash:{session_id}"
+
+
+def _legacy_session_key(session_id: str) -> str:
+    # Sessions saved before the hash layout: one JSON document per session
+    return f"session:{session_id}"
+
+
+async def hset_session_fields(
+    session_id: str,
+    meta: dict,
+    answers: dict,
+    ttl: int = 7200,
+) -> None:
+    """
+    HSET meta + answer fields and refresh the TTL in one MULTI/EXEC.
+    An answer of None means the client cleared it; its field is removed.
+    """
+    mapping = {k: orjson.dumps(v) for k, v in meta.items()}
+    cleared = []
+    for question_id, value in answers.items():
+        field = f"{_ANSWER_PREFIX}{question_id}"
+        if value is None:
+            cleared.append(field)
+        else:
+            mapping[field] = orjson.dumps(value)
+    key = _session_key(session_id)
+    async with get_redis().pipeline(transaction=True) as pipe:
+        if cleared:
+            pipe.hdel(key, *cleared)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, ttl)
+        await pipe.execute()
+
+
+async def hgetall_session(session_id: str) -> dict | None:
+    """
+    Return {"answers": {...}, **meta} for a session, or None. Sessions saved
+    in the old single-document layout are still read until they expire.
+    """
+    raw = await get_redis_bytes().hgetall(_session_key(session_id))
+    if not raw:
+        return await _get_legacy_session(session_id)
+    session: dict = {"answers": {}}
+    for field, value in raw.items():
+        field = field.decode()
+        if field.startswith(_ANSWER_PREFIX):
+            session["answers"][field[len(_ANSWER_PREFIX):]] = orjson.loads(value)
+        else:
+            session[field] = orjson.loads(value)
+    return session
+
+
+async def _get_legacy_session(session_id: str) -> dict | None:
+    raw = await get_redis().get(_legacy_session_key(session_id))
+    if not raw:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
 
 
 async def delete_session(session_id: str) -> None:
-    r = get_redis()
-    await r.delete(f"session:{session_id}")
+    await get_redis().delete(_session_key(session_id), _legacy_session_key(session_id))
+
 
 async def close_redis():
-    global _redis
-    if _redis is not None:
-        await _redis.aclose()
-        _redis = None
+    global _pool, _bytes_pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+    if _bytes_pool is not None:
+        await _bytes_pool.aclose()
+        _bytes_pool = None
 
 # ─── Rate limiter ─────────────────────────────────────────────────────────────
 
-async def check_rate_limit(key: str, limit: int, window_seconds: int = 3600) -> bool:
-    """Returns True if within limit, False if exceeded."""
-    r = get_redis()
-    full_key = f"rate_limit:{key}"
-    count = await r.incr(full_key)
-    if count == 1:
-        await r.expire(full_key, window_seconds)
+# INCRBY + first-hit EXPIRE in one atomic round trip, so a crash can never
+# leave a counter without a TTL
+_RATE_LIMIT_LUA = """
+local c = redis.call('INCRBY', KEYS[1], ARGV[2])
+if c == tonumber(ARGV[2]) then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+return c
+"""
+
+_rate_limit_script = None
+
+
+async def check_rate_limit(key: str, limit: int, window_seconds: int = 3600, cost: int = 1) -> bool:
+    """Charge `cost` units against the window; returns True if still within limit."""
+    global _rate_limit_script
+    if _rate_limit_script is None:
+        _rate_limit_script = get_redis().register_script(_RATE_LIMIT_LUA)
+    count = await _rate_limit_script(keys=[f"rate_limit:{key}"], args=[window_seconds, cost])
     return count <= limit
 
 
 # ─── Generic cache ────────────────────────────────────────────────────────────
 
 async def cache_set(key: str, value: Any, ttl: int = 3600) -> None:
-    r = get_redis()
-    await r.setex(key, ttl, json.dumps(value))
+    r = get_redis_bytes()
+    await r.setex(key, ttl, _serialize(value))
 
 
 async def cache_get(key: str) -> Any | None:
-    r = get_redis()
+    r = get_redis_bytes()
     raw = await r.get(key)
-    return json.loads(raw) if raw else None
+    return _deserialize(raw) if raw else None
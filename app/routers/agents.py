@@ -5,8 +5,11 @@ Exposes all AI agent functionality via REST.
 
 ADMIN endpoints:
   POST /agents/quality-check           Run Design Agent quality check
+  POST /agents/quality-check/stream    Quality check streamed as NDJSON
   POST /agents/improve-question        Improve a single question
+  POST /agents/improve-questions       Improve several questions concurrently
   POST /agents/generate-variants       Generate A/B test variants
+  POST /agents/quality-and-variants    Quality check + A/B variants in one call
   POST /agents/suggest-questions       Suggest questions from survey goal
 
 DOCTOR endpoints:
@@ -16,11 +19,12 @@ DOCTOR endpoints:
   POST /agents/save-progress           Save partial answers
   GET  /agents/restore/{session_id}    Restore in-progress session
 """
-import logging
 import uuid
 from uuid import UUID
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.orchestrator import orchestrator
@@ -33,12 +37,16 @@ from app.schemas import (
     GenerateVariantsResult,
     InsightResult,
     ProgressMessage,
+    QualityAndVariantsResult,
     QualityCheckResult,
 )
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/agents", tags=["agents"])
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# Largest /improve-questions request; each question is a separate LLM call
+MAX_IMPROVE_QUESTIONS = 50
 
 
 # ─── Admin Agent Endpoints ────────────────────────────────────────────────────
@@ -84,7 +92,41 @@ async def quality_check(
             survey.estimated_time_seconds = result.estimated_time_seconds
             await db.flush()
 
-    return result
+    return ORJSONResponse(result.model_dump(mode="json"))
+
+
+@router.post("/quality-check/stream")
+async def quality_check_stream(
+    body: dict,
+    admin: User = Depends(require_admin),
+):
+    """
+    Streaming quality check. Emits one JSON object per line: a
+    {"type": "bias_flag", ...} line as each flag is generated, then a final
+    {"type": "result", ...} line with the full QualityCheckResult.
+
+    Body: same as /quality-check (survey_id is not persisted here).
+    """
+    survey_title = body.get("survey_title", "")
+    questions = body.get("questions", [])
+
+    if not survey_title or not questions:
+        raise HTTPException(status_code=422, detail="survey_title and questions are required")
+
+    # Rate-limit errors are raised here, before the response starts, so they
+    # still map to 422; the events themselves stream as they are generated
+    events = await orchestrator.run_quality_check_stream(
+        survey_title=survey_title,
+        questions=questions,
+        admin_id=str(admin.id),
+        specialty=body.get("specialty"),
+    )
+
+    async def ndjson():
+        async for event in events:
+            yield orjson.dumps(event) + b"\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.post("/improve-question")
@@ -108,6 +150,31 @@ async def improve_question(
     return {"improved_question": improved}
 
 
+@router.post("/improve-questions")
+async def improve_questions(
+    body: dict,
+    admin: User = Depends(require_admin),
+):
+    """
+    Improve several questions concurrently. Each question counts against the
+    admin's design-agent rate limit.
+
+    Body:
+      questions: list[dict] (at most MAX_IMPROVE_QUESTIONS)
+    """
+    questions = body.get("questions")
+    if not questions:
+        raise HTTPException(status_code=422, detail="questions are required")
+    if len(questions) > MAX_IMPROVE_QUESTIONS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {MAX_IMPROVE_QUESTIONS} questions per request",
+        )
+
+    improved = await orchestrator.run_improve_questions(questions, admin_id=str(admin.id))
+    return {"improved_questions": improved}
+
+
 @router.post("/generate-variants", response_model=GenerateVariantsResult)
 async def generate_variants(
     body: dict,
@@ -139,6 +206,37 @@ async def generate_variants(
     return result
 
 
+@router.post("/quality-and-variants", response_model=QualityAndVariantsResult)
+async def quality_and_variants(
+    body: dict,
+    admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Run a quality check and generate A/B variants in a single LLM request.
+
+    Body:
+      title: str
+      questions: list[dict]
+      specialty: str | None
+      num_variants: int (default 2)
+    """
+    title = body.get("title", "")
+    questions = body.get("questions", [])
+
+    if not title or not questions:
+        raise HTTPException(status_code=422, detail="title and questions are required")
+
+    return await orchestrator.run_analyze_and_variant(
+        title=title,
+        questions=questions,
+        admin_id=str(admin.id),
+        specialty=body.get("specialty"),
+        num_variants=body.get("num_variants", 2),
+        db=db,
+    )
+
+
 @router.post("/suggest-questions")
 async def suggest_questions(
     body: dict,
@@ -206,19 +304,22 @@ async def clarify_question(
     return result
 
 
-@router.get("/progress")
+@router.get("/progress", response_model=ProgressMessage)
 async def get_progress(
     session_id: str,
     questions_total: int,
     questions_answered: int,
     doctor: User = Depends(require_doctor),
-) -> ProgressMessage:
+):
     """Get progress message for a doctor mid-survey."""
-    return await orchestrator.run_get_progress(
+    result = await orchestrator.run_get_progress(
         session_id=session_id,
         questions_total=questions_total,
         questions_answered=questions_answered,
     )
+    # Built server-side from the validated query params: return it directly
+    # rather than through response_model re-validation
+    return ORJSONResponse(result.model_dump(mode="json"))
 
 
 @router.post("/completion-summary", response_model=CompletionSummary)
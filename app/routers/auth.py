@@ -5,42 +5,89 @@ POST /auth/register  – Create admin or doctor user
 POST /auth/login     – Get JWT access token
 GET  /auth/me        – Current user info
 """
-from datetime import datetime, timedelta
-
+import asyncio
+import hashlib
+import time
+from datetime import timedelta
+
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy import select
+import jwt
+from jwt import InvalidTokenError
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import get_db
 from app.models import User
 from app.schemas import Token, UserCreate, UserResponse
+from app.utils.clock import utcnow
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes are Argon2id; bcrypt hashes from before the migration are still
+# verified (directly against the C backend) and upgraded on the next login
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64_000, parallelism=4)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+_KEY_BYTES = settings.SECRET_KEY.encode()
+_DECODE_OPTIONS = {"require": ["exp", "sub"], "verify_aud": False}
+
+# Verified payloads keyed by sha256(token) — never the raw token — so a client
+# reusing its token skips HMAC verification + JSON parsing for a few seconds.
+# Only touched synchronously from the event loop, so no lock is needed.
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=settings.JWT_CACHE_TTL_SECONDS)
+
+
+def _verify_password_sync(plain: str, hashed: str) -> bool:
+    if hashed.startswith("$argon2"):
+        try:
+            return password_hasher.verify(hashed, plain)
+        except (VerificationError, InvalidHashError):
+            return False
+    try:
+        return bcrypt.checkpw(plain.encode(), hashed.encode())
+    except ValueError:
+        return False
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    return not hashed.startswith("$argon2") or password_hasher.check_needs_rehash(hashed)
+
+
+# Password hashing deliberately burns CPU; both backends release the GIL, so
+# running them in a worker thread keeps the event loop serving other requests
+
+async def hash_password(password: str) -> str:
+    return await asyncio.to_thread(password_hasher.hash, password)
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await asyncio.to_thread(_verify_password_sync, plain, hashed)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+def decode_access_token(token: str) -> dict:
+    """jwt.decode() with a short-lived cache of verified payloads. Raises InvalidTokenError."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _jwt_cache.get(key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    payload = jwt.decode(token, _KEY_BYTES, algorithms=[ALGORITHM], options=_DECODE_OPTIONS)
+    _jwt_cache[key] = payload
+    return payload
 
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, _KEY_BYTES, algorithm=ALGORITHM)
 
 
 async def get_current_user(
@@ -53,11 +100,11 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         if not user_id:
             raise credentials_exc
-    except JWTError:
+    except InvalidTokenError:
         raise credentials_exc
 
     user = await db.get(User, user_id)
@@ -83,13 +130,13 @@ async def require_doctor(user: User = Depends(get_current_user)) -> User:
 
 @router.post("/register", response_model=UserResponse, status_code=201)
 async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
-    existing = await db.scalar(select(User).where(User.email == payload.email))
+    existing = await db.scalar(select(User.id).where(User.email == payload.email))
     if existing:
         raise HTTPException(status_code=409, detail="Email already registered")
 
     user = User(
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password(payload.password),
         role=payload.role.value,
         specialty=payload.specialty,
         years_experience=payload.years_experience,
@@ -104,9 +151,18 @@ async def login(
     form: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
-    user = await db.scalar(select(User).where(User.email == form.username))
-    if not user or not verify_password(form.password, user.hashed_password):
+    # Only the columns login needs (served by ix_users_email_login), no ORM entity
+    user = (await db.execute(
+        select(User.id, User.hashed_password, User.role).where(User.email == form.username)
+    )).first()
+    if not user or not await verify_password(form.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if password_needs_rehash(user.hashed_password):
+        await db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(hashed_password=await hash_password(form.password))
+        )
 
     token = create_access_token({"sub": str(user.id), "role": user.role})
     return Token(access_token=token)
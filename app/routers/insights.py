@@ -3,10 +3,12 @@ Insights Router
 ───────────────
 GET  /insights/{survey_id}        Get generated insights for a closed survey
 POST /insights/{survey_id}/trigger  Manually trigger insight generation
+                                    (?batch=true: cheaper, via Message Batches)
 """
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,7 +16,7 @@ from app.database import get_db
 from app.models import Survey, SurveyInsight
 from app.routers.auth import require_admin
 from app.schemas import InsightResult
-from app.tasks.celery_app import generate_survey_insights
+from app.tasks.celery_app import generate_survey_insights, submit_insight_batch
 
 router = APIRouter(prefix="/insights", tags=["insights"])
 
@@ -36,15 +38,17 @@ async def get_insights(
         .order_by(SurveyInsight.generated_at.desc())
     )
 
-    if not insight:
-        if survey.status == "closed":
+    # A batch_id means the analysis is still queued in a Message Batch
+    if not insight or insight.batch_id:
+        if insight or survey.status == "closed":
             return {
                 "status": "pending",
                 "message": "Insights are being generated. Check back in a few minutes.",
             }
         raise HTTPException(status_code=404, detail="No insights yet — survey may still be active")
 
-    return {
+    # Returned as a Response so FastAPI skips jsonable_encoder on the JSONB payload
+    return ORJSONResponse({
         "survey_id": str(survey_id),
         "survey_title": survey.title,
         "generated_at": insight.generated_at.isoformat(),
@@ -53,12 +57,13 @@ async def get_insights(
         "themes": insight.themes,
         "action_items": insight.action_items,
         "sentiment_breakdown": insight.sentiment_breakdown,
-    }
+    })
 
 
 @router.post("/{survey_id}/trigger", status_code=202)
 async def trigger_insights(
     survey_id: UUID,
+    batch: bool = False,
     admin=Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
@@ -67,5 +72,8 @@ async def trigger_insights(
     if not survey or survey.admin_id != admin.id:
         raise HTTPException(status_code=404, detail="Survey not found")
 
-    task = generate_survey_insights.apply_async(args=[str(survey_id)], queue="insights")
+    if batch:
+        task = submit_insight_batch.apply_async(args=[[str(survey_id)]], queue="insights")
+    else:
+        task = generate_survey_insights.apply_async(args=[str(survey_id)], queue="insights")
     return {"status": "queued", "task_id": task.id, "survey_id": str(survey_id)}
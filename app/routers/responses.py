@@ -5,12 +5,11 @@ POST /responses           Submit survey response (partial or complete)
 GET  /responses/{id}      Get response status
 GET  /surveys/{id}/responses  Admin: list all responses for a survey
 """
-from datetime import datetime
-import logging
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import case, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -19,14 +18,16 @@ from app.routers.auth import require_admin, require_doctor
 from app.safety.moderator import safety_moderator
 from app.schemas import ResponseCreate, ResponseOut
 from app.tasks.celery_app import send_completion_reminder
+from app.utils.clock import utcnow
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/responses", tags=["responses"])
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 @router.post("", response_model=ResponseOut, status_code=201)
 async def submit_response(
     payload: ResponseCreate,
+    background: BackgroundTasks,
     doctor=Depends(require_doctor),
     db: AsyncSession = Depends(get_db),
 ):
@@ -63,7 +64,7 @@ async def submit_response(
         existing.device_type = payload.device_type
         existing.time_spent_seconds = payload.time_spent_seconds
         if payload.is_complete and not existing.completed_at:
-            existing.completed_at = datetime.utcnow()
+            existing.completed_at = utcnow()
         response_obj = existing
     else:
         response_obj = Response(
@@ -73,33 +74,37 @@ async def submit_response(
             is_complete=payload.is_complete,
             device_type=payload.device_type,
             time_spent_seconds=payload.time_spent_seconds,
-            completed_at=datetime.utcnow() if payload.is_complete else None,
+            completed_at=utcnow() if payload.is_complete else None,
         )
         db.add(response_obj)
 
-    # Log event
+    # Log event — a plain INSERT (never read back, so no ORM instance); the
+    # autoflush before it writes the response in the same transaction
     event_type = "survey_completed" if payload.is_complete else "survey_partial_save"
-    db.add(SurveyEvent(
+    await db.execute(insert(SurveyEvent).values(
         survey_id=payload.survey_id,
         doctor_id=doctor.id,
         event_type=event_type,
-        metadata={"is_complete": payload.is_complete, "answers_count": len(answers_dict)},
+        survey_metadata={"is_complete": payload.is_complete, "answers_count": len(answers_dict)},
     ))
 
-    await db.flush()
+    survey_id, doctor_id = str(payload.survey_id), str(doctor.id)
 
-    # If partial: schedule a reminder (24h later) if not already sent
+    # If partial: schedule a reminder (24h later) if not already sent.
+    # Enqueued after the response is sent, so the broker round trip isn't
+    # on the request path.
     if not payload.is_complete:
-        send_completion_reminder.apply_async(
-            args=[str(doctor.id), str(payload.survey_id)],
+        background.add_task(
+            send_completion_reminder.apply_async,
+            args=[doctor_id, survey_id],
             countdown=86400,  # 24 hours
             queue="reminders",
         )
 
     logger.info(
         "response.submitted",
-        survey_id=str(payload.survey_id),
-        doctor_id=str(doctor.id),
+        survey_id=survey_id,
+        doctor_id=doctor_id,
         is_complete=payload.is_complete,
     )
     return response_obj
@@ -126,29 +131,52 @@ responses_admin_router = APIRouter(prefix="/surveys", tags=["admin-responses"])
 async def list_survey_responses(
     survey_id: UUID,
     complete_only: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
     admin=Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    """Admin: list all responses for a survey."""
+    """Admin: survey response counts plus one page of responses (newest first)."""
     survey = await db.get(Survey, survey_id)
     if not survey or survey.admin_id != admin.id:
         raise HTTPException(status_code=404, detail="Survey not found")
 
-    q = select(Response).where(Response.survey_id == survey_id)
+    filters = [Response.survey_id == survey_id]
     if complete_only:
-        q = q.where(Response.is_complete == True)
-
-    responses = await db.scalars(q)
-    results = list(responses)
+        filters.append(Response.is_complete == True)
+
+    # Counts are aggregated in Postgres instead of loading every row
+    total, complete = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((Response.is_complete == True, 1), else_=0)), 0),
+        ).where(*filters)
+    )).one()
+
+    # Plain column tuples: no ORM identity-map hydration per row
+    results = await db.execute(
+        select(
+            Response.id,
+            Response.is_complete,
+            Response.started_at,
+            Response.completed_at,
+            Response.time_spent_seconds,
+            Response.device_type,
+        )
+        .where(*filters)
+        .order_by(Response.started_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
 
-    return {
+    # Returned as a Response so FastAPI skips jsonable_encoder on the list
+    return ORJSONResponse({
         "survey_id": str(survey_id),
-        "total": len(results),
-        "complete": sum(1 for r in results if r.is_complete),
-        "completion_rate": (
-            round(sum(1 for r in results if r.is_complete) / len(results) * 100, 1)
-            if results else 0.0
-        ),
+        "total": total,
+        "complete": complete,
+        "completion_rate": round(complete / total * 100, 1) if total else 0.0,
+        "limit": limit,
+        "offset": offset,
         "responses": [
             {
                 "id": str(r.id),
@@ -160,4 +188,4 @@ async def list_survey_responses(
             }
             for r in results
         ],
-    }
+    })
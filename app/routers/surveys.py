@@ -11,11 +11,11 @@ POST   /surveys/{id}/launch  Launch survey (changes status → active)
 POST   /surveys/{id}/close   Close survey (triggers insight generation)
 DELETE /surveys/{id}         Delete draft survey
 """
-from datetime import datetime
-import logging
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,12 +23,49 @@ from app.database import get_db
 from app.models import Survey
 from app.routers.auth import require_admin
 from app.safety.moderator import safety_moderator
-from app.schemas import SurveyCreate, SurveyResponse, SurveyStatus, SurveyUpdate
+from app.schemas import Question, SurveyCreate, SurveyListItem, SurveyResponse, SurveyStatus, SurveyUpdate
 from app.tasks.celery_app import generate_survey_insights
+from app.utils.clock import utcnow
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/surveys", tags=["surveys"])
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+
+# Dumps the whole question list in one pydantic-core call instead of a
+# Python-level model_dump() per question
+_QUESTION_LIST_ADAPTER = TypeAdapter(list[Question])
+
+
+# Trust boundary: rows in `surveys` only ever come from SurveyCreate /
+# SurveyUpdate payloads (validated on the way in) or our own status updates,
+# so outgoing responses are built with model_construct — no second pass
+# through the validator tree — and returned directly, which also skips
+# FastAPI's response_model re-validation. External input is still always
+# validated.
+def _survey_out(survey: Survey, status_code: int = 200) -> ORJSONResponse:
+    return ORJSONResponse(
+        SurveyResponse.model_construct(
+            id=survey.id,
+            title=survey.title,
+            description=survey.description,
+            questions=survey.questions,
+            targeting_rules=survey.targeting_rules,
+            estimated_time_seconds=survey.estimated_time_seconds,
+            quality_score=survey.quality_score,
+            predicted_completion_rate=survey.predicted_completion_rate,
+            status=SurveyStatus(survey.status),
+            version=survey.version,
+            created_at=survey.created_at,
+            launched_at=survey.launched_at,
+        ).model_dump(mode="json"),
+        status_code=status_code,
+    )
+
+
+def _phi_inputs(questions) -> list[dict]:
+    # The PHI check only reads id + text; skip a full model_dump of each question
+    return [{"id": q.id, "text": q.text} for q in questions]
 
 
 @router.post("", response_model=SurveyResponse, status_code=201)
@@ -39,9 +76,7 @@ async def create_survey(
 ):
     """Create a new survey (status=draft)."""
     # Safety: check for PHI in questions
-    violations = safety_moderator.validate_survey_for_phi(
-        [q.model_dump() for q in payload.questions]
-    )
+    violations = safety_moderator.validate_survey_for_phi(_phi_inputs(payload.questions))
     if violations:
         raise HTTPException(
             status_code=422,
@@ -52,7 +87,7 @@ async def create_survey(
         admin_id=admin.id,
         title=payload.title,
         description=payload.description,
-        questions=[q.model_dump() for q in payload.questions],
+        questions=_QUESTION_LIST_ADAPTER.dump_python(payload.questions, mode="json"),
         targeting_rules=payload.targeting_rules,
         # Rough estimate: 18 seconds per question
         estimated_time_seconds=len(payload.questions) * 18,
@@ -62,21 +97,39 @@ async def create_survey(
     await db.flush()
 
     logger.info("survey.created", survey_id=str(survey.id), admin_id=str(admin.id))
-    return survey
+    return _survey_out(survey, status_code=201)
 
 
-@router.get("", response_model=list[SurveyResponse])
+@router.get("", response_model=list[SurveyListItem])
 async def list_surveys(
     status: SurveyStatus | None = None,
     admin=Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    q = select(Survey).where(Survey.admin_id == admin.id)
+    # Project the listing columns only — the questions JSONB can be many KB
+    # per survey and the dashboard never renders it (GET /surveys/{id} does)
+    q = select(
+        Survey.id,
+        Survey.title,
+        Survey.description,
+        Survey.estimated_time_seconds,
+        Survey.quality_score,
+        Survey.predicted_completion_rate,
+        Survey.status,
+        Survey.version,
+        Survey.created_at,
+        Survey.launched_at,
+        Survey.closed_at,
+    ).where(Survey.admin_id == admin.id)
     if status:
         q = q.where(Survey.status == status.value)
     q = q.order_by(Survey.created_at.desc())
-    result = await db.scalars(q)
-    return list(result)
+    rows = await db.execute(q)
+    # Trusted DB rows (see _survey_out)
+    return ORJSONResponse([
+        SurveyListItem.model_construct(**{**row._mapping, "status": SurveyStatus(row.status)}).model_dump(mode="json")
+        for row in rows
+    ])
 
 
 @router.get("/{survey_id}", response_model=SurveyResponse)
@@ -86,7 +139,7 @@ async def get_survey(
     db: AsyncSession = Depends(get_db),
 ):
     survey = await _get_admin_survey(survey_id, admin.id, db)
-    return survey
+    return _survey_out(survey)
 
 
 @router.patch("/{survey_id}", response_model=SurveyResponse)
@@ -106,19 +159,17 @@ async def update_survey(
     if payload.description is not None:
         survey.description = payload.description
     if payload.questions is not None:
-        violations = safety_moderator.validate_survey_for_phi(
-            [q.model_dump() for q in payload.questions]
-        )
+        violations = safety_moderator.validate_survey_for_phi(_phi_inputs(payload.questions))
         if violations:
             raise HTTPException(status_code=422, detail={"violations": violations})
-        survey.questions = [q.model_dump() for q in payload.questions]
+        survey.questions = _QUESTION_LIST_ADAPTER.dump_python(payload.questions, mode="json")
         survey.estimated_time_seconds = len(payload.questions) * 18
     if payload.targeting_rules is not None:
         survey.targeting_rules = payload.targeting_rules
 
     survey.version += 1
     await db.flush()
-    return survey
+    return _survey_out(survey)
 
 
 @router.post("/{survey_id}/launch", response_model=SurveyResponse)
@@ -138,16 +189,17 @@ async def launch_survey(
         )
 
     survey.status = "active"
-    survey.launched_at = datetime.utcnow()
+    survey.launched_at = utcnow()
     await db.flush()
 
     logger.info("survey.launched", survey_id=str(survey_id))
-    return survey
+    return _survey_out(survey)
 
 
 @router.post("/{survey_id}/close", response_model=SurveyResponse)
 async def close_survey(
     survey_id: UUID,
+    background: BackgroundTasks,
     admin=Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
@@ -157,14 +209,16 @@ async def close_survey(
         raise HTTPException(status_code=409, detail="Survey is not active")
 
     survey.status = "closed"
-    survey.closed_at = datetime.utcnow()
+    survey.closed_at = utcnow()
     await db.flush()
 
-    # Trigger async insight generation
-    generate_survey_insights.apply_async(args=[str(survey_id)], queue="insights")
-    logger.info("survey.closed.insights_queued", survey_id=str(survey_id))
+    # Trigger async insight generation (enqueued after the response is sent;
+    # get_db has committed the close by then)
+    sid = str(survey_id)
+    background.add_task(generate_survey_insights.apply_async, args=[sid], queue="insights")
+    logger.info("survey.closed.insights_queued", survey_id=sid)
 
-    return survey
+    return _survey_out(survey)
 
 
 @router.delete("/{survey_id}", status_code=204)
@@ -8,12 +8,15 @@ Handles:
 """
 from __future__ import annotations
 
-import logging
+import bisect
+import itertools
 import re
 
+import re2
+
 from app.utils.logger import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 # ─── PHI patterns (supplement Presidio for healthcare-specific items) ─────────
 
@@ -47,6 +50,57 @@ PHI_COLLECTION_KEYWORDS = [
     "prescription", "treatment plan",
 ]
 
+# ─── Fused matchers ───────────────────────────────────────────────────────────
+# Each list above is compiled into one alternation (one named group per entry)
+# so a single C-level search replaces a Python loop of `in` / .search() calls.
+# Every source pattern is case-insensitive or caseless, so IGNORECASE is safe.
+# The fused patterns run on RE2: linear-time automata, so attacker-supplied
+# free text can't trigger catastrophic backtracking.
+
+
+def _compile_linear(pattern: str, ignorecase: bool = False):
+    """Compile with RE2, falling back to stdlib re for syntax RE2 rejects."""
+    try:
+        return re2.compile(f"(?i){pattern}" if ignorecase else pattern)
+    except re2.error as e:
+        logger.warning(f"safety.re2_fallback error={e}")
+        return re.compile(pattern, re.IGNORECASE if ignorecase else 0)
+
+
+_PHI_LABELS: dict[str, str] = {}
+for _i, _keyword in enumerate(PHI_COLLECTION_KEYWORDS):
+    _PHI_LABELS[f"kw_{_i}"] = f"phi_keyword:{_keyword}"
+for _i, (_, _label) in enumerate(PHI_PATTERNS):
+    _PHI_LABELS[f"pat_{_i}"] = f"phi_pattern:{_label}"
+
+_PHI_PATTERN_ALTERNATION = "|".join(
+    f"(?P<pat_{i}>{pattern.pattern})" for i, (pattern, _) in enumerate(PHI_PATTERNS)
+)
+_PHI_PATTERN_RE = _compile_linear(_PHI_PATTERN_ALTERNATION, ignorecase=True)
+_PHI_COLLECTION_RE = _compile_linear(
+    "|".join(f"(?P<kw_{i}>{re.escape(k)})" for i, k in enumerate(PHI_COLLECTION_KEYWORDS))
+    + "|" + _PHI_PATTERN_ALTERNATION,
+    ignorecase=True,
+)
+_MEDICAL_ADVICE_RE = _compile_linear(
+    "|".join(f"(?:{pattern.pattern})" for pattern in MEDICAL_ADVICE_PATTERNS), ignorecase=True
+)
+
+# Response redaction: SSN, phone and email in one pass
+_REDACT_RE = _compile_linear(
+    r"(?P<ssn>\b\d{3}-\d{2}-\d{4}\b)"
+    r"|(?P<phone>\b(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b)"
+    r"|(?P<email>\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b)"
+)
+_REDACT_TOKENS = {"ssn": "[REDACTED-SSN]", "phone": "[REDACTED-PHONE]", "email": "[REDACTED-EMAIL]"}
+# An email needs "@"; an SSN or phone number needs at least 9 digits
+_MIN_PHI_DIGITS = 9
+
+
+def _may_contain_redactable_phi(text: str) -> bool:
+    """Cheap prefilter (C-level substring counts) before the redaction regex."""
+    return "@" in text or sum(map(text.count, "0123456789")) >= _MIN_PHI_DIGITS
+
 
 class SafetyModerator:
     """
@@ -59,55 +113,42 @@ class SafetyModerator:
         Returns (is_safe, violation_type).
         is_safe=True means no PHI collection detected.
         """
-        lower = question_text.lower()
-
-        # Check keyword list
-        for keyword in PHI_COLLECTION_KEYWORDS:
-            if keyword in lower:
-                logger.warning(
-                    "safety.phi_keyword_detected",
-                    keyword=keyword,
-                    question_preview=question_text[:80],
-                )
-                return False, f"phi_keyword:{keyword}"
-
-        # Check regex patterns
-        for pattern, label in PHI_PATTERNS:
-            if pattern.search(question_text):
-                logger.warning(
-                    "safety.phi_pattern_detected",
-                    pattern_type=label,
-                    question_preview=question_text[:80],
-                )
-                return False, f"phi_pattern:{label}"
-
-        return True, None
+        match = _PHI_COLLECTION_RE.search(question_text)
+        if match is None:
+            return True, None
+        return False, self._phi_violation(match.lastgroup, question_text)
+
+    @staticmethod
+    def _phi_violation(group: str, question_text: str) -> str:
+        violation = _PHI_LABELS[group]
+        kind, _, label = violation.partition(":")
+        if kind == "phi_keyword":
+            logger.warning(
+                "safety.phi_keyword_detected",
+                keyword=label,
+                question_preview=question_text[:80],
+            )
+        else:
+            logger.warning(
+                "safety.phi_pattern_detected",
+                pattern_type=label,
+                question_preview=question_text[:80],
+            )
+        return violation
 
     def check_response_for_phi(self, response_text: str) -> str:
         """
         Redact any PHI accidentally included in open-ended doctor responses.
         Uses simple regex redaction (Presidio can be swapped in for production).
         """
-        redacted = response_text
-
-        # Redact SSN-like patterns
-        redacted = re.sub(r"\b\d{3}-\d{2}-\d{4}\b", "[REDACTED-SSN]", redacted)
-
-        # Redact phone numbers
-        redacted = re.sub(
-            r"\b(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
-            "[REDACTED-PHONE]",
-            redacted,
-        )
-
-        # Redact email addresses
-        redacted = re.sub(
-            r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Z|a-z]{2,}\b",
-            "[REDACTED-EMAIL]",
-            redacted,
-        )
-
-        if redacted != response_text:
+        # Most free-text answers contain none of the characters PHI needs
+        if not _may_contain_redactable_phi(response_text):
+            return response_text
+
+        # Single scan over the text for all three kinds of PHI
+        redacted, count = _REDACT_RE.subn(lambda m: _REDACT_TOKENS[m.lastgroup], response_text)
+
+        if count:
             logger.warning(
                 "safety.phi_redacted_from_response",
                 original_length=len(response_text),
@@ -127,26 +168,24 @@ class SafetyModerator:
         If unsafe, returns generic fallback text.
         """
         # Check for medical advice
-        for pattern in MEDICAL_ADVICE_PATTERNS:
-            if pattern.search(agent_output):
-                logger.warning(
-                    "safety.medical_advice_blocked",
-                    output_preview=agent_output[:100],
-                )
-                return False, (
-                    "I can help clarify what this survey question is asking, "
-                    "but I'm not able to provide medical guidance. "
-                    "For clinical questions, please consult appropriate resources."
-                )
+        if _MEDICAL_ADVICE_RE.search(agent_output):
+            logger.warning(
+                "safety.medical_advice_blocked",
+                output_preview=agent_output[:100],
+            )
+            return False, (
+                "I can help clarify what this survey question is asking, "
+                "but I'm not able to provide medical guidance. "
+                "For clinical questions, please consult appropriate resources."
+            )
 
         # Check for PHI in output
-        for pattern, label in PHI_PATTERNS:
-            if pattern.search(agent_output):
-                logger.warning(
-                    "safety.phi_in_agent_output",
-                    pattern_type=label,
-                )
-                return False, "I was unable to generate a safe response. Please contact support."
+        if match := _PHI_PATTERN_RE.search(agent_output):
+            logger.warning(
+                "safety.phi_in_agent_output",
+                pattern_type=_PHI_LABELS[match.lastgroup].partition(":")[2],
+            )
+            return False, "I was unable to generate a safe response. Please contact support."
 
         return True, agent_output
 
@@ -155,20 +194,33 @@ class SafetyModerator:
         Validate all questions in a survey for PHI collection.
         Returns list of violations: [{question_id, issue}]
         """
-        violations = []
-        for q in questions:
-            text = q.get("text", "")
-            is_safe, violation_type = self.check_question_for_phi(text)
-            if not is_safe:
-                violations.append(
-                    {
-                        "question_id": q.get("id"),
-                        "question_text": text[:100],
-                        "violation": violation_type,
-                        "recommendation": "Remove or rephrase this question to avoid collecting protected health information.",
-                    }
-                )
-        return violations
+        texts = [q.get("text", "") for q in questions]
+        if len(texts) <= 3:
+            flagged = {}
+            for i, text in enumerate(texts):
+                is_safe, violation_type = self.check_question_for_phi(text)
+                if not is_safe:
+                    flagged[i] = violation_type
+        else:
+            # One scan over all texts joined by NUL (which no PHI pattern can
+            # match); a match offset maps back to its question by bisection.
+            # finditer's leftmost matches give each question its first hit.
+            ends = list(itertools.accumulate(len(t) + 1 for t in texts))
+            flagged = {}
+            for match in _PHI_COLLECTION_RE.finditer("\x00".join(texts)):
+                i = bisect.bisect_right(ends, match.start())
+                if i not in flagged:
+                    flagged[i] = self._phi_violation(match.lastgroup, texts[i])
+
+        return [
+            {
+                "question_id": questions[i].get("id"),
+                "question_text": texts[i][:100],
+                "violation": violation_type,
+                "recommendation": "Remove or rephrase this question to avoid collecting protected health information.",
+            }
+            for i, violation_type in sorted(flagged.items())
+        ]
 
 
 safety_moderator = SafetyModerator()
@@ -1,12 +1,13 @@
 """
 All Pydantic v2 schemas for request / response validation.
 """
+import sys
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Annotated, Any
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import AfterValidator, BaseModel, Field, StringConstraints, field_validator
 
 
 # ─── Enums ────────────────────────────────────────────────────────────────────
@@ -32,8 +33,20 @@ class SurveyStatus(str, Enum):
 
 # ─── Auth ─────────────────────────────────────────────────────────────────────
 
+# Syntactic check only (local@domain.tld), run by pydantic-core's regex engine;
+# enforced on the write path, so emails read back from the DB are plain str
+EmailAddress = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        max_length=254,
+        pattern=r"^[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+@[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)+$",
+    ),
+]
+
+
 class UserCreate(BaseModel):
-    email: EmailStr
+    email: EmailAddress
     password: str = Field(min_length=8)
     role: UserRole
     specialty: str | None = None
@@ -58,15 +71,24 @@ class Token(BaseModel):
 
 # ─── Question ─────────────────────────────────────────────────────────────────
 
+# Bounded like survey_events.question_id
+QuestionId = Annotated[str, StringConstraints(max_length=60)]
+# Ids of stored questions recur across skip logic, answers and agent results;
+# interning keeps one str object per id, and dict lookups keyed by them hit
+# the identity fast path. Only survey definitions are interned: interned
+# strings are immortal, so ids from per-request payloads must not be.
+InternedQuestionId = Annotated[QuestionId, AfterValidator(sys.intern)]
+
+
 class SkipLogicRule(BaseModel):
-    condition_question_id: str
+    condition_question_id: QuestionId
     condition_value: Any
     action: str = "skip_to"     # skip_to | hide
-    target_question_id: str
+    target_question_id: QuestionId
 
 
 class Question(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: InternedQuestionId = Field(default_factory=lambda: sys.intern(str(uuid.uuid4())[:8]))
     text: str = Field(min_length=5, max_length=500)
     type: QuestionType
     options: list[str] | None = None    # For MCQ / ranking
@@ -105,13 +127,30 @@ class SurveyResponse(BaseModel):
     created_at: datetime
     launched_at: datetime | None
 
-    model_config = {"from_attributes": True}
+    # Core schema is built on first use rather than at import, so processes
+    # that never touch it (e.g. Celery workers) don't pay for it
+    model_config = {"from_attributes": True, "defer_build": True}
+
+
+class SurveyListItem(BaseModel):
+    """Dashboard listing row: SurveyResponse without the questions / targeting JSON."""
+    id: uuid.UUID
+    title: str
+    description: str | None
+    estimated_time_seconds: int | None
+    quality_score: float | None
+    predicted_completion_rate: float | None
+    status: SurveyStatus
+    version: int
+    created_at: datetime
+    launched_at: datetime | None
+    closed_at: datetime | None
 
 
 # ─── Survey Response (Doctor) ─────────────────────────────────────────────────
 
 class AnswerItem(BaseModel):
-    question_id: str
+    question_id: QuestionId
     value: Any                  # String / int / list[str] depending on type
 
 
@@ -137,7 +176,7 @@ class ResponseOut(BaseModel):
 
 # Design Agent
 class BiasFlag(BaseModel):
-    question_id: str
+    question_id: QuestionId
     bias_type: str
     severity: str               # low | medium | high
     original_text: str
@@ -167,11 +206,16 @@ class GenerateVariantsResult(BaseModel):
     variants: list[VariantSurvey]
 
 
+class QualityAndVariantsResult(BaseModel):
+    quality: QualityCheckResult
+    variants: GenerateVariantsResult
+
+
 # Attempt Agent
 class ClarificationRequest(BaseModel):
     session_id: str
     survey_id: uuid.UUID
-    question_id: str
+    question_id: QuestionId
     doctor_context: dict | None = None   # specialty, experience
 
 
@@ -218,3 +262,7 @@ class InsightResult(BaseModel):
     action_items: list[ActionItem]
     sentiment_breakdown: dict   # {positive: 0.4, negative: 0.3, neutral: 0.3}
     segment_insights: list[dict]
+
+    # Built on first use, like SurveyResponse: only the insight worker path
+    # actually constructs one
+    model_config = {"defer_build": True}
@@ -2,25 +2,29 @@
 Celery Application + Tasks
 ──────────────────────────
 Task queues:
-  - insights  : post-survey analysis (triggered when survey closes)
+  - insights  : post-survey analysis (triggered when survey closes; bulk
+                closes go through the Anthropic Message Batches API)
   - reminders : scheduled doctor nudges
 """
 from __future__ import annotations
 
 import asyncio
-import logging
 import uuid
-from datetime import datetime, timedelta
+from datetime import timedelta
+from functools import lru_cache
 
+import orjson
 from celery import Celery
 from celery.schedules import crontab
-from sqlalchemy import select, update
+from celery.signals import worker_process_init
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.utils.clock import utcnow
 from app.utils.logger import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 # ─── App ──────────────────────────────────────────────────────────────────────
 
@@ -31,13 +35,17 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # msgpack skips JSON's string escaping / number reparsing; json stays
+    # accepted so messages queued by older workers still drain during rollout
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
     timezone="UTC",
     enable_utc=True,
     task_routes={
         "app.tasks.celery_app.generate_survey_insights": {"queue": "insights"},
+        "app.tasks.celery_app.submit_insight_batch": {"queue": "insights"},
+        "app.tasks.celery_app.poll_insight_batch": {"queue": "insights"},
         "app.tasks.celery_app.send_completion_reminder": {"queue": "reminders"},
         "app.tasks.celery_app.close_expired_surveys": {"queue": "insights"},
     },
@@ -51,11 +59,102 @@ celery_app.conf.update(
 )
 
 
+# ─── Event loop ───────────────────────────────────────────────────────────────
+# One loop per worker process, reused by every task, so the shared pooled
+# clients (Anthropic HTTP/2, Redis) keep their warm connections between tasks
+# instead of a fresh asyncio.run() loop each time.
+
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+@worker_process_init.connect
+def _init_worker_loop(**_) -> None:
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+
+
+def _run_async(coro):
+    if _loop is None:
+        # Not in a prefork worker (e.g. eager mode / a shell)
+        return asyncio.run(coro)
+    return _loop.run_until_complete(coro)
+
+
+# Message Batches usually finish well within the hour; no need to poll faster
+INSIGHT_BATCH_POLL_SECONDS = 60
+# Consecutive failed polls (API or DB errors) before the batch is abandoned
+# and its surveys are re-run through generate_survey_insights
+INSIGHT_BATCH_MAX_POLL_ERRORS = 5
+
+
 # ─── Helper: sync DB session for Celery tasks ─────────────────────────────────
 
+@lru_cache(maxsize=1)
 def _get_sync_engine():
+    """
+    One engine (and connection pool) per worker process, created lazily on
+    the first task — i.e. after the prefork — and reused by every task after.
+    """
     from sqlalchemy import create_engine
-    return create_engine(settings.DATABASE_URL_SYNC, pool_pre_ping=True)
+    return create_engine(
+        settings.DATABASE_URL_SYNC,
+        pool_pre_ping=True,
+        pool_size=5,
+        max_overflow=10,
+        pool_recycle=1800,
+        json_serializer=lambda obj: orjson.dumps(obj).decode(),
+        json_deserializer=orjson.loads,
+    )
+
+
+def _load_insight_inputs(session: Session, survey) -> tuple[dict, list[dict], float]:
+    """(survey_metadata, completed response dicts, completion_rate) for the Insight Agent."""
+    from app.models import Response
+
+    total, completed = session.execute(
+        # COUNT(*), COUNT(*) FILTER (WHERE is_complete): one pass, never NULL
+        select(func.count(), func.count().filter(Response.is_complete))
+        .where(Response.survey_id == survey.id)
+    ).one()
+    completion_rate = (completed / total * 100) if total else 0.0
+
+    # Plain column rows fetched in windows of 500: the agent only needs these
+    # fields, so no ORM identity map is built. The agent takes the whole list,
+    # so every completed response still ends up in response_dicts.
+    rows = session.execute(
+        select(Response.answers, Response.time_spent_seconds)
+        .where(Response.survey_id == survey.id, Response.is_complete == True)
+        .execution_options(yield_per=500)
+    )
+    response_dicts = [
+        {
+            "answers": r.answers,
+            "doctor_specialty": None,  # Would join with User in production
+            "time_spent_seconds": r.time_spent_seconds,
+        }
+        for r in rows
+    ]
+
+    survey_meta = {
+        "id": str(survey.id),
+        "admin_id": str(survey.admin_id),   # scopes the insight semantic cache
+        "title": survey.title,
+        "description": survey.description,
+        "questions": survey.questions,
+    }
+    return survey_meta, response_dicts, completion_rate
+
+
+def _apply_insight(insight, result) -> None:
+    # One serializer pass over both nested lists instead of a model_dump()
+    # per theme / action item
+    nested = result.model_dump(include={"themes", "action_items"})
+    insight.themes = nested["themes"]
+    insight.executive_summary = result.executive_summary
+    insight.action_items = nested["action_items"]
+    insight.sentiment_breakdown = result.sentiment_breakdown
+    insight.completion_rate = result.completion_rate
 
 
 # ─── Tasks ────────────────────────────────────────────────────────────────────
@@ -73,7 +172,7 @@ def generate_survey_insights(self, survey_id: str) -> dict:
     Runs Insight Agent and persists results to survey_insights table.
     """
     from sqlalchemy.orm import Session as SyncSession
-    from app.models import Response, Survey, SurveyInsight
+    from app.models import Survey, SurveyInsight
     from app.agents.insight_agent import insight_agent
 
     logger.info("task.generate_insights.start", survey_id=survey_id)
@@ -87,50 +186,16 @@ def generate_survey_insights(self, survey_id: str) -> dict:
                 logger.error("task.generate_insights.survey_not_found", survey_id=survey_id)
                 return {"error": "survey not found"}
 
-            # Load responses
-            responses = session.scalars(
-                select(Response).where(Response.survey_id == uuid.UUID(survey_id))
-            ).all()
-
-            total_sent = (
-                session.scalars(
-                    select(Response).where(Response.survey_id == uuid.UUID(survey_id))
-                ).all()
-            )
-            completed = [r for r in responses if r.is_complete]
-            completion_rate = (len(completed) / len(responses) * 100) if responses else 0.0
-
-            # Prepare response dicts for agent
-            response_dicts = [
-                {
-                    "answers": r.answers,
-                    "doctor_specialty": None,  # Would join with User in production
-                    "time_spent_seconds": r.time_spent_seconds,
-                }
-                for r in completed
-            ]
-
-            survey_meta = {
-                "id": str(survey.id),
-                "title": survey.title,
-                "description": survey.description,
-                "questions": survey.questions,
-            }
+            survey_meta, response_dicts, completion_rate = _load_insight_inputs(session, survey)
 
             # Run async agent in sync context
-            result = asyncio.run(
+            result = _run_async(
                 insight_agent.analyze(survey_meta, response_dicts, completion_rate)
             )
 
             # Persist insight
-            insight = SurveyInsight(
-                survey_id=uuid.UUID(survey_id),
-                themes=[t.model_dump() for t in result.themes],
-                executive_summary=result.executive_summary,
-                action_items=[a.model_dump() for a in result.action_items],
-                sentiment_breakdown=result.sentiment_breakdown,
-                completion_rate=result.completion_rate,
-            )
+            insight = SurveyInsight(survey_id=uuid.UUID(survey_id))
+            _apply_insight(insight, result)
             session.add(insight)
             session.commit()
 
@@ -147,6 +212,156 @@ def generate_survey_insights(self, survey_id: str) -> dict:
         raise self.retry(exc=exc)
 
 
+@celery_app.task(
+    name="app.tasks.celery_app.submit_insight_batch",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+)
+def submit_insight_batch(self, survey_ids: list[str], batch_id: str | None = None) -> dict:
+    """
+    Offline variant of generate_survey_insights for several surveys at once.
+
+    Submits one Message Batch (half the token cost, no real-time rate-limit
+    contention) and stores a pending SurveyInsight row per survey carrying
+    the batch id; poll_insight_batch fills them in once the batch ends.
+    Surveys without responses get the empty report immediately.
+
+    `batch_id` is only set on retries that follow a successful submission,
+    so a failed commit never pays for the same batch twice.
+    """
+    from sqlalchemy.orm import Session as SyncSession
+    from app.models import Survey, SurveyInsight
+    from app.agents.insight_agent import insight_agent
+
+    try:
+        engine = _get_sync_engine()
+        with SyncSession(engine) as session:
+            if batch_id is not None:
+                submitted = session.scalar(
+                    select(func.count()).where(SurveyInsight.batch_id == batch_id)
+                )
+                if submitted:
+                    # An earlier attempt committed; only the poll is missing
+                    poll_insight_batch.apply_async(args=[batch_id], countdown=INSIGHT_BATCH_POLL_SECONDS)
+                    logger.info("task.submit_insight_batch.submitted", batch_id=batch_id, count=submitted)
+                    return {"batch_id": batch_id, "submitted": submitted}
+
+            pending = []
+            for sid in survey_ids:
+                survey = session.get(Survey, uuid.UUID(sid))
+                if not survey:
+                    logger.error("task.submit_insight_batch.survey_not_found", survey_id=sid)
+                    continue
+                survey_meta, response_dicts, completion_rate = _load_insight_inputs(session, survey)
+                if response_dicts:
+                    pending.append((survey_meta, response_dicts, completion_rate))
+                    continue
+                # No LLM call needed for the empty report
+                insight = SurveyInsight(survey_id=survey.id)
+                _apply_insight(insight, _run_async(insight_agent.analyze(survey_meta, [], completion_rate)))
+                session.add(insight)
+
+            if pending and batch_id is None:
+                batch_id = _run_async(insight_agent.submit_batch(pending))
+            if pending:
+                session.add_all(
+                    SurveyInsight(
+                        survey_id=uuid.UUID(survey_meta["id"]),
+                        completion_rate=completion_rate,
+                        batch_id=batch_id,
+                    )
+                    for survey_meta, _, completion_rate in pending
+                )
+            session.commit()
+
+        if batch_id:
+            poll_insight_batch.apply_async(args=[batch_id], countdown=INSIGHT_BATCH_POLL_SECONDS)
+        logger.info("task.submit_insight_batch.submitted", batch_id=batch_id, count=len(pending))
+        return {"batch_id": batch_id, "submitted": len(pending)}
+
+    except Exception as exc:
+        logger.error("task.submit_insight_batch.failed", batch_id=batch_id, error=str(exc))
+        raise self.retry(exc=exc, args=[survey_ids], kwargs={"batch_id": batch_id})
+
+
+@celery_app.task(
+    name="app.tasks.celery_app.poll_insight_batch",
+    bind=True,
+    max_retries=None,
+)
+def poll_insight_batch(self, batch_id: str, errors: int = 0) -> dict:
+    """
+    Re-schedules itself every INSIGHT_BATCH_POLL_SECONDS until the batch has
+    ended, then writes results into the pending SurveyInsight rows.
+
+    Transient failures are retried on the same schedule; after
+    INSIGHT_BATCH_MAX_POLL_ERRORS in a row the batch is abandoned so its
+    placeholders don't stay pending forever.
+    """
+    from sqlalchemy.orm import Session as SyncSession
+    from app.models import SurveyInsight
+    from app.agents.insight_agent import insight_agent
+
+    try:
+        engine = _get_sync_engine()
+        with SyncSession(engine) as session:
+            insights = session.scalars(
+                select(SurveyInsight).where(SurveyInsight.batch_id == batch_id)
+            ).all()
+            completion_rates = {str(i.survey_id): i.completion_rate or 0.0 for i in insights}
+
+            results = _run_async(insight_agent.fetch_batch_results(batch_id, completion_rates))
+            failed = []
+            if results is not None:
+                for insight in insights:
+                    result = results.get(str(insight.survey_id))
+                    if result is None:
+                        # Failed request: drop the placeholder, re-run it in real time below
+                        session.delete(insight)
+                        failed.append(str(insight.survey_id))
+                        continue
+                    _apply_insight(insight, result)
+                    insight.batch_id = None
+                    insight.generated_at = utcnow()
+                session.commit()
+
+    except Exception as exc:
+        errors += 1
+        if errors >= INSIGHT_BATCH_MAX_POLL_ERRORS:
+            logger.error("task.poll_insight_batch.abandoned", batch_id=batch_id, error=str(exc))
+            return _abandon_insight_batch(batch_id)
+        logger.warning("task.poll_insight_batch.failed", batch_id=batch_id, errors=errors, error=str(exc))
+        raise self.retry(args=[batch_id], kwargs={"errors": errors}, countdown=INSIGHT_BATCH_POLL_SECONDS)
+
+    if results is None:
+        # Still processing; a successful poll resets the error count
+        raise self.retry(args=[batch_id], kwargs={}, countdown=INSIGHT_BATCH_POLL_SECONDS)
+
+    for survey_id in failed:
+        generate_survey_insights.apply_async(args=[survey_id], queue="insights")
+    logger.info("task.poll_insight_batch.complete", batch_id=batch_id, results=len(results))
+    return {"batch_id": batch_id, "completed": len(results)}
+
+
+def _abandon_insight_batch(batch_id: str) -> dict:
+    """Drop a batch's placeholder rows and re-run each survey in real time."""
+    from sqlalchemy.orm import Session as SyncSession
+    from app.models import SurveyInsight
+
+    with SyncSession(_get_sync_engine()) as session:
+        survey_ids = session.scalars(
+            delete(SurveyInsight)
+            .where(SurveyInsight.batch_id == batch_id)
+            .returning(SurveyInsight.survey_id)
+        ).all()
+        session.commit()
+
+    for survey_id in survey_ids:
+        generate_survey_insights.apply_async(args=[str(survey_id)], queue="insights")
+    return {"batch_id": batch_id, "completed": 0, "fallback": len(survey_ids)}
+
+
 @celery_app.task(
     name="app.tasks.celery_app.send_completion_reminder",
     bind=True,
@@ -193,7 +408,7 @@ def send_completion_reminder(self, doctor_id: str, survey_id: str) -> dict:
                 survey_id=uuid.UUID(survey_id),
                 doctor_id=uuid.UUID(doctor_id),
                 event_type="reminder_sent",
-                metadata={"channel": "push"},
+                survey_metadata={"channel": "push"},
             )
             session.add(event)
             session.commit()
@@ -217,29 +432,28 @@ def close_expired_surveys() -> dict:
     from app.models import Survey
 
     engine = _get_sync_engine()
-    closed_ids = []
 
     with SyncSession(engine) as session:
-        # Find active surveys with no recent responses (heuristic: 30 days old)
-        cutoff = datetime.utcnow() - timedelta(days=30)
-        expired = session.scalars(
-            select(Survey).where(
-                Survey.status == "active",
-                Survey.launched_at < cutoff,
+        # Close active surveys with no recent responses (heuristic: 30 days
+        # old) in one UPDATE ... RETURNING id — no Survey rows are loaded
+        now = utcnow()
+        closed_ids = [
+            str(survey_id)
+            for survey_id in session.scalars(
+                update(Survey)
+                .where(
+                    Survey.status == "active",
+                    Survey.launched_at < now - timedelta(days=30),
+                )
+                .values(status="closed", closed_at=now)
+                .returning(Survey.id)
             )
-        ).all()
-
-        for survey in expired:
-            survey.status = "closed"
-            survey.closed_at = datetime.utcnow()
-            closed_ids.append(str(survey.id))
-
+        ]
         session.commit()
 
-    # Trigger insight generation for each closed survey
-    for sid in closed_ids:
-        generate_survey_insights.apply_async(args=[sid], queue="insights")
-        logger.info("task.close_expired.triggered_insights", survey_id=sid)
+    # Nobody is waiting on these reports, so analyze them in one Message Batch
+    if closed_ids:
+        submit_insight_batch.apply_async(args=[closed_ids], queue="insights")
 
     logger.info("task.close_expired.done", count=len(closed_ids))
     return {"closed": len(closed_ids), "survey_ids": closed_ids}
@@ -0,0 +1,128 @@
+"""
+Interaction Log Buffer
+──────────────────────
+Collects agent_interaction_logs rows in memory and writes them in batches
+with COPY instead of one INSERT + flush per agent call. Rows are flushed
+every `max_batch` rows or `flush_interval` seconds, whichever comes first.
+
+Logging is best-effort: if the queue is full or a COPY fails the rows are
+dropped with a warning rather than failing the request that produced them.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+
+import orjson
+
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+_TABLE = "agent_interaction_logs"
+_COLUMNS = ("agent_type", "user_id", "input_context", "output_response", "tokens_used", "latency_ms")
+
+# Queued by stop(): the consumer flushes its current batch and exits
+_STOP = object()
+
+
+def _json_text(value: dict | None) -> str | None:
+    # asyncpg's default jsonb codec expects JSON text
+    return orjson.dumps(value).decode() if value is not None else None
+
+
+class InteractionLogBuffer:
+    """
+    Producer/consumer buffer in front of agent_interaction_logs.
+
+    enqueue() is synchronous and never blocks; a background task started by
+    start() drains the queue and COPYs batches into Postgres.
+    """
+
+    def __init__(self, max_batch: int = 1000, flush_interval: float = 0.5, max_queue: int = 50_000):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[tuple] = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+
+    def enqueue(
+        self,
+        agent_type: str,
+        user_id: uuid.UUID | None,
+        input_context: dict | None,
+        output_response: dict | None,
+        latency_ms: int | None = None,
+        tokens_used: int | None = None,
+    ) -> None:
+        record = (
+            agent_type,
+            user_id,
+            _json_text(input_context),
+            _json_text(output_response),
+            tokens_used,
+            latency_ms,
+        )
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            logger.warning("log_buffer.dropped agent_type=%s reason=queue_full", agent_type)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and flush whatever is still queued."""
+        if self._task is not None:
+            # Not cancelled: the task may be holding a dequeued batch or be
+            # mid-COPY, so let it finish and exit at the sentinel instead
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+
+        # Rows enqueued after the sentinel
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._flush(batch)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            record = await self._queue.get()
+            if record is _STOP:
+                return
+            batch = [record]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list[tuple]) -> None:
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    _TABLE, records=batch, columns=_COLUMNS
+                )
+        except Exception as e:
+            logger.warning("log_buffer.flush_failed rows=%d error=%s", len(batch), e)
+
+
+# Module-level singleton
+interaction_log_buffer = InteractionLogBuffer()
@@ -0,0 +1,13 @@
+"""
+UTC Clock
+─────────
+Naive-UTC "now" for the DateTime (without time zone) columns. Replaces the
+deprecated datetime.utcnow() with datetime.now(UTC), reusing one tzinfo.
+"""
+from datetime import datetime, timezone
+
+_UTC = timezone.utc
+
+
+def utcnow() -> datetime:
+    return datetime.now(_UTC).replace(tzinfo=None)
@@ -1,18 +1,28 @@
 import logging
 import structlog
 
+from app.config import settings
+
+# Configured once at import: structlog's configuration is process-global, so
+# there is nothing to redo per get_logger() call. Production emits JSON lines
+# instead of paying for ANSI console formatting.
+structlog.configure(
+    processors=[
+        structlog.stdlib.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.JSONRenderer()
+        if settings.APP_ENV == "production"
+        else structlog.dev.ConsoleRenderer(),
+    ],
+    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+    context_class=dict,
+    logger_factory=structlog.PrintLoggerFactory(),
+    cache_logger_on_first_use=True,
+)
+
 
 def get_logger(name: str) -> structlog.BoundLogger:
-    structlog.configure(
-        processors=[
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.add_logger_name,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.dev.ConsoleRenderer(),  # Switch to JSONRenderer in production
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
-        context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-    )
-    return structlog.get_logger(name)
+    # PrintLogger has no .name for stdlib.add_logger_name, so bind it instead.
+    # Not as "logger": that is wrap_logger()'s first parameter.
+    return structlog.get_logger(logger_name=name)
@@ -11,18 +11,28 @@ Indexes:
 """
 from __future__ import annotations
 
+import asyncio
+import itertools
 import logging
+import random
+import threading
 import time
 from enum import Enum
 
 from pinecone import Pinecone, ServerlessSpec
 
-from app.rag.embeddings import EMBEDDING_DIM, embed_text, embed_batch
+from app.rag.embeddings import EMBEDDING_DIM, embed_text, embed_batch, to_values
 
 logger = logging.getLogger(__name__)
 
 # ── Index names ────────────────────────────────────────────────────────────────
 
+# Chunk upserts in flight at once per upsert_batch() call, and retries for a
+# chunk rejected with 429 (rate limited)
+UPSERT_CONCURRENCY = 8
+UPSERT_MAX_RETRIES = 5
+
+
 class IndexName(str, Enum):
     GUIDELINES      = "survey-guidelines"
     TEMPLATES       = "survey-templates"
@@ -32,15 +42,31 @@ class IndexName(str, Enum):
 # ── Pinecone client singleton ──────────────────────────────────────────────────
 
 _pc: Pinecone | None = None
+# Index handles by name, so every VectorStore for an index shares one handle
+# (and its connection pool) instead of opening a new one per instance
+_indexes: dict = {}
+# Serializes first-use initialization across threads (threadpool handlers,
+# to_thread workers) so no duplicate clients / connection pools get built
+_init_lock = threading.Lock()
 
 
 def get_pinecone(api_key: str) -> Pinecone:
     global _pc
     if _pc is None:
-        _pc = Pinecone(api_key=api_key)
+        with _init_lock:
+            if _pc is None:
+                _pc = Pinecone(api_key=api_key)
     return _pc
 
 
+def _get_index(pc: Pinecone, index_name: str):
+    if index_name not in _indexes:
+        with _init_lock:
+            if index_name not in _indexes:
+                _indexes[index_name] = pc.Index(index_name)
+    return _indexes[index_name]
+
+
 # ── Index bootstrap ────────────────────────────────────────────────────────────
 
 def ensure_index(
@@ -83,14 +109,19 @@ def ensure_all_indexes(pc: Pinecone) -> None:
 
 
 def _wait_until_ready(pc: Pinecone, index_name: str, timeout: int = 120) -> None:
-    """Poll until the index status is ready or timeout is reached."""
+    """
+    Poll until the index status is ready or timeout is reached, backing off
+    from 0.25s to at most 5s between describe_index calls.
+    """
     deadline = time.time() + timeout
+    delay = 0.25
     while time.time() < deadline:
         description = pc.describe_index(index_name)
         if description.status.get("ready"):
             return
         logger.debug(f"Waiting for index '{index_name}' to become ready ...")
-        time.sleep(3)
+        time.sleep(min(delay, 5.0, max(0.0, deadline - time.time())))
+        delay *= 1.6
     raise TimeoutError(f"Pinecone index '{index_name}' was not ready within {timeout}s.")
 
 
@@ -104,7 +135,7 @@ class VectorStore:
 
     def __init__(self, pc: Pinecone, index_name: IndexName) -> None:
         self.index_name = index_name.value
-        self._index = pc.Index(self.index_name)
+        self._index = _get_index(pc, self.index_name)
 
     # ── Write ──────────────────────────────────────────────────────────────────
 
@@ -118,7 +149,7 @@ class VectorStore:
         vector = await embed_text(text)
         self._index.upsert(vectors=[{
             "id": doc_id,
-            "values": vector,
+            "values": to_values(vector),
             "metadata": metadata or {},
         }])
         logger.debug(f"Upserted doc '{doc_id}' into '{self.index_name}'.")
@@ -135,20 +166,43 @@ class VectorStore:
         texts = [d["text"] for d in documents]
         vectors = await embed_batch(texts)
 
-        records = [
-            {
-                "id": doc["id"],
-                "values": vec,
-                "metadata": doc.get("metadata", {}),
-            }
+        # (id, values, metadata) tuples built lazily, so only one chunk of
+        # converted vectors is alive at a time rather than the whole corpus
+        records = (
+            (doc["id"], to_values(vec), doc.get("metadata", {}))
             for doc, vec in zip(documents, vectors)
-        ]
+        )
 
-        # Pinecone recommends batches ≤ 100 vectors
-        for i in range(0, len(records), batch_size):
-            chunk = records[i : i + batch_size]
-            self._index.upsert(vectors=chunk)
-            logger.debug(f"Upserted batch [{i}:{i+len(chunk)}] into '{self.index_name}'.")
+        # Pinecone recommends batches ≤ 100 vectors. Upserts are network-bound,
+        # so up to UPSERT_CONCURRENCY chunks are sent concurrently; a slot is
+        # taken before the next chunk is built, keeping memory bounded too.
+        semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+        tasks = []
+        i = 0
+        while True:
+            await semaphore.acquire()
+            chunk = list(itertools.islice(records, batch_size))
+            if not chunk:
+                semaphore.release()
+                break
+            tasks.append(asyncio.create_task(self._upsert_chunk(chunk, i, semaphore)))
+            i += len(chunk)
+        await asyncio.gather(*tasks)
+
+    async def _upsert_chunk(self, chunk: list[tuple], start: int, semaphore: asyncio.Semaphore) -> None:
+        """Upsert one chunk in a worker thread, retrying 429s with jittered backoff."""
+        try:
+            for attempt in range(UPSERT_MAX_RETRIES + 1):
+                try:
+                    await asyncio.to_thread(self._index.upsert, vectors=chunk)
+                    break
+                except Exception as e:
+                    if getattr(e, "status", None) != 429 or attempt == UPSERT_MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+            logger.debug(f"Upserted batch [{start}:{start+len(chunk)}] into '{self.index_name}'.")
+        finally:
+            semaphore.release()
 
     # ── Read ───────────────────────────────────────────────────────────────────
 
@@ -165,7 +219,7 @@ class VectorStore:
         """
         query_vector = await embed_text(query)
         response = self._index.query(
-            vector=query_vector,
+            vector=to_values(query_vector),
             top_k=top_k,
             include_metadata=True,
             filter=filter,
@@ -179,6 +233,42 @@ class VectorStore:
             for match in response.matches
         ]
 
+    async def search_many(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+        filter: dict | None = None,
+    ) -> list[list[dict]]:
+        """
+        search() for several queries at once: one embed_batch() call for all
+        of them, then the Pinecone queries run concurrently. Results are in
+        the same order as `queries`.
+        """
+        if not queries:
+            return []
+        query_vectors = await embed_batch(queries)
+        responses = await asyncio.gather(*(
+            asyncio.to_thread(
+                self._index.query,
+                vector=to_values(vector),
+                top_k=top_k,
+                include_metadata=True,
+                filter=filter,
+            )
+            for vector in query_vectors
+        ))
+        return [
+            [
+                {
+                    "id": match.id,
+                    "score": match.score,
+                    "metadata": match.metadata,
+                }
+                for match in response.matches
+            ]
+            for response in responses
+        ]
+
     async def search_and_format(
         self,
         query: str,
@@ -14,25 +14,23 @@ Usage:
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
+import io
 import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
-import typer
-from dotenv import load_dotenv
-from rich import box
+import orjson
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
+from rich.prompt import Confirm
 from rich.text import Text
 
-load_dotenv()
+# rich.progress / rich.table and python-dotenv are imported where they are
+# used, so `--help` stays fast
 
 console = Console()
-app = typer.Typer(help="Survey Agent CLI Demo")
 
 # ─── Sample data ──────────────────────────────────────────────────────────────
 
@@ -76,6 +74,8 @@ SAMPLE_SURVEY = {
     ],
 }
 
+SAMPLE_QUESTIONS_BY_ID = {q["id"]: q for q in SAMPLE_SURVEY["questions"]}
+
 SAMPLE_RESPONSES = [
     {
         "answers": {
@@ -140,13 +140,26 @@ DOCTOR_CONTEXT = {
 }
 
 
+# ─── Rendering lookups ────────────────────────────────────────────────────────
+
+SEVERITY_COLORS = {"high": "red", "medium": "yellow", "low": "dim"}
+PRIORITY_COLORS = {"high": "red", "medium": "yellow", "low": "dim"}
+SENTIMENT_ICONS = {"positive": "✅", "negative": "❌", "neutral": "➖", "mixed": "🔄"}
+# 10-cell progress bars, indexed by filled cell count
+PROGRESS_BARS = tuple("█" * n + "░" * (10 - n) for n in range(11))
+
+
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 def _check_api_key() -> bool:
-    if not os.getenv("OPENAI_API_KEY"):
+    """Load .env (before any app module reads settings) and check the API key."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    if not os.getenv("ANTHROPIC_API_KEY"):
         console.print(
             Panel(
-                "[red]OPENAI_API_KEY not set.[/red]\n"
+                "[red]ANTHROPIC_API_KEY not set.[/red]\n"
                 "Copy [bold].env.example[/bold] → [bold].env[/bold] and add your key.",
                 title="⚠️  Configuration Required",
                 border_style="red",
@@ -156,174 +169,280 @@ def _check_api_key() -> bool:
     return True
 
 
-def _spinner(label: str):
-    return Progress(SpinnerColumn(), TextColumn(label), transient=True)
+@contextmanager
+def _spinner(label: str, out: Console = console):
+    # Only one live display can run at a time, so buffered (concurrent) demo
+    # output gets no spinner of its own
+    if out is not console:
+        yield
+        return
+    from rich.progress import Progress, SpinnerColumn, TextColumn
 
+    with Progress(SpinnerColumn(), TextColumn(label), transient=True, console=out) as progress:
+        progress.add_task("", total=None)
+        yield
 
-def _print_section(title: str, content: str, style: str = "cyan") -> None:
-    console.print(Panel(content, title=f"[bold]{title}[/bold]", border_style=style))
 
+async def _with_warm_connection(coro):
+    """Await `coro` while a pooled API connection is opened in the background."""
+    from app.agents._http import warm_http_client
 
-# ─── Design Agent Demo ────────────────────────────────────────────────────────
+    warmup = asyncio.create_task(warm_http_client())
+    try:
+        return await coro
+    finally:
+        warmup.cancel()
 
-async def _demo_design_agent() -> None:
-    from app.agents.design_agent import design_agent
 
-    console.print("\n[bold cyan]═══ DESIGN AGENT DEMO ═══[/bold cyan]")
-    console.print("Analyzing a survey with intentional bias issues...\n")
+def _buffered_console() -> Console:
+    """A Console rendering into memory with the terminal's width and colours."""
+    return Console(
+        file=io.StringIO(),
+        width=console.width,
+        color_system=console.color_system,
+        force_terminal=console.is_terminal,
+    )
 
-    # Show input
-    console.print("[dim]Input Survey:[/dim]")
-    for i, q in enumerate(SAMPLE_SURVEY["questions"], 1):
-        console.print(f"  [dim]{i}.[/dim] {q['text']}")
-    console.print()
 
-    # Quality check
-    with _spinner("[yellow]Running quality check...[/yellow]") as progress:
-        progress.add_task("", total=None)
-        result = await design_agent.quality_check(
-            survey_title=SAMPLE_SURVEY["title"],
-            questions=SAMPLE_SURVEY["questions"],
-            specialty="Mixed specialties",
-        )
+def _ellipsize(text: str, limit: int = 60) -> str:
+    return text if len(text) <= limit else f"{text[:limit]}…"
 
-    # Quality score
-    score_color = "green" if result.overall_quality_score >= 7 else "yellow" if result.overall_quality_score >= 5 else "red"
-    console.print(f"[bold]Quality Score:[/bold] [{score_color}]{result.overall_quality_score:.1f}/10[/{score_color}]")
-    console.print(f"[bold]Predicted Completion Rate:[/bold] [yellow]{result.estimated_completion_rate:.0f}%[/yellow]")
-    console.print(f"[bold]Estimated Time:[/bold] {result.estimated_time_seconds}s ({result.estimated_time_seconds // 60}m {result.estimated_time_seconds % 60}s)\n")
-
-    # Bias flags table
-    if result.bias_flags:
-        table = Table(title="🚩 Bias Flags", box=box.ROUNDED, show_lines=True)
-        table.add_column("Question ID", style="dim")
-        table.add_column("Type", style="red")
-        table.add_column("Severity", justify="center")
-        table.add_column("Original")
-        table.add_column("Suggested Fix", style="green")
-
-        severity_colors = {"high": "red", "medium": "yellow", "low": "dim"}
-        for flag in result.bias_flags:
-            sev_color = severity_colors.get(flag.severity, "white")
-            table.add_row(
-                flag.question_id,
-                flag.bias_type.replace("_", " "),
-                f"[{sev_color}]{flag.severity.upper()}[/{sev_color}]",
-                flag.original_text[:60] + ("..." if len(flag.original_text) > 60 else ""),
-                flag.suggestion[:60] + ("..." if len(flag.suggestion) > 60 else ""),
-            )
-        console.print(table)
 
-    # Length recommendation
-    console.print(f"\n[bold]Length Recommendation:[/bold] {result.length_recommendation}")
-    if result.audience_suggestion:
-        console.print(f"[bold]Audience Suggestion:[/bold] {result.audience_suggestion}")
+def _labeled(label: str, value: str, style: str = "") -> Text:
+    """Bold `label:` followed by `value`, assembled directly (no markup parsing)."""
+    return Text.assemble((f"{label}: ", "bold"), (value, style))
 
-    # Ask to generate variants
-    console.print()
-    if Confirm.ask("[bold]Generate A/B test variants?[/bold]", default=True):
-        with _spinner("[yellow]Generating variants...[/yellow]") as progress:
-            progress.add_task("", total=None)
-            variants_result = await design_agent.generate_variants(
-                title=SAMPLE_SURVEY["title"],
-                questions=SAMPLE_SURVEY["questions"],
-                num_variants=2,
-            )
 
-        for v in variants_result.variants:
-            _print_section(
-                f"Variant {v.variant_label} — Predicted: {v.predicted_completion_rate:.0f}%",
-                f"[bold]Hypothesis:[/bold] {v.hypothesis}\n\n"
-                + "[bold]Key Differences:[/bold]\n"
-                + "\n".join(f"  • {d}" for d in v.key_differences)
-                + f"\n\n[bold]Questions ({len(v.questions)}):[/bold]\n"
-                + "\n".join(f"  {i}. {q.text}" for i, q in enumerate(v.questions)),
-                style="blue" if v.variant_label == "A" else "magenta",
-            )
+def _print_section(title: str, content: str, style: str = "cyan", out: Console = console) -> None:
+    out.print(Panel(content, title=f"[bold]{title}[/bold]", border_style=style))
 
 
-# ─── Attempt Agent Demo ───────────────────────────────────────────────────────
+QUALITY_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "survey-copilot" / "quality"
 
-async def _demo_attempt_agent() -> None:
-    from app.agents.attempt_agent import attempt_agent
 
-    console.print("\n[bold green]═══ ATTEMPT AGENT DEMO ═══[/bold green]")
-    console.print("Simulating a doctor taking the survey...\n")
+async def _cached_quality_check(title: str, questions: list[dict], specialty: str | None = None):
+    """
+    design_agent.quality_check() with an on-disk result cache, so re-running a
+    demo on the same survey needs no LLM call even without Redis (which the
+    agent's own response cache relies on). Keyed like that cache: inputs plus
+    model and prompt version.
+    """
+    from app.agents.design_agent import SYSTEM_PROMPT_VERSION, design_agent
+    from app.config import ANTHROPIC_MODEL
+    from app.schemas import QualityCheckResult
 
-    # Progress messages
-    console.print("[bold]── Progress Tracking ──[/bold]")
-    for answered in [0, 2, 4, 5]:
-        progress = await attempt_agent.get_progress(
-            session_id="demo-session-001",
-            questions_total=5,
-            questions_answered=answered,
-        )
-        bar_filled = int(progress.percent_complete / 10)
-        bar = "█" * bar_filled + "░" * (10 - bar_filled)
-        console.print(
-            f"  [{bar}] {progress.percent_complete:.0f}% "
-            f"| {progress.estimated_seconds_remaining}s left "
-            f"| {progress.motivational_message}"
-        )
+    payload = orjson.dumps(
+        (title, questions, specialty, ANTHROPIC_MODEL, SYSTEM_PROMPT_VERSION),
+        option=orjson.OPT_SORT_KEYS,
+    )
+    path = QUALITY_CACHE_DIR / f"{hashlib.blake2b(payload, digest_size=16).hexdigest()}.json"
+    try:
+        return QualityCheckResult.model_validate_json(path.read_bytes())
+    except (OSError, ValueError):
+        pass
 
-    console.print()
+    result = await design_agent.quality_check(title, questions, specialty)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(result.model_dump_json(), encoding="utf-8")
+    except OSError:
+        pass
+    return result
 
-    # Clarification
-    console.print("[bold]── Question Clarification ──[/bold]")
-    confusing_question = SAMPLE_SURVEY["questions"][4]  # NPS question
-    console.print(f"\n[dim]Doctor sees:[/dim] [italic]\"{confusing_question['text']}\"[/italic]")
-    console.print("[dim]Doctor clicks \"Need help?\"...[/dim]\n")
 
-    with _spinner("[yellow]Fetching clarification...[/yellow]") as progress:
-        progress.add_task("", total=None)
-        clarification = await attempt_agent.clarify_question(
-            session_id="demo-session-001",
-            question=confusing_question,
-            doctor_context=DOCTOR_CONTEXT,
+# ─── Design Agent Demo ────────────────────────────────────────────────────────
+
+async def _demo_design_agent(out: Console = console, generate_variants: bool | None = None) -> None:
+    from rich import box
+    from rich.table import Table
+
+    from app.agents.design_agent import design_agent
+
+    # Consecutive prints are buffered and written once on leaving `with out:`
+    with out:
+        out.print("\n[bold cyan]═══ DESIGN AGENT DEMO ═══[/bold cyan]")
+        out.print("Analyzing a survey with intentional bias issues...\n")
+
+        # Show input
+        out.print("[dim]Input Survey:[/dim]")
+        for i, q in enumerate(SAMPLE_SURVEY["questions"], 1):
+            out.print(f"  [dim]{i}.[/dim] {q['text']}")
+        out.print()
+
+    # Asked before any LLM call so the variants request can start together
+    # with the quality check instead of after it
+    if generate_variants is None:
+        generate_variants = await asyncio.to_thread(
+            Confirm.ask, "[bold]Generate A/B test variants?[/bold]", default=True
         )
 
-    _print_section(
-        "💡 AI Clarification",
-        clarification.clarification
-        + (
-            "\n\n[bold]Examples:[/bold]\n"
-            + "\n".join(f"  • {e}" for e in (clarification.examples or []))
-            if clarification.examples else ""
-        ),
-        style="green",
-    )
-    console.print(
-        f"[dim]✓ Meaning preserved (did_change_meaning={clarification.did_change_meaning})[/dim]\n"
-    )
+    # Quality check (+ variants): independent calls, run concurrently
+    quality_task = asyncio.create_task(_cached_quality_check(
+        SAMPLE_SURVEY["title"],
+        SAMPLE_SURVEY["questions"],
+        specialty="Mixed specialties",
+    ))
+    variants_task = asyncio.create_task(design_agent.generate_variants(
+        title=SAMPLE_SURVEY["title"],
+        questions=SAMPLE_SURVEY["questions"],
+        num_variants=2,
+    )) if generate_variants else None
+
+    label = "Analyzing survey + generating variants..." if variants_task else "Running quality check..."
+    with _spinner(f"[yellow]{label}[/yellow]", out):
+        if variants_task:
+            result, variants_result = await asyncio.gather(quality_task, variants_task)
+        else:
+            result = await quality_task
+
+    with out:
+        # Quality score
+        score_color = "green" if result.overall_quality_score >= 7 else "yellow" if result.overall_quality_score >= 5 else "red"
+        seconds = result.estimated_time_seconds
+        out.print(_labeled("Quality Score", f"{result.overall_quality_score:.1f}/10", score_color))
+        out.print(_labeled("Predicted Completion Rate", f"{result.estimated_completion_rate:.0f}%", "yellow"))
+        out.print(_labeled("Estimated Time", f"{seconds}s ({seconds // 60}m {seconds % 60}s)"))
+        out.print()
+
+        # Bias flags table
+        if result.bias_flags:
+            table = Table(title="🚩 Bias Flags", box=box.ROUNDED, show_lines=True)
+            table.add_column("Question ID", style="dim")
+            table.add_column("Type", style="red")
+            table.add_column("Severity", justify="center")
+            table.add_column("Original")
+            table.add_column("Suggested Fix", style="green")
+
+            for flag in result.bias_flags:
+                sev_color = SEVERITY_COLORS.get(flag.severity, "white")
+                table.add_row(
+                    Text(flag.question_id),
+                    Text(flag.bias_type.replace("_", " ")),
+                    Text(flag.severity.upper(), style=sev_color),
+                    Text(_ellipsize(flag.original_text)),
+                    Text(_ellipsize(flag.suggestion)),
+                )
+            out.print(table)
+
+        # Length recommendation
+        out.print()
+        out.print(_labeled("Length Recommendation", result.length_recommendation))
+        if result.audience_suggestion:
+            out.print(_labeled("Audience Suggestion", result.audience_suggestion))
+
+        # A/B variants
+        out.print()
+        if variants_task:
+            for v in variants_result.variants:
+                _print_section(
+                    f"Variant {v.variant_label} — Predicted: {v.predicted_completion_rate:.0f}%",
+                    f"[bold]Hypothesis:[/bold] {v.hypothesis}\n\n"
+                    + "[bold]Key Differences:[/bold]\n"
+                    + "\n".join(f"  • {d}" for d in v.key_differences)
+                    + f"\n\n[bold]Questions ({len(v.questions)}):[/bold]\n"
+                    + "\n".join(f"  {i}. {q.text}" for i, q in enumerate(v.questions)),
+                    style="blue" if v.variant_label == "A" else "magenta",
+                    out=out,
+                )
+
+
+# ─── Attempt Agent Demo ───────────────────────────────────────────────────────
 
-    # Completion summary
-    if Confirm.ask("[bold]Show completion summary?[/bold]", default=True):
-        console.print("\n[dim]Doctor completes survey...[/dim]")
+async def _demo_attempt_agent(out: Console = console, show_summary: bool | None = None) -> None:
+    from app.agents.attempt_agent import attempt_agent
 
-        with _spinner("[yellow]Generating completion summary...[/yellow]") as progress:
-            progress.add_task("", total=None)
-            summary = await attempt_agent.generate_completion_summary(
-                responses=list(SAMPLE_RESPONSES[0]["answers"].items()),
-                survey_title=SAMPLE_SURVEY["title"],
-                total_responses=247,
+    with out:
+        out.print("\n[bold green]═══ ATTEMPT AGENT DEMO ═══[/bold green]")
+        out.print("Simulating a doctor taking the survey...\n")
+
+        # Progress messages
+        out.print("[bold]── Progress Tracking ──[/bold]")
+        for answered in [0, 2, 4, 5]:
+            progress = await attempt_agent.get_progress(
+                session_id="demo-session-001",
+                questions_total=5,
+                questions_answered=answered,
+            )
+            bar = PROGRESS_BARS[int(progress.percent_complete / 10)]
+            out.print(
+                f"  [{bar}] {progress.percent_complete:.0f}% "
+                f"| {progress.estimated_seconds_remaining}s left "
+                f"| {progress.motivational_message}"
             )
 
+        out.print()
+
+        # Clarification
+        out.print("[bold]── Question Clarification ──[/bold]")
+        confusing_question = SAMPLE_QUESTIONS_BY_ID["q5"]  # NPS question
+        out.print(f"\n[dim]Doctor sees:[/dim] [italic]\"{confusing_question['text']}\"[/italic]")
+        out.print("[dim]Doctor clicks \"Need help?\"...[/dim]\n")
+
+    # Asked before any LLM call so the (independent) summary request can run
+    # concurrently with the clarification
+    if show_summary is None:
+        show_summary = await asyncio.to_thread(
+            Confirm.ask, "[bold]Show completion summary?[/bold]", default=True
+        )
+
+    clarify_task = asyncio.create_task(attempt_agent.clarify_question(
+        session_id="demo-session-001",
+        question=confusing_question,
+        doctor_context=DOCTOR_CONTEXT,
+    ))
+    summary_task = asyncio.create_task(attempt_agent.generate_completion_summary(
+        responses=list(SAMPLE_RESPONSES[0]["answers"].items()),
+        survey_title=SAMPLE_SURVEY["title"],
+        total_responses=247,
+    )) if show_summary else None
+
+    label = "Fetching clarification + completion summary..." if summary_task else "Fetching clarification..."
+    with _spinner(f"[yellow]{label}[/yellow]", out):
+        if summary_task:
+            clarification, summary = await asyncio.gather(clarify_task, summary_task)
+        else:
+            clarification = await clarify_task
+
+    with out:
         _print_section(
-            "🎉 Completion",
-            f"{summary.thank_you_message}\n\n"
-            f"[bold]Community Insight:[/bold] {summary.aggregate_insight}\n\n"
-            f"[bold]What's Next:[/bold] {summary.next_steps}",
+            "💡 AI Clarification",
+            clarification.clarification
+            + (
+                "\n\n[bold]Examples:[/bold]\n"
+                + "\n".join(f"  • {e}" for e in (clarification.examples or []))
+                if clarification.examples else ""
+            ),
             style="green",
+            out=out,
+        )
+        out.print(
+            f"[dim]✓ Meaning preserved (did_change_meaning={clarification.did_change_meaning})[/dim]\n"
         )
 
+        # Completion summary
+        if summary_task:
+            out.print("\n[dim]Doctor completes survey...[/dim]")
+
+            _print_section(
+                "🎉 Completion",
+                f"{summary.thank_you_message}\n\n"
+                f"[bold]Community Insight:[/bold] {summary.aggregate_insight}\n\n"
+                f"[bold]What's Next:[/bold] {summary.next_steps}",
+                style="green",
+                out=out,
+            )
+
 
 # ─── Insight Agent Demo ───────────────────────────────────────────────────────
 
-async def _demo_insight_agent() -> None:
+async def _demo_insight_agent(out: Console = console) -> None:
+    from rich import box
+    from rich.table import Table
+
     from app.agents.insight_agent import insight_agent
 
-    console.print("\n[bold magenta]═══ INSIGHT AGENT DEMO ═══[/bold magenta]")
-    console.print(f"Analyzing {len(SAMPLE_RESPONSES)} survey responses...\n")
+    out.print("\n[bold magenta]═══ INSIGHT AGENT DEMO ═══[/bold magenta]")
+    out.print(f"Analyzing {len(SAMPLE_RESPONSES)} survey responses...\n")
 
     survey_meta = {
         "id": "demo-survey-001",
@@ -332,89 +451,96 @@ async def _demo_insight_agent() -> None:
         "questions": SAMPLE_SURVEY["questions"],
     }
 
-    with _spinner("[yellow]Running insight analysis...[/yellow]") as progress:
-        progress.add_task("", total=None)
-        result = await insight_agent.analyze(
+    # Sections render as the agent streams them; the metrics need the
+    # sentiment breakdown, which is only known once the result is complete
+    themes_shown = 0
+    items_shown = 0
+    with _spinner("[yellow]Running insight analysis...[/yellow]", out):
+        async for chunk in insight_agent.analyze_stream(
             survey_metadata=survey_meta,
             responses=SAMPLE_RESPONSES,
             completion_rate=68.4,
-        )
-
-    # Executive Summary
-    _print_section("📊 Executive Summary", result.executive_summary, style="magenta")
+        ):
+            kind = chunk["type"]
+            if kind == "executive_summary":
+                _print_section("📊 Executive Summary", chunk["text"], style="magenta", out=out)
+
+            elif kind == "theme":
+                if not themes_shown:
+                    out.print("\n[bold]🔍 Themes Identified:[/bold]")
+                themes_shown += 1
+                theme = chunk["theme"]
+                sentiment_icon = SENTIMENT_ICONS.get(theme.sentiment, "❓")
+                _print_section(
+                    f"{themes_shown}. {theme.title} {sentiment_icon} ({theme.prevalence_pct:.0f}% of responses)",
+                    theme.description
+                    + (
+                        "\n\n[dim]Representative themes:[/dim]\n"
+                        + "\n".join(f'  "{q}"' for q in (theme.representative_quotes or []))
+                        if theme.representative_quotes else ""
+                    ),
+                    style="white",
+                    out=out,
+                )
+
+            elif kind == "action_item":
+                if not items_shown:
+                    out.print("\n[bold]✅ Action Items:[/bold]")
+                items_shown += 1
+                item = chunk["action_item"]
+                color = PRIORITY_COLORS.get(item.priority, "white")
+                out.print(
+                    f"  [{color}][{item.priority.upper()}][/{color}] {item.description} "
+                    f"[dim]→ {item.owner_suggestion}[/dim]"
+                )
+
+            elif kind == "result":
+                result = chunk["result"]
 
     # Metrics
     metrics_table = Table(box=box.SIMPLE)
     metrics_table.add_column("Metric", style="bold")
     metrics_table.add_column("Value", justify="right")
-    metrics_table.add_row("Completion Rate", f"{result.completion_rate:.1f}%")
+    metrics_table.add_row(Text("Completion Rate"), Text(f"{result.completion_rate:.1f}%"))
     metrics_table.add_row(
-        "Sentiment",
-        f"✅ {result.sentiment_breakdown.get('positive', 0)*100:.0f}% positive | "
-        f"❌ {result.sentiment_breakdown.get('negative', 0)*100:.0f}% negative | "
-        f"➖ {result.sentiment_breakdown.get('neutral', 0)*100:.0f}% neutral",
+        Text("Sentiment"),
+        Text(
+            f"✅ {result.sentiment_breakdown.get('positive', 0)*100:.0f}% positive | "
+            f"❌ {result.sentiment_breakdown.get('negative', 0)*100:.0f}% negative | "
+            f"➖ {result.sentiment_breakdown.get('neutral', 0)*100:.0f}% neutral"
+        ),
     )
-    console.print(metrics_table)
-
-    # Themes
-    console.print("\n[bold]🔍 Themes Identified:[/bold]")
-    for i, theme in enumerate(result.themes, 1):
-        sentiment_icon = {"positive": "✅", "negative": "❌", "neutral": "➖", "mixed": "🔄"}.get(
-            theme.sentiment, "❓"
-        )
-        _print_section(
-            f"{i}. {theme.title} {sentiment_icon} ({theme.prevalence_pct:.0f}% of responses)",
-            theme.description
-            + (
-                "\n\n[dim]Representative themes:[/dim]\n"
-                + "\n".join(f'  "{q}"' for q in (theme.representative_quotes or []))
-                if theme.representative_quotes else ""
-            ),
-            style="white",
-        )
-
-    # Action Items
-    console.print("\n[bold]✅ Action Items:[/bold]")
-    priority_colors = {"high": "red", "medium": "yellow", "low": "dim"}
-    for item in result.action_items:
-        color = priority_colors.get(item.priority, "white")
-        console.print(
-            f"  [{color}][{item.priority.upper()}][/{color}] {item.description} "
-            f"[dim]→ {item.owner_suggestion}[/dim]"
-        )
+    out.print()
+    out.print(metrics_table)
 
 
 # ─── CLI Commands ─────────────────────────────────────────────────────────────
 
-@app.command()
 def design():
     """Demo: Design Agent (survey quality check + variants)."""
     if not _check_api_key():
-        raise typer.Exit(1)
-    asyncio.run(_demo_design_agent())
+        raise SystemExit(1)
+    asyncio.run(_with_warm_connection(_demo_design_agent()))
 
 
-@app.command()
 def attempt():
     """Demo: Attempt Agent (clarification + progress + completion)."""
     if not _check_api_key():
-        raise typer.Exit(1)
-    asyncio.run(_demo_attempt_agent())
+        raise SystemExit(1)
+    asyncio.run(_with_warm_connection(_demo_attempt_agent()))
 
 
-@app.command()
 def insights():
     """Demo: Insight Agent (theme extraction + recommendations)."""
     if not _check_api_key():
-        raise typer.Exit(1)
-    asyncio.run(_demo_insight_agent())
+        raise SystemExit(1)
+    asyncio.run(_with_warm_connection(_demo_insight_agent()))
 
 
-@app.command()
 def full():
     """Run the full end-to-end demo of all three agents."""
     if not _check_api_key():
-        raise typer.Exit(1)
+        raise SystemExit(1)
 
     console.print(
         Panel(
@@ -430,14 +556,37 @@ def full():
     console.print()
 
     async def _run_all():
-        await _demo_design_agent()
-        console.print("\n" + "─" * 60 + "\n")
-        await _demo_attempt_agent()
-        console.print("\n" + "─" * 60 + "\n")
-        await _demo_insight_agent()
+        from app.redis_client import close_redis
 
+        # Prompts are asked up front (the API handshake runs meanwhile): a
+        # prompt inside one of the concurrent demos would stall the other two
+        generate_variants = await asyncio.to_thread(
+            Confirm.ask, "[bold]Generate A/B test variants?[/bold]", default=True
+        )
+        show_summary = await asyncio.to_thread(
+            Confirm.ask, "[bold]Show completion summary?[/bold]", default=True
+        )
 
-    asyncio.run(_run_all())
+        # The three demos are independent and LLM-bound: run them concurrently
+        # (wall clock ≈ the slowest one), each rendering into its own buffer,
+        # then print the sections in order
+        outputs = [_buffered_console() for _ in range(3)]
+        try:
+            with _spinner("[yellow]Running all three agents...[/yellow]"):
+                await asyncio.gather(
+                    _demo_design_agent(outputs[0], generate_variants=generate_variants),
+                    _demo_attempt_agent(outputs[1], show_summary=show_summary),
+                    _demo_insight_agent(outputs[2]),
+                )
+        finally:
+            await close_redis()
+
+        for i, out in enumerate(outputs):
+            if i:
+                console.print("\n" + "─" * 60 + "\n")
+            console.file.write(out.file.getvalue())
+
+    asyncio.run(_with_warm_connection(_run_all()))
     console.print(
         Panel(
             "[bold green]✅ Full demo complete![/bold green]\n"
@@ -448,16 +597,13 @@ def full():
     )
 
 
-@app.command()
-def quality(
-    file: Path = typer.Option(None, "--file", "-f", help="JSON file with questions array"),
-):
+def quality(file: Path | None = None):
     """Check questions from a JSON file for bias and quality."""
     if not _check_api_key():
-        raise typer.Exit(1)
+        raise SystemExit(1)
 
     if file and file.exists():
-        data = json.loads(file.read_text())
+        data = orjson.loads(file.read_bytes())
         questions = data if isinstance(data, list) else data.get("questions", [])
         title = data.get("title", "Uploaded Survey") if isinstance(data, dict) else "Uploaded Survey"
     else:
@@ -466,23 +612,70 @@ def quality(
         title = SAMPLE_SURVEY["title"]
 
     async def _run():
-        from app.agents.design_agent import design_agent
-        result = await design_agent.quality_check(title, questions)
+        result = await _cached_quality_check(title, questions)
 
-        console.print(f"\n[bold]Quality Score:[/bold] {result.overall_quality_score:.1f}/10")
-        console.print(f"[bold]Estimated Completion Rate:[/bold] {result.estimated_completion_rate:.0f}%")
-        console.print(f"[bold]Estimated Time:[/bold] {result.estimated_time_seconds}s")
-        console.print(f"[bold]Bias Flags:[/bold] {len(result.bias_flags)}")
+        console.print()
+        console.print(_labeled("Quality Score", f"{result.overall_quality_score:.1f}/10"))
+        console.print(_labeled("Estimated Completion Rate", f"{result.estimated_completion_rate:.0f}%"))
+        console.print(_labeled("Estimated Time", f"{result.estimated_time_seconds}s"))
+        console.print(_labeled("Bias Flags", str(len(result.bias_flags))))
 
         for flag in result.bias_flags:
-            console.print(
-                f"\n  [red]⚠[/red]  [{flag.severity.upper()}] {flag.bias_type}\n"
-                f"     Original: {flag.original_text}\n"
-                f"     Fix: [green]{flag.suggestion}[/green]"
-            )
+            console.print(Text.assemble(
+                "\n  ", ("⚠", "red"), f"  [{flag.severity.upper()}] {flag.bias_type}\n",
+                f"     Original: {flag.original_text}\n",
+                "     Fix: ", (flag.suggestion, "green"),
+            ))
+
+    asyncio.run(_with_warm_connection(_run()))
+
+
+# ─── Entry point ──────────────────────────────────────────────────────────────
+# A plain argv dispatch: the five commands take at most one option, which
+# doesn't justify importing a CLI framework on every start.
+
+COMMANDS = {
+    "full": full,
+    "design": design,
+    "attempt": attempt,
+    "insights": insights,
+    "quality": quality,
+}
+
 
-    asyncio.run(_run())
+def _usage() -> str:
+    lines = ["Usage: python -m cli.demo [COMMAND] [OPTIONS]", "", "Survey Agent CLI Demo", "", "Commands:"]
+    lines += [f"  {name:<10}{command.__doc__.splitlines()[0]}" for name, command in COMMANDS.items()]
+    lines += ["", "Options (quality):", "  -f, --file PATH  JSON file with questions array"]
+    return "\n".join(lines)
+
+
+def main(argv: list[str]) -> None:
+    if argv and argv[0] in ("-h", "--help"):
+        print(_usage())
+        return
+
+    name, args = (argv[0], argv[1:]) if argv else ("full", [])
+    command = COMMANDS.get(name)
+    if command is None:
+        print(f"Error: no such command '{name}'.\n\n{_usage()}", file=sys.stderr)
+        raise SystemExit(2)
+
+    kwargs = {}
+    while args:
+        arg = args.pop(0)
+        if name == "quality" and arg in ("-f", "--file") and args:
+            kwargs["file"] = Path(args.pop(0))
+        elif name == "quality" and arg.startswith("--file="):
+            kwargs["file"] = Path(arg.partition("=")[2])
+        elif arg in ("-h", "--help"):
+            print(_usage())
+            return
+        else:
+            print(f"Error: unexpected argument '{arg}' for '{name}'.\n\n{_usage()}", file=sys.stderr)
+            raise SystemExit(2)
+    command(**kwargs)
 
 
 if __name__ == "__main__":
-    app()
+    main(sys.argv[1:])
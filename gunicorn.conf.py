@@ -0,0 +1,33 @@
+"""
+Gunicorn config for production: uvicorn workers forked from a master that has
+already loaded the app and prepared the embedding model (the static m2v
+tables, or the exported ONNX file), so workers start without the export or
+download cost. Each worker opens its own ONNX Runtime session in the API
+lifespan: its thread pool is not fork-safe.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+import os
+
+bind = "0.0.0.0:8000"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Long tool-call generations can take well over a minute
+timeout = 180
+
+
+def on_starting(server):
+    from app.rag.embeddings import prepare_model
+
+    prepare_model()
+
+
+def post_fork(server, worker):
+    # Thread pools are not inherited across fork; size torch's again per
+    # worker (used by the PyTorch fallback when the ONNX export failed)
+    import torch
+
+    from app.rag.embeddings import EMBED_THREADS
+
+    torch.set_num_threads(EMBED_THREADS)